@@ -0,0 +1,224 @@
+"""
+Library entry point: converts HTML held in memory, without touching the
+filesystem or running npm.
+
+    from reactify.api import convert_many
+
+    for result in convert_many([("auth-login.html", html)], framework="next"):
+        print(result.file, sorted(result.used_components))
+"""
+import multiprocessing
+import os
+import pickle
+from collections import deque, namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from pathlib import PurePosixPath
+
+from reactify.frameworks.registry import load_emitter
+from reactify.helpers.convert_to_tsx import (
+    DEFAULT_PARSER, build_rule_index, parse_page, register_rule_pack, registered_rule_packs, resolve_parser,
+)
+from reactify.helpers.restructure_files import route_parts
+from reactify.helpers.routes import RouteOptions, route_files
+
+# Pages per task sent to a worker when the number of pages isn't known up front
+DEFAULT_CHUNK_SIZE = 8
+
+# One converted page. route holds the route folder parts, path the URL path, file
+# where the page goes in the project and module what the route table imports
+# (None for frameworks that route by folder). tsx is None when error is set.
+PageResult = namedtuple("PageResult", ["name", "tsx", "used_components", "route", "path", "file", "module", "error"])
+
+# A worker process's own RuleIndex, compiled by _init_worker for the BatchConverter it serves
+_worker_rule_index = None
+
+
+def _init_worker(rule_packs, packs=()):
+    """
+    Registers the parent's rule packs, (name, rules) pairs, in workers that were spawned
+    rather than forked, and compiles the rule index of the converter's own packs.
+    """
+    global _worker_rule_index
+    for name, rules in rule_packs:
+        register_rule_pack(name, rules)
+    _worker_rule_index = build_rule_index(packs) if packs else None
+
+
+def _worker_initargs(packs=()):
+    """
+    Returns the arguments for _init_worker. Workers that aren't forked receive them
+    pickled, so a pack whose rules can't be (e.g. lambdas) is refused here instead of
+    workers converting without it.
+    """
+    initargs = (registered_rule_packs(), tuple(packs))
+    method = multiprocessing.get_start_method()
+    if method != "fork":
+        try:
+            pickle.dumps(initargs)
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            raise ValueError(f"Rule packs can't be sent to '{method}' worker processes ({e}); "
+                             f"use module-level functions in their rules, or convert with one job") from None
+    return initargs
+
+
+def _convert(source, emitters, parser=DEFAULT_PARSER, keep_page=False, profile=False, rule_index=None):
+    """
+    Worker entry point: parses one HTML page, given as (html_content, fragments), and
+    renders it with every emitter. Errors are returned instead of raised so one bad page
+    can't take down the batch. The PageIR is returned too when keep_page is set (e.g. for
+    the cache), and the per-phase timings when profile is set, for the parent to record.
+    rule_index defaults to the registered rules.
+
+    :return: (tsx_codes, used_components, page, error, timings), tsx_codes holding a (tsx, modules)
+             pair per emitter (see PageEmitter.render); with emitters None nothing is rendered
+             and tsx_codes is None.
+    """
+    timings = {} if profile else None
+    try:
+        html_content, fragments = source
+        page = parse_page(html_content, parser, timings, rule_index)
+        tsx_codes = used_components = None
+        if emitters is not None:
+            rendered = [emitter.render(page, fragments, timings=timings) for emitter in emitters]
+            tsx_codes = tuple((tsx, modules) for tsx, _, modules in rendered)
+            used_components = frozenset(rendered[0][1]) if rendered else frozenset()
+        return tsx_codes, used_components, page if keep_page or emitters is None else None, None, timings
+    except Exception as e:
+        return None, None, None, f"{type(e).__name__}: {e}", timings
+
+
+def _convert_chunk(sources, **options):
+    return [_convert(source, rule_index=_worker_rule_index, **options) for source in sources]
+
+
+class BatchConverter:
+    """
+    Converts batches of pages in memory.
+
+    Rules are compiled once per process and kept, and with jobs > 1 the worker
+    processes are kept across calls too, so a long-lived service pays for them once.
+    Use it as a context manager, or call close() to stop the workers.
+
+    The rule packs given in rules only apply to this converter: they are compiled into
+    its own RuleIndex (and its workers'), with the registered rules left as they are.
+    """
+
+    def __init__(self, framework="react", jobs=1, parser=DEFAULT_PARSER, rules=()):
+        self.emitter = load_emitter(framework)
+        self.rules = tuple(rules)
+        self.rule_index = build_rule_index(self.rules) if self.rules else None
+        self.jobs = jobs or os.cpu_count() or 1
+        self.parser = resolve_parser(parser)
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
+
+    def submit(self, sources, emitters, keep_page=False, profile=False):
+        """
+        Starts converting a list of (html_content, fragments) sources as one worker task.
+        :return: Future of the list of what _convert() returns per source; with jobs <= 1
+                 the sources are converted right away and the future is already done.
+        """
+        if self.jobs <= 1:
+            future = Future()
+            future.set_result([_convert(source, emitters, self.parser, keep_page, profile, self.rule_index)
+                               for source in sources])
+            return future
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker,
+                                                 initargs=_worker_initargs(self.rules))
+        return self._executor.submit(_convert_chunk, sources, emitters=emitters, parser=self.parser,
+                                     keep_page=keep_page, profile=profile)
+
+    def run(self, sources, emitters, keep_page=False, profile=False, chunk_size=None):
+        """
+        Converts (html_content, fragments) sources, yielding what _convert() returns,
+        in the order of sources. sources may be any iterable; it is read ahead only as
+        far as the workers need, so results stream out while input is still coming in.
+
+        :param emitters: PageEmitters to render every page with, None for the PageIR only.
+        :param chunk_size: Pages per worker task (default DEFAULT_CHUNK_SIZE).
+        """
+        convert = partial(_convert, emitters=emitters, parser=self.parser, keep_page=keep_page, profile=profile,
+                          rule_index=self.rule_index)
+        if self.jobs <= 1:
+            yield from map(convert, sources)
+            return
+
+        sources = iter(sources)
+        chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+
+        # A few tasks per worker in flight keeps them busy without reading all input ahead
+        pending = deque()
+        while chunk := list(islice(sources, chunk_size)):
+            pending.append(self.submit(chunk, emitters, keep_page, profile))
+            if len(pending) >= self.jobs * 4:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+    def convert_many(self, pages, casing="snake"):
+        """
+        Converts (name, html) pairs, yielding a PageResult per page in input order.
+
+        name is the page's file name (e.g. "auth-sign_in.html"), which gives its route.
+        @@include directives are left commented out, as there are no partials to read.
+        """
+        names = deque()
+
+        def sources():
+            for name, html_content in pages:
+                names.append(name)
+                yield html_content, {}
+
+        for tsx_codes, used_components, _, error, _ in self.run(sources(), [self.emitter]):
+            name = names.popleft()
+            parts = route_parts(PurePosixPath(name).stem, casing)
+            yield PageResult(
+                name, tsx_codes[0][0] if tsx_codes else None, used_components, parts, "/" + "/".join(parts),
+                self.emitter.page_path(parts), self.emitter.route_module(parts), error,
+            )
+
+
+def convert_many(pages, framework="react", jobs=1, parser=DEFAULT_PARSER, rules=(), casing="snake"):
+    """
+    Converts (name, html) pairs to TSX for a framework, yielding a PageResult per page
+    in input order. Nothing is written to disk and npm is never run.
+
+    For many calls in one process, a BatchConverter keeps its workers between them.
+
+    :param jobs: Worker processes; 1 converts in this process.
+    :param rules: Extra rule packs to enable (see reactify.helpers.rule_packs).
+    """
+    with BatchConverter(framework, jobs=jobs, parser=parser, rules=rules) as converter:
+        yield from converter.convert_many(pages, casing)
+
+
+def route_config(results, options=None):
+    """
+    Builds the React route table for converted pages, in memory.
+
+    :param results: PageResults (failed ones are skipped).
+    :param options: RouteOptions, the default being one lazy chunk per page and a flat list.
+    :return: Dict of file name, relative to src/routes, -> contents; empty for
+             frameworks that route by folder.
+    """
+    route_map = [
+        (result.route, result.module, len(result.tsx.encode("utf-8")))
+        for result in results if not result.error and result.module is not None
+    ]
+    if not route_map:
+        return {}
+    return route_files(route_map, options or RouteOptions())
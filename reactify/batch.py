@@ -0,0 +1,381 @@
+"""
+`reactify batch`: builds many projects in one run, from a JSON manifest.
+
+    {
+      "defaults": {"framework": "react", "asset_refs": "public"},
+      "projects": [
+        {"project": "shop", "source": "themes/shop/html", "assets": "themes/shop/assets"},
+        {"project": "admin", "framework": "react,next", "root": "admin", "shared_components": true}
+      ]
+    }
+
+Each entry is built like `reactify <project> <framework>` run in its root folder
+(default: the manifest's folder), with options named after the CLI flags. Paths
+are relative to the root. A plain list of entries is a manifest too.
+
+Projects are built side by side in worker processes that share the conversion
+cache. Templates are prepared once up front, and every project's node_modules is
+hardlinked from the package store rather than copied. The report lists each
+project's wall time and the disk the store saved it.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from reactify.config.base import (
+    ASSET_REF_MODES, ASSETS_PATH, BATCH_CACHE_COMMIT_EVERY, CACHE_MAX_SIZE, CACHE_PATH, LINK_MODES, PACKAGE_STORE_PATH,
+    PARSERS, ROUTE_CHUNK_STRATEGIES, SOURCE_PATH,
+)
+from reactify.frameworks.registry import framework_names, is_framework, load_framework
+from reactify.helpers.routes import RouteOptions
+from reactify.helpers.rule_packs import RULE_PACKS
+
+BatchEntry = namedtuple("BatchEntry", ["project", "frameworks", "root", "options"])
+ProjectResult = namedtuple("ProjectResult", [
+    "project", "frameworks", "seconds", "failed_pages", "linked_files", "linked_bytes", "added_bytes", "error", "output",
+])
+
+# Manifest options and the converter keywords they are passed as
+PATH_OPTIONS = {"source": "source_path", "assets": "assets_path", "destination": "destination_folder",
+                "template_dir": "template_dir"}
+CHOICE_OPTIONS = {"parser": PARSERS, "asset_link": LINK_MODES, "asset_refs": ASSET_REF_MODES}
+FLAG_OPTIONS = ["asset_checksum", "template_link", "shared_components", "client_islands", "hoist_static"]
+BOOLEAN_OPTIONS = [*FLAG_OPTIONS, "no_template", "nested_routes", "route_prefetch", "route_manifest"]
+ROUTE_OPTIONS = {"route_chunks": "chunks", "nested_routes": "nested", "route_prefetch": "prefetch",
+                 "route_manifest": "manifest", "route_chunk_size": "chunk_size"}
+OTHER_OPTIONS = ["project", "framework", "root", "no_template", "stream_threshold", "shared_min_nodes"]
+KNOWN_OPTIONS = {*PATH_OPTIONS, *CHOICE_OPTIONS, *FLAG_OPTIONS, *ROUTE_OPTIONS, *OTHER_OPTIONS}
+
+MB = 1024 * 1024
+
+
+def _frameworks(value):
+    names = value.split(",") if isinstance(value, str) else value
+    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+        raise ValueError("framework must be a name, a comma-separated list or a list of names")
+    names = list(dict.fromkeys(name.strip() for name in names if name.strip()))
+    unknown = [name for name in names if not is_framework(name)]
+    if not names or unknown:
+        raise ValueError(f"invalid framework {', '.join(unknown) or repr(value)} "
+                         f"(choose from {', '.join(framework_names())})")
+    return names
+
+
+def _number(entry, name, kind):
+    value = entry[name]
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0 or kind is int and value != int(value):
+        raise ValueError(f"{name} must be a non-negative {'whole ' if kind is int else ''}number")
+    return kind(value)
+
+
+def parse_entry(raw, defaults, base):
+    """Turns a manifest entry (with the manifest's defaults) into a BatchEntry; raises ValueError if it's invalid"""
+    if not isinstance(raw, dict):
+        raise ValueError("an entry must be an object")
+    entry = {**defaults, **raw}
+    unknown = sorted(set(entry) - KNOWN_OPTIONS)
+    if unknown:
+        raise ValueError(f"unknown option {', '.join(unknown)}")
+    if not isinstance(entry.get("project"), str) or not entry["project"].strip():
+        raise ValueError("project name missing")
+    if "framework" not in entry:
+        raise ValueError("framework missing")
+
+    frameworks = _frameworks(entry["framework"])
+    root = (base / entry.get("root", ".")).resolve()
+    options = {}
+    for name, keyword in PATH_OPTIONS.items():
+        if name in entry:
+            if not isinstance(entry[name], str):
+                raise ValueError(f"{name} must be a path")
+            options[keyword] = str((root / entry[name]).resolve())
+    for name, keyword, default in (("source", "source_path", SOURCE_PATH), ("assets", "assets_path", ASSETS_PATH)):
+        folder = Path(options.get(keyword) or root / default)
+        if not folder.is_dir():
+            raise ValueError(f"{name} folder '{folder}' doesn't exist")
+    if "destination" in entry and len(frameworks) > 1:
+        raise ValueError("destination applies to one framework; give each its own entry, or use root")
+    for name, choices in CHOICE_OPTIONS.items():
+        if name in entry:
+            if entry[name] not in choices:
+                raise ValueError(f"{name} must be one of {', '.join(choices)}")
+            options[name] = entry[name]
+    for name in BOOLEAN_OPTIONS:
+        if name in entry and not isinstance(entry[name], bool):
+            raise ValueError(f"{name} must be true or false")
+    options.update((name, entry[name]) for name in FLAG_OPTIONS if name in entry)
+    if entry.get("no_template"):
+        options["use_template"] = False
+    if "stream_threshold" in entry:
+        options["stream_threshold"] = int(_number(entry, "stream_threshold", float) * MB)
+    if "shared_min_nodes" in entry:
+        options["shared_min_nodes"] = _number(entry, "shared_min_nodes", int)
+
+    if entry.get("route_chunks", "page") not in ROUTE_CHUNK_STRATEGIES:
+        raise ValueError(f"route_chunks must be one of {', '.join(ROUTE_CHUNK_STRATEGIES)}")
+    routes = {field: entry[name] for name, field in ROUTE_OPTIONS.items() if name in entry}
+    if "chunk_size" in routes:
+        routes["chunk_size"] = _number(entry, "route_chunk_size", int) * 1024
+    options["routes"] = RouteOptions(**routes)
+
+    return BatchEntry(entry["project"].strip(), frameworks, root, options)
+
+
+def load_manifest(manifest_file):
+    """Reads and checks a manifest, returns its BatchEntries; raises ValueError naming the first bad entry"""
+    manifest_file = Path(manifest_file)
+    try:
+        manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise ValueError(f"can't read {manifest_file}: {e}") from None
+    if isinstance(manifest, list):
+        manifest = {"projects": manifest}
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("projects"), list):
+        raise ValueError("a manifest is a list of entries, or an object with a \"projects\" list")
+    defaults = manifest.get("defaults", {})
+    if not isinstance(defaults, dict):
+        raise ValueError("defaults must be an object")
+
+    entries = []
+    targets = {}
+    for index, raw in enumerate(manifest["projects"], start=1):
+        name = raw.get("project") if isinstance(raw, dict) else None
+        try:
+            entry = parse_entry(raw, defaults, manifest_file.parent)
+        except ValueError as e:
+            raise ValueError(f"entry {index}{f' ({name})' if name else ''}: {e}") from None
+        for framework in entry.frameworks:
+            target = (entry.options.get("destination_folder") or entry.root, entry.project, framework)
+            if target in targets:
+                raise ValueError(f"entries {targets[target]} and {index} both build {entry.project} for {framework}")
+            targets[target] = index
+        entries.append(entry)
+    if not entries:
+        raise ValueError("the manifest has no projects")
+    return entries
+
+
+def uses_template(entry, offline=False):
+    """Whether an entry is stamped from a template; --offline always is, as it never runs npm"""
+    return entry.options.get("use_template", True) or offline
+
+
+def prepare_templates(entries, store, offline=False, refresh=False):
+    """
+    Prepares every template the entries stamp from, and puts its node_modules in the
+    store, before any project is built: workers then only link. Returns the set of
+    (framework, template_dir) whose template couldn't be created.
+    """
+    from reactify.helpers.package_store import NODE_MODULES, template_key
+
+    prepared = {}
+    for entry in entries:
+        if not uses_template(entry, offline):
+            continue
+        for name in entry.frameworks:
+            key = (name, entry.options.get("template_dir"))
+            if key in prepared:
+                continue
+            converter = load_framework(name)(entry.project, create=False, template_dir=key[1], offline=offline,
+                                             refresh_template=refresh)
+            template = prepared[key] = converter.ensure_template()
+            if template is not None and store and (template / NODE_MODULES).is_dir():
+                listing = store.tree(template / NODE_MODULES, key=template_key(template), refresh=refresh)
+                print(f"📦 {len(listing['files'])} node_modules files of '{template}' in the package store")
+    return {key for key, template in prepared.items() if template is None}
+
+
+def build_entry(entry, jobs, cache_dir, cache_size, store_path, offline):
+    """
+    Builds one manifest entry, in a worker process; its output is captured into the result.
+    offline is set for entries whose template was prepared, so workers never scaffold one.
+    """
+    from reactify.helpers.conversion_cache import ConversionCache
+    from reactify.helpers.package_store import PackageStore
+    from reactify.main import process_frameworks
+
+    output = io.StringIO()
+    store = PackageStore(store_path) if store_path else None
+    cache = None
+    converters = []
+    error = None
+    cwd = os.getcwd()
+    started = time.perf_counter()
+    with redirect_stdout(output):
+        try:
+            if cache_dir:
+                cache = ConversionCache(cache_dir, cache_size, commit_every=BATCH_CACHE_COMMIT_EVERY)
+            entry.root.mkdir(parents=True, exist_ok=True)
+            os.chdir(entry.root)
+            converters = process_frameworks(entry.frameworks, entry.project, jobs=jobs, cache=cache,
+                                            offline=offline, package_store=store, **entry.options)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            os.chdir(cwd)
+            if cache:
+                cache.close()
+    seconds = time.perf_counter() - started
+
+    return ProjectResult(
+        entry.project, entry.frameworks, seconds, max((len(c.failed_pages) for c in converters), default=0),
+        store.linked if store else 0, store.linked_bytes if store else 0, store.added_bytes if store else 0,
+        error, output.getvalue(),
+    )
+
+
+def _failed(entry, error):
+    return ProjectResult(entry.project, entry.frameworks, 0.0, 0, 0, 0, 0, error, "")
+
+
+def run_batch(entries, projects=None, jobs=None, cache_dir=CACHE_PATH, cache_size=CACHE_MAX_SIZE,
+              store_path=PACKAGE_STORE_PATH, offline=False, refresh_template=False, verbose=False):
+    """
+    Builds the entries, up to `projects` of them at a time, sharing `jobs` page
+    workers between them.
+
+    :param cache_dir: Conversion cache folder, None to convert without it.
+    :param store_path: Package store folder, None to copy node_modules from the templates.
+    :return: (results, stored): the ProjectResults in manifest order, and the bytes put in
+             the store while preparing the templates.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    from reactify.api import _init_worker, _worker_initargs
+    from reactify.helpers.package_store import PackageStore
+
+    jobs = jobs or os.cpu_count() or 1
+    projects = max(1, min(projects or jobs, len(entries)))
+    page_jobs = max(1, jobs // projects)
+
+    store = PackageStore(store_path) if store_path else None
+    missing = prepare_templates(entries, store, offline=offline, refresh=refresh_template)
+    print(f"🏗️ Building {len(entries)} projects, {projects} at a time with {page_jobs} page workers each")
+
+    results = [None] * len(entries)
+    with ProcessPoolExecutor(max_workers=projects, initializer=_init_worker,
+                             initargs=_worker_initargs()) as pool:
+        futures = {}
+        for index, entry in enumerate(entries):
+            unavailable = [name for name in entry.frameworks if (name, entry.options.get("template_dir")) in missing]
+            if unavailable and uses_template(entry, offline):
+                results[index] = _failed(entry, f"no template for {', '.join(unavailable)}")
+                print(f"❌ {entry.project}: {results[index].error}")
+                continue
+            future = pool.submit(build_entry, entry, page_jobs, cache_dir, cache_size, store_path,
+                                 uses_template(entry, offline))
+            futures[future] = index
+
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = _failed(entries[index], f"{type(e).__name__}: {e}")
+            results[index] = result
+            if result.error or verbose:
+                print(f"── {result.project} ({', '.join(result.frameworks)}) ──")
+                print(result.output, end="")
+            if result.error:
+                print(f"❌ {result.project}: {result.error}")
+            else:
+                failed = f", {result.failed_pages} pages failed" if result.failed_pages else ""
+                print(f"✅ {result.project} ({', '.join(result.frameworks)}) built in {result.seconds:.1f}s{failed}")
+
+    return results, store.added_bytes if store else 0
+
+
+def report(results, seconds, stored=0):
+    """
+    Prints the per-project table and totals, returns them as a dict for --report.
+    Disk saved is what was hardlinked rather than copied, less what had to be stored.
+
+    :param stored: Bytes stored other than by the projects, e.g. while preparing templates.
+    """
+    linked = sum(result.linked_bytes for result in results)
+    added = stored + sum(result.added_bytes for result in results)
+
+    width = max([len("project"), *(len(result.project) for result in results)])
+    print(f"\n📊 {len(results)} projects in {seconds:.1f}s "
+          f"({sum(result.seconds for result in results):.1f}s of project time)")
+    print(f"  {'project':<{width}}  {'framework':<12} {'time':>8}  {'disk saved':>10}  status")
+    for result in results:
+        status = "failed" if result.error else f"{result.failed_pages} pages failed" if result.failed_pages else "ok"
+        saved = (result.linked_bytes - result.added_bytes) / MB
+        print(f"  {result.project:<{width}}  {','.join(result.frameworks):<12} {result.seconds:>7.1f}s  "
+              f"{saved:>7.1f} MB  {status}")
+    print(f"💾 node_modules: {sum(result.linked_files for result in results)} files hardlinked "
+          f"({linked / MB:.1f} MB not copied), {added / MB:.1f} MB newly stored: {(linked - added) / MB:.1f} MB saved")
+
+    return {
+        "seconds": round(seconds, 3),
+        "linked_bytes": linked,
+        "stored_bytes": added,
+        "saved_bytes": linked - added,
+        "projects": [
+            {
+                "project": result.project, "frameworks": result.frameworks, "seconds": round(result.seconds, 3),
+                "failed_pages": result.failed_pages, "linked_files": result.linked_files,
+                "saved_bytes": result.linked_bytes - result.added_bytes, "error": result.error,
+            }
+            for result in results
+        ],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="reactify batch",
+                                     description="Build many projects in one run from a JSON manifest")
+    parser.add_argument("manifest", help="JSON file listing the projects (see `pydoc reactify.batch`)")
+    parser.add_argument("--projects", "-p", type=int,
+                        help="Projects built at the same time (default: CPU count, at most one per entry)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(),
+                        help="Page worker processes shared by the projects being built (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Reconvert every page instead of using the cache")
+    parser.add_argument("--cache-dir", default=CACHE_PATH, help=f"Conversion cache location (default: {CACHE_PATH})")
+    parser.add_argument("--cache-size", type=int, default=CACHE_MAX_SIZE // MB, help="Conversion cache size limit in MB")
+    parser.add_argument("--store", default=PACKAGE_STORE_PATH,
+                        help=f"Package store node_modules is hardlinked from (default: {PACKAGE_STORE_PATH})")
+    parser.add_argument("--no-store", action="store_true",
+                        help="Copy node_modules from the templates instead of linking it from the package store")
+    parser.add_argument("--offline", action="store_true", help="Never run npm; fail if there is no cached template")
+    parser.add_argument("--refresh-template", action="store_true", help="Scaffold the cached templates again")
+    parser.add_argument("--rules", default="",
+                        help=f"Comma-separated extra rule packs to enable ({', '.join(RULE_PACKS)})")
+    parser.add_argument("--report", metavar="FILE", help="Also write the report as JSON to FILE")
+    parser.add_argument("--verbose", "-v", action="store_true",
+                        help="Print every project's output, not just that of failed ones")
+    args = parser.parse_args(argv)
+
+    try:
+        entries = load_manifest(args.manifest)
+    except ValueError as e:
+        parser.error(str(e))
+
+    from reactify.helpers.convert_to_tsx import register_rule_pack
+
+    for name in filter(None, args.rules.split(",")):
+        register_rule_pack(name.strip())
+
+    started = time.perf_counter()
+    results, stored = run_batch(
+        entries, projects=args.projects, jobs=args.jobs,
+        cache_dir=None if args.no_cache else args.cache_dir, cache_size=args.cache_size * MB,
+        store_path=None if args.no_store else args.store, offline=args.offline,
+        refresh_template=args.refresh_template, verbose=args.verbose,
+    )
+    summary = report(results, time.perf_counter() - started, stored)
+    if args.report:
+        Path(args.report).write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
+        print(f"📄 Report written to {args.report}")
+    return 1 if any(result.error for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,374 @@
+"""
+Benchmarks Reactify on a synthetic Bootstrap corpus, without running npm.
+
+    python -m reactify.bench --pages 500 --depth 4 --density 0.6 --output results.json
+    python -m reactify.bench --baseline results.json --threshold 0.1
+    python -m reactify.bench --startup --startup-budget 60
+
+Every stage is timed on its own: convert_to_tsx per page, the whole
+_restructure_with_tsx_conversion pass, _generate_routes_tsx_file and
+copy_assets / sync_assets. With --baseline the run fails (exit code 1) when a
+stage is slower than the baseline by more than --threshold.
+
+--startup instead times CLI commands that must not load the converter (--help,
+argument errors, dispatch) in fresh interpreters, and fails when one takes longer
+than --startup-budget milliseconds over a bare interpreter.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from reactify.frameworks.react import ReactConverter
+from reactify.helpers.copy_assets import copy_assets, sync_assets
+from reactify.helpers.convert_to_tsx import (
+    DEFAULT_PARSER, PARSERS, REACT_BOOTSTRAP_RULES, VARIANTS, VARIANT_MAPPING, convert_to_tsx,
+)
+
+BENCH_VERSION = 1
+
+# Commands timed by --startup, as arguments to the interpreter
+STARTUP_COMMANDS = {
+    "--help": ["-m", "reactify.cli", "--help"],
+    "argument error": ["-m", "reactify.cli", "project", "react", "--jobs", "x"],
+    "merge --help": ["-m", "reactify.cli", "merge", "--help"],
+    "batch --help": ["-m", "reactify.cli", "batch", "--help"],
+    "client --help": ["-m", "reactify.cli", "client", "--help"],
+}
+# Modules the CLI must not import before a command runs
+HEAVY_MODULES = ["bs4", "concurrent.futures", "sqlite3", "subprocess", "importlib.metadata"]
+
+SECTIONS = ["dashboard", "apps", "auth", "ui", "pages", "forms", "tables", "charts"]
+NAMES = ["analytics", "chat", "email_read", "sign_in", "buttons", "cards", "list", "profile", "settings", "invoice"]
+TAGS = ["div", "section", "span", "p", "ul", "li", "a", "button", "label", "form"]
+PLAIN_CLASSES = ["d-flex", "mb-3", "mt-2", "p-3", "text-muted", "fw-bold", "shadow-sm", "gap-2", "border", "rounded"]
+COL_CLASSES = ["col", "col-6", "col-md-4", "col-lg-3", "col-xl-auto", "col-sm-12"]
+
+
+def bootstrap_classes():
+    """Classes the converter recognises: exact rule classes, column classes and variants"""
+    classes = [rule["class"] for rule in REACT_BOOTSTRAP_RULES.values() if "class" in rule]
+    classes += COL_CLASSES
+    classes += [prefix + variant for prefix in VARIANT_MAPPING for variant in VARIANTS]
+    return classes
+
+
+def _element(rng, depth, width, density, known):
+    tag = rng.choice(TAGS)
+    classes = [rng.choice(known) if rng.random() < density else rng.choice(PLAIN_CLASSES)
+               for _ in range(rng.randint(1, 3))]
+    attrs = f' class="{" ".join(classes)}"'
+    if tag == "label":
+        attrs += ' for="field"'
+    elif tag == "button":
+        attrs += ' onclick="go()" type="button"'
+
+    if depth <= 0:
+        return f"<{tag}{attrs}>Lorem ipsum {rng.randint(0, 9999)}</{tag}><br>"
+    children = "".join(_element(rng, depth - 1, width, density, known) for _ in range(width))
+    return f"<{tag}{attrs}>{children}<img src=\"a.png\" alt=\"\"></{tag}>"
+
+
+def generate_corpus(root, pages=200, depth=4, width=3, density=0.5, assets=100, seed=0):
+    """
+    Writes a deterministic corpus under root: html/ pages and assets/ files.
+
+    :param pages: Number of pages.
+    :param depth: Nesting depth of each page's content.
+    :param width: Children per element.
+    :param density: Share of classes (0..1) the converter recognises.
+    :param assets: Number of asset files.
+    :param seed: Random seed; the same arguments always produce the same corpus.
+    :return: (source_path, assets_path)
+    """
+    rng = random.Random(seed)
+    known = bootstrap_classes()
+    root = Path(root)
+    source = root / "html"
+    asset_root = root / "assets"
+
+    for index in range(pages):
+        name = f"{rng.choice(SECTIONS)}-{rng.choice(NAMES)}-{index}.html"
+        folder = source / rng.choice(["", "", "", "admin"])
+        folder.mkdir(parents=True, exist_ok=True)
+        content = "".join(_element(rng, depth, width, density, known) for _ in range(width))
+        (folder / name).write_text(
+            "<!DOCTYPE html>\n<html><head><title>bench</title></head><body>\n"
+            f"<!-- page {index} -->\n<div class=\"wrapper\"><div data-content>{content}</div></div>\n"
+            "</body></html>\n",
+            encoding="utf-8",
+        )
+
+    for index in range(assets):
+        folder = asset_root / rng.choice(["css", "js", "images", "images/icons"])
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"asset-{index}.bin").write_bytes(rng.randbytes(rng.randint(1, 64) * 1024))
+
+    return source, asset_root
+
+
+class _BenchConverter(ReactConverter):
+    """ReactConverter that skips scaffolding, so nothing calls npm"""
+
+    def create_project(self):
+        self.project_root.mkdir(parents=True, exist_ok=True)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process and its finished workers, in MB"""
+    if resource is None:
+        return None
+    scale = 1 if sys.platform == "darwin" else 1024  # ru_maxrss is bytes on macOS, KB elsewhere
+    usage = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return round(usage * scale / (1024 * 1024), 1)
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def run_benchmark(workdir, pages=200, depth=4, width=3, density=0.5, assets=100, seed=0, jobs=None,
+                  parser=DEFAULT_PARSER, repeat=3):
+    """
+    Generates a corpus in workdir and times each stage `repeat` times, keeping the fastest run.
+    :return: Results dict, as written by --output.
+    """
+    workdir = Path(workdir)
+    source, asset_root = generate_corpus(workdir / "corpus", pages, depth, width, density, assets, seed)
+    files = sorted(source.rglob("*.html"))
+    sources = [file.read_text(encoding="utf-8") for file in files]
+
+    latencies = []
+    best = {}
+
+    def record(stage, seconds):
+        best[stage] = min(best.get(stage, seconds), seconds)
+
+    for _ in range(repeat):
+        # convert_to_tsx alone, page by page, in this process
+        run_latencies = []
+        for html_content in sources:
+            start = time.perf_counter()
+            convert_to_tsx(html_content, parser)
+            run_latencies.append(time.perf_counter() - start)
+        latencies.extend(run_latencies)
+        record("convert_to_tsx", sum(run_latencies))
+
+        out = workdir / "out"
+        shutil.rmtree(out, ignore_errors=True)
+        converter = _BenchConverter("bench", source_path=source, destination_folder=out, assets_path=asset_root,
+                                    jobs=jobs, parser=parser)
+
+        seconds, _ = _timed(converter._restructure_with_tsx_conversion, skip_dirs=["partials"])
+        record("restructure", seconds)
+
+        route_map = [(parts, converter.emitter.route_module(parts), target_file.stat().st_size)
+                     for _, parts, target_file in converter._collect_pages(skip_dirs=["partials"])]
+        seconds, _ = _timed(converter._generate_routes_tsx_file, route_map)
+        record("routes", seconds)
+
+        seconds, _ = _timed(copy_assets, asset_root, out / "copy_assets")
+        record("copy_assets", seconds)
+
+        seconds, _ = _timed(sync_assets, asset_root, out / "sync_assets")
+        record("sync_assets", seconds)
+
+        # Second sync over an up-to-date folder: the incremental case
+        seconds, _ = _timed(sync_assets, asset_root, out / "sync_assets")
+        record("sync_assets_noop", seconds)
+
+    stages = {stage: {"seconds": round(seconds, 6)} for stage, seconds in best.items()}
+    for stage in ("convert_to_tsx", "restructure"):
+        stages[stage]["pages_per_sec"] = round(len(files) / best[stage], 2) if best[stage] else None
+    stages["convert_to_tsx"]["p50_ms"] = round(percentile(latencies, 50) * 1000, 3)
+    stages["convert_to_tsx"]["p99_ms"] = round(percentile(latencies, 99) * 1000, 3)
+
+    return {
+        "version": BENCH_VERSION,
+        "config": {
+            "pages": pages, "depth": depth, "width": width, "density": density, "assets": assets, "seed": seed,
+            "jobs": jobs, "parser": parser, "repeat": repeat,
+        },
+        "environment": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "corpus_bytes": sum(len(html_content.encode("utf-8")) for html_content in sources),
+        "stages": stages,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _command_seconds(args, repeat, env):
+    """Fastest wall time of running the interpreter with args"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def run_startup_benchmark(repeat=10):
+    """
+    Times the STARTUP_COMMANDS in fresh interpreters, against one that does nothing.
+    :return: Results dict with each command's overhead over the bare interpreter in ms,
+             and the HEAVY_MODULES that importing reactify.main loads.
+    """
+    env = dict(os.environ)
+    package_root = str(Path(__file__).resolve().parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+
+    bare = _command_seconds(["-c", "pass"], repeat, env)
+    commands = {
+        name: round((_command_seconds(args, repeat, env) - bare) * 1000, 1)
+        for name, args in STARTUP_COMMANDS.items()
+    }
+    check = subprocess.run(
+        [sys.executable, "-c", f"import sys, reactify.main; print(' '.join(m for m in {HEAVY_MODULES!r} "
+                               f"if m in sys.modules))"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return {
+        "version": BENCH_VERSION,
+        "interpreter_ms": round(bare * 1000, 1),
+        "commands": commands,
+        "heavy_imports": check.stdout.split(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares stage times against a baseline.
+    :return: List of (stage, baseline_seconds, seconds) for stages slower than baseline * (1 + threshold).
+    """
+    regressions = []
+    for stage, stats in results["stages"].items():
+        before = baseline.get("stages", {}).get(stage, {}).get("seconds")
+        if before and stats["seconds"] > before * (1 + threshold):
+            regressions.append((stage, before, stats["seconds"]))
+    return regressions
+
+
+def print_report(results, baseline=None):
+    print(f"\n📊 Benchmark: {results['config']['pages']} pages, {results['corpus_bytes'] / 1024:.0f} KB of HTML")
+    for stage, stats in results["stages"].items():
+        line = f"  {stage:<18} {stats['seconds'] * 1000:>10.1f} ms"
+        if "pages_per_sec" in stats:
+            line += f"  {stats['pages_per_sec']:>9.1f} pages/s"
+        if "p50_ms" in stats:
+            line += f"  p50 {stats['p50_ms']:.2f} ms  p99 {stats['p99_ms']:.2f} ms"
+        before = (baseline or {}).get("stages", {}).get(stage, {}).get("seconds")
+        if before:
+            line += f"  ({(stats['seconds'] / before - 1) * 100:+.1f}% vs baseline)"
+        print(line)
+    if results["peak_rss_mb"] is not None:
+        print(f"  peak RSS           {results['peak_rss_mb']:>10.1f} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Reactify on a synthetic Bootstrap corpus")
+    parser.add_argument("--pages", type=int, default=200, help="Number of pages to generate")
+    parser.add_argument("--depth", type=int, default=4, help="Nesting depth of page content")
+    parser.add_argument("--width", type=int, default=3, help="Children per element")
+    parser.add_argument("--density", type=float, default=0.5, help="Share of classes the converter recognises (0-1)")
+    parser.add_argument("--assets", type=int, default=100, help="Number of asset files to generate")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus random seed")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(), help="Worker processes for the restructure stage")
+    parser.add_argument("--parser", choices=PARSERS, default=DEFAULT_PARSER, help="HTML parser backend")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage; the fastest is kept")
+    parser.add_argument("--workdir", help="Where to generate the corpus and output (default: a temporary folder)")
+    parser.add_argument("--output", "-o", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Allowed slowdown against the baseline before the run fails (0.1 = 10%%)")
+    parser.add_argument("--startup", action="store_true",
+                        help="Time CLI startup (--help, argument errors, dispatch) instead of conversion")
+    parser.add_argument("--startup-budget", type=float, default=60,
+                        help="Milliseconds a startup command may take over a bare interpreter")
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        return startup_main(args)
+
+    options = dict(pages=args.pages, depth=args.depth, width=args.width, density=args.density, assets=args.assets,
+                   seed=args.seed, jobs=args.jobs, parser=args.parser, repeat=max(1, args.repeat))
+    if args.workdir:
+        results = run_benchmark(args.workdir, **options)
+    else:
+        with tempfile.TemporaryDirectory(prefix="reactify-bench-") as workdir:
+            results = run_benchmark(workdir, **options)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("config") != results["config"]:
+            print("⚠️ Baseline was recorded with different settings; the comparison may not be meaningful.")
+
+    print_report(results, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results saved to {args.output}")
+
+    if baseline:
+        regressions = compare(results, baseline, args.threshold)
+        for stage, before, seconds in regressions:
+            print(f"❌ {stage} regressed: {before * 1000:.1f} ms → {seconds * 1000:.1f} ms")
+        if regressions:
+            return 1
+        print(f"✅ No stage slower than baseline by more than {args.threshold:.0%}")
+    return 0
+
+
+def startup_main(args):
+    results = run_startup_benchmark(repeat=max(1, args.repeat * 3))
+    print(f"\n🚀 CLI startup, over a bare interpreter ({results['interpreter_ms']:.1f} ms)")
+    for name, ms in results["commands"].items():
+        print(f"  {name:<18} {ms:>8.1f} ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results saved to {args.output}")
+
+    over = {name: ms for name, ms in results["commands"].items() if ms > args.startup_budget}
+    for name, ms in over.items():
+        print(f"❌ {name} took {ms:.1f} ms, over the {args.startup_budget:.0f} ms budget")
+    if results["heavy_imports"]:
+        print(f"❌ reactify.main imports {', '.join(results['heavy_imports'])} at startup")
+    if over or results["heavy_imports"]:
+        return 1
+    print(f"✅ Every command within {args.startup_budget:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,18 @@
+"""
+Console entry point. `reactify client` is dispatched before anything else is
+imported, so a client round trip doesn't pay for loading the converter.
+"""
+import sys
+
+
+def main():
+    if sys.argv[1:2] == ["client"]:
+        from reactify.client import main as run_client
+        return run_client(sys.argv[2:])
+
+    from reactify.main import main as run_main
+    return run_main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
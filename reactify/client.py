@@ -0,0 +1,133 @@
+"""
+`reactify client`: sends pages to a running `reactify serve`.
+
+Only the standard library (and output_files, which needs nothing else) is imported
+here, so each call costs little more than the interpreter's start and one round
+trip to the server.
+"""
+import argparse
+import json
+import socket
+import sys
+from pathlib import Path
+
+from reactify.config.base import SERVE_SOCKET, SERVE_TIMEOUT, SERVE_TOKEN_FILE
+from reactify.helpers.output_files import write_if_changed
+
+
+class ServerUnavailable(Exception):
+    pass
+
+
+class Client:
+    """
+    One connection to the server; requests on it are answered in order.
+    A server on a TCP port needs the token from its token file with every request.
+    """
+
+    def __init__(self, socket_path=SERVE_SOCKET, port=None, timeout=SERVE_TIMEOUT, token=None):
+        self.token = token
+        try:
+            if port is not None:
+                self._socket = socket.create_connection(("127.0.0.1", port), timeout=timeout)
+            else:
+                self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._socket.settimeout(timeout)
+                self._socket.connect(socket_path)
+        except OSError as e:
+            raise ServerUnavailable(str(e)) from None
+        self._file = self._socket.makefile("rwb")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+    def request(self, op, **fields):
+        if self.token:
+            fields["token"] = self.token
+        self._file.write(json.dumps(dict(fields, op=op)).encode("utf-8") + b"\n")
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ServerUnavailable("The server closed the connection")
+        return json.loads(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="reactify client", description="Talk to a running `reactify serve`")
+    parser.add_argument("--socket", default=SERVE_SOCKET, help=f"Server's Unix socket (default: {SERVE_SOCKET})")
+    parser.add_argument("--port", type=int, help="Server's localhost TCP port, if it listens on one")
+    parser.add_argument("--token-file", default=SERVE_TOKEN_FILE,
+                        help=f"Token file of a server on a TCP port (default: {SERVE_TOKEN_FILE})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("ping", help="Check the server is up")
+    commands.add_parser("stats", help="Show the server's request and cache counts")
+    commands.add_parser("shutdown", help="Stop the server")
+    convert = commands.add_parser("convert", help="Convert one HTML page")
+    convert.add_argument("file", help="HTML page to convert")
+    convert.add_argument("--framework", default="react", help="Target framework (default: react)")
+    convert.add_argument("--root", help="Source folder the page's @@include paths resolve from")
+    output = convert.add_mutually_exclusive_group()
+    output.add_argument("--project", help="Write the page where it goes in this project")
+    output.add_argument("--out", help="Write the TSX to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    fields = {}
+    if args.command == "convert":
+        file = Path(args.file)
+        root = Path(args.root) if args.root else None
+        try:
+            fields = {
+                "name": file.resolve().relative_to(root.resolve()).as_posix() if root else file.name,
+                "html": file.read_text(encoding="utf-8"),
+                "framework": args.framework,
+            }
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+        if root:
+            fields["root"] = str(root.resolve())
+
+    token = None
+    if args.port is not None:
+        try:
+            token = Path(args.token_file).read_text(encoding="utf-8").strip()
+        except OSError as e:
+            print(f"❌ No token for the server on port {args.port} ({e})", file=sys.stderr)
+            return 2
+
+    try:
+        with Client(args.socket, args.port, token=token) as client:
+            response = client.request(args.command, **fields)
+    except ServerUnavailable as e:
+        print(f"❌ No server running ({e}); start one with `reactify serve`", file=sys.stderr)
+        return 2
+
+    if not response.get("ok"):
+        print(f"❌ {response.get('error')}", file=sys.stderr)
+        return 1
+
+    if args.command != "convert":
+        print(json.dumps({key: value for key, value in response.items() if key != "ok"}))
+        return 0
+
+    target = Path(args.project) / response["file"] if args.project else Path(args.out) if args.out else None
+    if target is None:
+        sys.stdout.write(response["tsx"])
+        return 0
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if write_if_changed(target, response["tsx"]):
+        print(f"✅ {args.file} -> {target} ({response['ms']} ms)")
+    else:
+        print(f"✅ {target} is up to date ({response['ms']} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,5 @@
+import os
+
 SOURCE_PATH = "./html"
 ASSETS_PATH = "./assets"
 
@@ -5,4 +7,58 @@ ASSETS_PATH = "./assets"
 REACT_DESTINATION_FOLDER = "./react"
 
 # Next
-NEXT_DESTINATION_FOLDER = "./next"
\ No newline at end of file
+NEXT_DESTINATION_FOLDER = "./next"
+
+# Conversion cache (shared by all projects)
+CACHE_PATH = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "reactify")
+CACHE_MAX_SIZE = 512 * 1024 * 1024
+
+# Scaffolded project templates, stamped into new projects instead of running npm every time
+TEMPLATE_CACHE_PATH = os.path.join(CACHE_PATH, "templates")
+# Content-addressed store of node_modules files, hardlinked into projects instead of copied
+PACKAGE_STORE_PATH = os.path.join(CACHE_PATH, "store")
+
+# Pages at least this big are converted with the streaming converter, which keeps memory flat
+STREAM_THRESHOLD = 8 * 1024 * 1024
+
+# Subtrees repeated across pages are moved into shared components when they have at
+# least this many nodes and appear on at least this many pages
+SHARED_COMPONENT_MIN_NODES = 25
+SHARED_COMPONENT_MIN_PAGES = 2
+SHARED_COMPONENTS_FOLDER = "src/components"
+
+# Route generation: how page components are grouped into lazily loaded chunks
+ROUTE_CHUNK_STRATEGIES = ["page", "folder", "balanced"]
+# Target size of a "balanced" route chunk, in bytes of generated TSX
+ROUTE_CHUNK_SIZE = 256 * 1024
+# Sibling routes on each side whose chunks a route hints to prefetch
+ROUTE_PREFETCH_SIBLINGS = 2
+
+# Where `reactify serve` listens by default, and how long it waits on a silent client
+SERVE_SOCKET = os.path.join(CACHE_PATH, "serve.sock")
+SERVE_TIMEOUT = 30
+# Token a server on a TCP port expects with every request, in a file only its user can read
+SERVE_TOKEN_FILE = os.path.join(CACHE_PATH, "serve.token")
+
+# HTML parser backends BeautifulSoup can use; lxml is fastest when installed
+PARSERS = ["html.parser", "lxml", "html5lib"]
+DEFAULT_PARSER = "html.parser"
+# How changed assets are placed in the project
+LINK_MODES = ["copy", "hardlink", "reflink"]
+# How converted pages refer to assets: as written in the theme, through ES imports the
+# bundler fingerprints, or at content-hashed copies in public/<ASSET_PUBLIC_FOLDER>
+ASSET_REF_MODES = ["keep", "import", "public"]
+ASSET_PUBLIC_FOLDER = "assets"
+# Hex digits of the content hash put in fingerprinted file names
+ASSET_HASH_LENGTH = 8
+
+# Page pipeline: threads reading and writing pages, pages read ahead of conversion,
+# pages per worker task, and worker tasks in flight per worker process
+PIPELINE_READ_THREADS = 4
+PIPELINE_WRITE_THREADS = 4
+PIPELINE_READ_AHEAD = 64
+PIPELINE_CHUNK_SIZE = 16
+PIPELINE_TASKS_PER_WORKER = 4
+
+# `reactify batch`: conversion cache writes between commits, so parallel projects share it
+BATCH_CACHE_COMMIT_EVERY = 32
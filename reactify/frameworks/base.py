@@ -0,0 +1,390 @@
+import os
+import shutil
+from pathlib import Path
+
+from reactify.config.base import (
+    ASSET_PUBLIC_FOLDER, SHARED_COMPONENT_MIN_NODES, SHARED_COMPONENTS_FOLDER, STREAM_THRESHOLD,
+)
+from reactify.helpers.asset_refs import AssetManifest, AssetRewriter, publish_assets
+from reactify.helpers.client_islands import IslandReport
+from reactify.helpers.convert_pages import convert_pages
+from reactify.helpers.convert_to_tsx import DEFAULT_PARSER, resolve_parser
+from reactify.helpers.copy_assets import sync_assets
+from reactify.helpers.includes import INCLUDE_GRAPH_FILE, IncludeResolver
+from reactify.helpers.page_writer import PageWriter
+from reactify.helpers.profiler import timed
+from reactify.helpers.progress import Progress
+from reactify.helpers.restructure_files import route_parts
+from reactify.helpers.routes import RouteOptions
+from reactify.helpers.shared_components import component_imports, extract_shared_components, write_components
+from reactify.helpers.shards import shard_of, write_fragment
+from reactify.helpers.stream_convert import should_stream, stream_page
+from reactify.helpers.template_cache import is_pruned_template, prepare_template, stamp_template
+from reactify.helpers.watch_project import watch_project
+
+
+class BaseConverter:
+    """
+    Builds a framework project from the HTML theme: scaffolds it (from a cached
+    template), syncs the assets and converts every page.
+
+    Subclasses set the template name and the page emitter (which also names the
+    folder pages go to), and implement _scaffold, _prune and _update_routes for
+    their framework. island_emitter, if set, is the emitter used with client_islands.
+    """
+
+    template_name = None
+    emitter = None
+    island_emitter = None
+
+    def __init__(self, project_name, source_path, destination_folder, assets_path, jobs=None, cache=None,
+                 parser=DEFAULT_PARSER, asset_link="copy", asset_checksum=False, use_template=True,
+                 template_dir=None, offline=False, refresh_template=False, template_link=False,
+                 stream_threshold=STREAM_THRESHOLD, shared_components=False,
+                 shared_min_nodes=SHARED_COMPONENT_MIN_NODES, routes=None, shard=None, verbose=False,
+                 asset_refs="keep", client_islands=False, hoist_static=False, package_store=None, create=True):
+        self.project_name = project_name
+        self.source_path = Path(source_path)
+        self.destination_path = Path(destination_folder)
+        self.assets_path = Path(assets_path)
+        self.jobs = jobs
+        self.cache = cache
+        self.parser = resolve_parser(parser)
+        self.failed_pages = set()
+        self.asset_link = asset_link
+        self.asset_checksum = asset_checksum
+        # "import" or "public": point page asset references at fingerprinted assets (see asset_refs)
+        self.asset_refs = asset_refs
+        self.asset_rewriter = None
+        self.use_template = use_template or offline
+        self.template_dir = template_dir
+        self.offline = offline
+        self.refresh_template = refresh_template
+        self.template_link = template_link
+        # PackageStore node_modules is hardlinked from, instead of copied into every project
+        self.package_store = package_store
+        self.stream_threshold = stream_threshold
+        self.shared_components = shared_components
+        self.shared_min_nodes = shared_min_nodes
+        self.route_options = routes or RouteOptions()
+        # (i, N): convert only the pages of shard i of N, routes are written by `reactify merge`
+        self.shard = shard
+        # Print a line per page instead of a progress count
+        self.verbose = verbose
+        if client_islands:
+            if self.island_emitter is None:
+                print(f"⚠️ Client islands only apply to server-rendered targets, not {self.emitter.name}")
+            else:
+                self.emitter = self.island_emitter
+        if hoist_static:
+            self.emitter = self.emitter.configured(hoist_static=True)
+        if shard and shared_components:
+            print("⚠️ Shared components need every page, they are not extracted in sharded runs")
+            self.shared_components = False
+        self.includes = IncludeResolver(self.source_path, self.parser)
+
+        self.project_root = self.destination_path / project_name
+        self.project_public_path = self.project_root / "public"
+        self.project_src_path = self.project_root / "src"
+        self.project_assets_path = self.project_root / "src/assets"
+        self.pages_path = self.project_root / self.emitter.pages_folder
+        self.components_path = self.project_root / SHARED_COMPONENTS_FOLDER
+
+        if create:
+            self.create_project()
+
+    def create_project(self):
+        if not self.prepare_project():
+            return
+
+        with timed("convert"):
+            self._restructure_with_tsx_conversion(skip_dirs=["partials"])
+        print(f"🚀 Project ready at: {self.project_root}")
+
+    def prepare_project(self):
+        """Scaffolds the project and syncs its assets, returns False if scaffolding failed"""
+        self.project_root.mkdir(parents=True, exist_ok=True)
+        with timed("scaffold"):
+            if not self._scaffold_project():
+                return False
+
+        with timed("assets"):
+            sync_assets(self.assets_path, self.project_assets_path, checksum=self.asset_checksum, link=self.asset_link)
+            self.sync_asset_refs()
+        return True
+
+    def sync_asset_refs(self):
+        """
+        Hashes the assets and publishes their fingerprinted copies when asset_refs is on.
+        :return: True if references to the assets changed since the last call, so pages need rewriting.
+        """
+        if self.asset_refs == "keep":
+            return False
+        manifest = AssetManifest(self.assets_path, self.project_root / ".reactify" / "assets.json").build()
+        placed, removed = publish_assets(manifest, self.project_public_path / ASSET_PUBLIC_FOLDER, link=self.asset_link)
+        manifest.save()
+        distinct = len(set(manifest.canonical.values()))
+        print(f"🔖 Fingerprinted {distinct} assets ({len(manifest.canonical) - distinct} duplicates): "
+              f"{placed} placed, {removed} removed")
+
+        previous = self.asset_rewriter.manifest.references() if self.asset_rewriter else None
+        self.asset_rewriter = AssetRewriter(manifest, self.asset_refs, self.emitter, self.assets_path.name,
+                                            self.project_assets_path)
+        return previous is not None and previous != manifest.references()
+
+    def _scaffold_project(self):
+        """Scaffolds the project, stamping it from the cached template unless templates are off"""
+        if not self.use_template:
+            # Scaffolded and pruned next to the project: pruning the project would delete its pages and assets
+            staging = self.destination_path / f".{self.project_name}.{os.getpid()}.scaffold"
+            shutil.rmtree(staging, ignore_errors=True)
+            try:
+                if not self._scaffold(staging):
+                    return False
+                self._prune(staging)
+                stamp_template(staging, self.project_root, self.project_name, link=True)
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+            if self.package_store:
+                self.package_store.link_node_modules(self.project_root, self.project_root)
+            return True
+
+        template = self.ensure_template()
+        if template is None:
+            return False
+
+        stamp_template(template, self.project_root, self.project_name, link=self.template_link,
+                       store=self.package_store, prune=None if is_pruned_template(template) else self._prune)
+        return True
+
+    def ensure_template(self):
+        """Returns the template folder, scaffolding it first if needed, or None if it couldn't be created"""
+        return prepare_template(self.template_name, self._scaffold, self._prune, template_dir=self.template_dir,
+                                offline=self.offline, refresh=self.refresh_template)
+
+    def _scaffold(self, target):
+        raise NotImplementedError
+
+    def _prune(self, root):
+        raise NotImplementedError
+
+    def _restructure_with_tsx_conversion(self, new_extension="tsx", skip_dirs=None, casing="snake"):
+        pages = self._collect_pages(new_extension, skip_dirs, casing)
+        own_pages = self._shard_pages(pages)
+        failed = self._write_pages(own_pages)
+        self.failed_pages = failed
+
+        if self.shard:
+            self._finish_shard(pages, own_pages, failed)
+        else:
+            self._update_routes(pages, failed)
+        print(f"\n✅ {len(own_pages) - len(failed)} TSX files created.")
+        if failed:
+            print(f"❌ {len(failed)} pages failed to convert.")
+
+    def _collect_pages(self, new_extension="tsx", skip_dirs=None, casing="snake"):
+        """Returns (file, processed_folder_parts, target_file) for every page under source_path"""
+        if skip_dirs is None:
+            skip_dirs = []
+
+        src_path = self.source_path
+        dist_path = self.pages_path
+        pages = []
+
+        # Sorted, so every run and every shard sees the same work manifest
+        for file in sorted(src_path.rglob("*")):
+            if not file.is_file() or any(skip in file.parts for skip in skip_dirs):
+                continue
+
+            processed_folder_parts = route_parts(file.stem, casing)
+            final_file_name = self.emitter.page_file
+            final_ext = new_extension if new_extension.startswith(".") else f".{new_extension}"
+
+            target_dir = dist_path / Path(*processed_folder_parts)
+            target_file = target_dir / f"{final_file_name}{final_ext}"
+            pages.append((file, processed_folder_parts, target_file))
+
+        return pages
+
+    def _shard_pages(self, pages):
+        """The pages this converter's shard converts: all of them when not sharded"""
+        if not self.shard:
+            return pages
+        index, count = self.shard
+        return [page for page in pages if shard_of(page[0].relative_to(self.source_path).as_posix(), count) == index]
+
+    def _finish_shard(self, pages, own_pages, failed):
+        fragment = write_fragment(self, self.shard, pages, own_pages, failed)
+        index, count = self.shard
+        print(f"🧩 Shard {index}/{count}: {len(own_pages)} of {len(pages)} pages, recorded in {fragment}")
+        print("   Run `reactify merge` over the shard outputs to write the routes")
+
+    def _write_pages(self, pages, verbose=None):
+        """Converts and writes the given pages, returns the set of files that failed"""
+        return write_pages([(self, pages)], verbose)
+
+    def _update_routes(self, pages, failed):
+        raise NotImplementedError
+
+    def watch(self, skip_dirs=None):
+        watch_project(self, self.pages_path, skip_dirs=skip_dirs or ["partials"])
+
+
+def write_pages(targets, verbose=None):
+    """
+    Converts pages once and writes them out for one or more converters.
+    Pages are written on a thread pool while the next ones convert; files
+    whose contents didn't change are not touched, so dev servers don't reload them.
+
+    :param targets: List of (converter, pages) where every pages list comes from
+                    _collect_pages() over the same source folder; conversion settings
+                    are taken from the first converter.
+    :param verbose: Print a line per page rather than a progress count (default: the first converter's setting).
+    :return: Set of source files that failed to convert.
+    """
+    lead, lead_pages = targets[0]
+    files = [file for file, _, _ in lead_pages]
+    emitters = [converter.emitter for converter, _ in targets]
+    failed = set()
+
+    # Very large pages are streamed straight to their TSX files instead of going through the pool
+    streamed = {file for file in files if should_stream(file, lead.stream_threshold)}
+    converted = [file for file in files if file not in streamed]
+    if lead.shared_components:
+        results = _convert_with_shared_components(converted, targets)
+    else:
+        results = convert_pages(converted, emitters, jobs=lead.jobs, cache=lead.cache, parser=lead.parser,
+                                includes=lead.includes)
+
+    verbose = lead.verbose if verbose is None else verbose
+    streamed_outputs = 0
+    streamed_changed = []
+    reports = {converter: IslandReport(converter.project_root) for converter, _ in targets
+               if converter.emitter.client_islands}
+    with PageWriter() as writer, Progress(len(files), verbose=verbose) as progress:
+        for index, file in enumerate(files):
+            outputs = [(converter, pages[index][2]) for converter, pages in targets]
+            if file in streamed:
+                with timed("pages.stream", file):
+                    error = stream_page(file, [(target_file, converter.emitter) for converter, target_file in outputs],
+                                        streamed_changed)
+            else:
+                _, tsx_codes, error = next(results)
+
+            if error:
+                progress.error(f"❌ TSX: {file.name} failed: {error}")
+                failed.add(file)
+                continue
+
+            if file in streamed:
+                streamed_outputs += len(outputs)
+                if any(converter.asset_rewriter for converter, _ in outputs):
+                    progress.error(f"⚠️ {file.name}: asset references are not rewritten in streamed pages")
+                if any(converter in reports for converter, _ in outputs):
+                    progress.error(f"⚠️ {file.name}: client islands are not split out of streamed pages")
+            else:
+                for position, (converter, target_file) in enumerate(outputs):
+                    tsx, modules = tsx_codes[position]
+                    _write_page(writer, converter, target_file, tsx, modules, file)
+                    if converter in reports:
+                        reports[converter].add(target_file, tsx, modules[0][1] if modules else None)
+
+            if verbose:
+                progress.page("\n".join(
+                    f"📁 TSX: {file.name} → "
+                    f"{target_file.relative_to(converter.pages_path) if len(targets) == 1 else target_file}"
+                    for converter, target_file in outputs
+                ))
+            else:
+                progress.page()
+
+    changed = writer.changed + len(streamed_changed)
+    unchanged = writer.unchanged + streamed_outputs - len(streamed_changed)
+    print(f"📝 {changed} files written, {unchanged} unchanged")
+    for report in reports.values():
+        report.save()
+    for converter, _ in targets:
+        lead.includes.save(converter.project_root / INCLUDE_GRAPH_FILE)
+    return failed
+
+
+def _write_page(writer, converter, target_file, tsx, modules, file):
+    """Queues a page file and its companion modules, and removes companion modules it no longer has"""
+    files = [(target_file, tsx)] + [(target_file.parent / name, module) for name, module in modules]
+    for output_file, contents in files:
+        if converter.asset_rewriter:
+            contents = converter.asset_rewriter.rewrite(contents, output_file)
+        writer.write(output_file, contents, file)
+
+    written = {name for name, _ in modules}
+    for name in converter.emitter.module_files:
+        if name not in written:
+            (target_file.parent / name).unlink(missing_ok=True)
+
+
+def _convert_with_shared_components(files, targets):
+    """
+    Parses every page, moves subtrees repeated across pages into shared components
+    and renders the pages with imports of them. Yields what convert_pages() does.
+    """
+    lead, lead_pages = targets[0]
+    position = {file: index for index, (file, _, _) in enumerate(lead_pages)}
+    parsed = list(convert_pages(files, None, jobs=lead.jobs, cache=lead.cache, parser=lead.parser,
+                                includes=lead.includes))
+
+    with timed("shared"):
+        pages = [result for _, result, error in parsed if not error]
+        components, page_components = extract_shared_components(pages, min_nodes=lead.shared_min_nodes)
+        for converter, _ in targets:
+            write_components(components, converter.components_path, converter.asset_rewriter,
+                             client=converter.emitter.client_islands)
+    if components:
+        uses = sum(len(names) for names in page_components)
+        print(f"🧩 {len(components)} shared components extracted, used {uses} times")
+
+    page_components = iter(page_components)
+    for file, result, error in parsed:
+        if error:
+            yield file, None, error
+            continue
+
+        page, fragments = result
+        names = next(page_components)
+        tsx_codes = []
+        with timed("pages.serialize", file):
+            for converter, pages in targets:
+                imports = component_imports(names, pages[position[file]][2], converter.components_path)
+                tsx, _, modules = converter.emitter.render(page, fragments, imports=imports)
+                tsx_codes.append((tsx, modules))
+        yield file, tsx_codes, None
+
+
+def build_projects(converters, skip_dirs=None):
+    """
+    Builds several framework projects from the same theme, parsing every page
+    once and writing it out with each converter's emitter.
+
+    :param converters: Converters created with create=False, all reading the same source folder.
+    """
+    skip_dirs = skip_dirs or ["partials"]
+    ready = [converter for converter in converters if converter.prepare_project()]
+    if not ready:
+        return
+
+    with timed("convert"):
+        manifests = [converter._collect_pages(skip_dirs=skip_dirs) for converter in ready]
+        targets = [(converter, converter._shard_pages(pages)) for converter, pages in zip(ready, manifests)]
+        failed = write_pages(targets)
+
+    for (converter, own_pages), pages in zip(targets, manifests):
+        converter.failed_pages = failed
+        if converter.shard:
+            converter._finish_shard(pages, own_pages, failed)
+        else:
+            converter._update_routes(pages, failed)
+
+    print(f"\n✅ {len(targets[0][1]) - len(failed)} pages converted for {', '.join(c.emitter.name for c in ready)}.")
+    if failed:
+        print(f"❌ {len(failed)} pages failed to convert.")
+    for converter in ready:
+        print(f"🚀 Project ready at: {converter.project_root}")
@@ -0,0 +1,62 @@
+"""
+Target frameworks by name. A framework module is imported only once it is selected,
+so `reactify --help` and argument errors don't load the converter.
+
+Other packages add targets with an entry point in the "reactify.frameworks" group,
+naming a BaseConverter subclass:
+
+    entry_points={"reactify.frameworks": ["remix = reactify_remix:RemixConverter"]}
+"""
+from importlib import import_module
+
+ENTRY_POINT_GROUP = "reactify.frameworks"
+
+# Built-in targets as "module:class", found without scanning installed packages
+BUILTIN_FRAMEWORKS = {
+    "react": "reactify.frameworks.react:ReactConverter",
+    "next": "reactify.frameworks.next:NextConverter",
+}
+
+_plugins = None
+_loaded = {}
+
+
+def _plugin_frameworks():
+    """Targets registered by installed packages; read once, as importing importlib.metadata is slow"""
+    global _plugins
+    if _plugins is None:
+        from importlib.metadata import entry_points
+
+        _plugins = {}
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            if entry_point.name not in BUILTIN_FRAMEWORKS:
+                _plugins.setdefault(entry_point.name, entry_point.value)
+    return _plugins
+
+
+def framework_names():
+    """Every available target: the built-in ones first, then plugins"""
+    return list(BUILTIN_FRAMEWORKS) + sorted(_plugin_frameworks())
+
+
+def is_framework(name):
+    return name in BUILTIN_FRAMEWORKS or name in _plugin_frameworks()
+
+
+def load_framework(name):
+    """Imports and returns the converter class of a target"""
+    if name not in _loaded:
+        target = BUILTIN_FRAMEWORKS.get(name) or _plugin_frameworks().get(name)
+        if target is None:
+            raise ValueError(f"Unknown framework '{name}', expected one of: {', '.join(framework_names())}")
+        module_name, _, attribute = target.partition(":")
+        converter_class = import_module(module_name)
+        for part in attribute.split("."):
+            converter_class = getattr(converter_class, part)
+        _loaded[name] = converter_class
+    return _loaded[name]
+
+
+def load_emitter(name):
+    """The PageEmitter of a target, for converting pages without building a project"""
+    return load_framework(name).emitter
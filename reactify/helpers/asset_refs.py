@@ -0,0 +1,290 @@
+"""
+Asset references in converted pages: a content-hash manifest of the theme's
+assets, fingerprinted copies of them under public/, and the rewrite that points
+<img src>, <link href> and <script src> at those copies or at ES imports.
+"""
+import hashlib
+import html
+import json
+import os
+import posixpath
+import re
+from pathlib import Path
+
+from reactify.config.base import ASSET_HASH_LENGTH, ASSET_PUBLIC_FOLDER, ASSET_REF_MODES
+from reactify.helpers.copy_assets import _file_digest, _place_file
+from reactify.helpers.output_files import write_if_changed
+
+# Start tags whose reference may be rewritten; script and style bodies are skipped over
+TAG_PATTERN = re.compile(r"<(img|link|script|style)\b([^<>]*)>")
+RAW_TEXT_END = {"script": re.compile(r"</script\s*>"), "style": re.compile(r"</style\s*>")}
+ATTRIBUTE_PATTERN = re.compile(r"""\s([^\s=/>]+)(?:=("[^"]*"|'[^']*'))?""")
+REFERENCE_ATTRIBUTES = {"img": "src", "script": "src", "link": "href"}
+
+CSS_URL_PATTERN = re.compile(r"""url\(\s*(['"]?)([^'")]+?)\1\s*\)""")
+EXTERNAL_URL_PATTERN = re.compile(r"^(?:[a-zA-Z][a-zA-Z0-9+.-]*:|//|#)")
+URL_SUFFIX_PATTERN = re.compile(r"([^?#]*)(.*)", flags=re.DOTALL)
+
+# Import lines and directives at the top of a page file, which asset imports go after
+HEADER_PATTERN = re.compile(r"(?:(?:import\s[^\n]*|['\"]use [a-z]+['\"];?)\n)*")
+
+# Length of the content hashes kept in the manifest
+DIGEST_LENGTH = 32
+
+
+def _digest(data):
+    return hashlib.blake2b(data).hexdigest()[:DIGEST_LENGTH]
+
+
+def _fingerprinted(relative, digest):
+    """images/logo.png -> images/logo.<hash>.png"""
+    folder, name = posixpath.split(relative)
+    stem, dot, extension = name.rpartition(".")
+    fingerprint = digest[:ASSET_HASH_LENGTH]
+    return posixpath.join(folder, f"{stem}.{fingerprint}.{extension}" if dot and stem else f"{name}.{fingerprint}")
+
+
+def _resolve(base, url):
+    """(path, suffix) a local url points at from folder base, suffix being its ?query#fragment; None if external"""
+    url = html.unescape(url).strip()
+    if not url or EXTERNAL_URL_PATTERN.match(url):
+        return None
+    path, suffix = URL_SUFFIX_PATTERN.match(url).groups()
+    path = path.lstrip("/") if path.startswith("/") else posixpath.normpath(posixpath.join(base, path))
+    while path.startswith("../"):
+        path = path[3:]
+    return path, suffix
+
+
+def public_url(relative_path):
+    """URL a file placed at public/<ASSET_PUBLIC_FOLDER>/relative_path is served at"""
+    return f"/{ASSET_PUBLIC_FOLDER}/{relative_path}"
+
+
+class AssetManifest:
+    """
+    Content hashes of every file in the assets folder, kept in manifest_file.
+
+    A file is only hashed again when its size or mtime changed. Stylesheets are
+    hashed after their url() references were pointed at the fingerprinted files,
+    so a changed font or image also renames the CSS that uses it. Byte-identical
+    files share one canonical path, and so one fingerprinted copy.
+    """
+
+    def __init__(self, assets_path, manifest_file):
+        self.assets_path = Path(assets_path)
+        self.manifest_file = Path(manifest_file)
+        self.hashes = {}  # relative path -> hash of the contents placed in public/
+        self.canonical = {}  # relative path -> first relative path with the same hash
+        self.styles = {}  # relative path of a stylesheet -> its bytes with url()s rewritten
+        self._files = {}  # relative path -> (size, mtime_ns, hash of the file as is)
+
+    def build(self):
+        """Hashes the assets folder, returns self"""
+        previous = self._load()
+        self._files = {}
+        for root, _, files in os.walk(self.assets_path, followlinks=True):
+            for name in files:
+                file = Path(root, name)
+                relative = file.relative_to(self.assets_path).as_posix()
+                stat = file.stat()
+                known = previous.get(relative, {})
+                if (known.get("size"), known.get("mtime_ns")) == (stat.st_size, stat.st_mtime_ns) and known.get("raw"):
+                    raw = known["raw"]
+                else:
+                    raw = _file_digest(file).hex()[:DIGEST_LENGTH]
+                self._files[relative] = (stat.st_size, stat.st_mtime_ns, raw)
+
+        self.hashes = {relative: info[2] for relative, info in self._files.items() if not relative.endswith(".css")}
+        self.styles = {}
+        for relative in sorted(self._files):
+            if relative.endswith(".css"):
+                self._hash_style(relative, set())
+
+        first = {}
+        self.canonical = {relative: first.setdefault(self.hashes[relative], relative) for relative in sorted(self.hashes)}
+        return self
+
+    def _hash_style(self, relative, visiting):
+        if relative in self.hashes:
+            return self.hashes[relative]
+        visiting.add(relative)
+        text = (self.assets_path / relative).read_bytes().decode("utf-8", "surrogateescape")
+
+        def replace(match):
+            target = _resolve(posixpath.dirname(relative), match.group(2))
+            if target is None or target[0] not in self._files or target[0] in visiting:
+                return match.group(0)
+            path, suffix = target
+            digest = self._hash_style(path, visiting) if path.endswith(".css") else self.hashes[path]
+            quote = match.group(1)
+            return f"url({quote}{public_url(_fingerprinted(path, digest))}{suffix}{quote})"
+
+        data = CSS_URL_PATTERN.sub(replace, text).encode("utf-8", "surrogateescape")
+        visiting.discard(relative)
+        self.styles[relative] = data
+        self.hashes[relative] = _digest(data)
+        return self.hashes[relative]
+
+    def public_path(self, relative):
+        """Where an asset's fingerprinted copy goes, relative to public/<ASSET_PUBLIC_FOLDER>"""
+        canonical = self.canonical[relative]
+        return _fingerprinted(canonical, self.hashes[canonical])
+
+    def references(self):
+        """What asset references are rewritten from: it changes when a fingerprint or canonical path does"""
+        return {relative: (self.canonical[relative], self.hashes[relative]) for relative in self.hashes}
+
+    def _load(self):
+        try:
+            return json.loads(self.manifest_file.read_text(encoding="utf-8")).get("files", {})
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        files = {}
+        for relative in sorted(self.hashes):
+            size, mtime_ns, raw = self._files[relative]
+            files[relative] = {
+                "size": size, "mtime_ns": mtime_ns, "raw": raw, "hash": self.hashes[relative],
+                "canonical": self.canonical[relative], "public": public_url(self.public_path(relative)),
+            }
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(self.manifest_file, json.dumps({"files": files}, indent=2) + "\n")
+
+
+def publish_assets(manifest, public_path, link="copy"):
+    """
+    Puts one fingerprinted copy of every distinct asset in public_path and removes
+    the ones no longer wanted. Names carry the content hash, so existing copies are kept.
+    :return: (placed, removed) file counts.
+    """
+    public_path = Path(public_path)
+    wanted = {manifest.public_path(relative): relative
+              for relative, canonical in manifest.canonical.items() if relative == canonical}
+
+    placed = removed = 0
+    for fingerprinted, relative in sorted(wanted.items()):
+        target = public_path / fingerprinted
+        if target.is_file():
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if relative in manifest.styles:
+            write_if_changed(target, manifest.styles[relative])
+        else:
+            _place_file(manifest.assets_path / relative, target, link)
+        placed += 1
+
+    for root, dirs, files in os.walk(public_path, topdown=False):
+        root = Path(root)
+        for name in files:
+            if (root / name).relative_to(public_path).as_posix() not in wanted:
+                (root / name).unlink()
+                removed += 1
+        for name in dirs:
+            if not any((root / name).iterdir()):
+                (root / name).rmdir()
+    return placed, removed
+
+
+def _identifier(relative):
+    """images/logo-dark.png -> assetLogoDark"""
+    name = posixpath.basename(relative)
+    words = re.findall(r"[A-Za-z0-9]+", name.rpartition(".")[0] or name)
+    return "asset" + "".join(word[:1].upper() + word[1:] for word in words)
+
+
+def _add_imports(tsx, lines):
+    """Adds import lines after the imports (and directives) at the top of a page file"""
+    end = HEADER_PATTERN.match(tsx).end()
+    block = "".join(line + "\n" for line in lines)
+    return tsx[:end] + block + ("\n" if end == 0 else "") + tsx[end:]
+
+
+class AssetRewriter:
+    """
+    Points asset references in one project's pages at something the bundler or
+    the server can fingerprint and cache.
+
+    In "import" mode <img src> becomes an imported binding, and a stylesheet <link>
+    a side-effect import of the CSS, so the bundler hashes and dedupes them. In
+    "public" mode, and for any other reference, the attribute points at the
+    fingerprinted copy in public/. Byte-identical assets are referred to by one path.
+
+    :param url_prefix: Folder the theme's pages refer to assets by, e.g. "assets".
+    :param assets_path: Where the project has the assets, that imports are relative to.
+    """
+
+    def __init__(self, manifest, mode, emitter, url_prefix, assets_path):
+        if mode not in ASSET_REF_MODES or mode == "keep":
+            raise ValueError(f"Unknown asset reference mode '{mode}', expected import or public")
+        self.manifest = manifest
+        self.mode = mode
+        self.emitter = emitter
+        self.url_prefix = url_prefix.strip("/") + "/"
+        self.assets_path = Path(assets_path)
+
+    def _asset(self, url):
+        resolved = _resolve("", url)
+        if resolved is None or not resolved[0].startswith(self.url_prefix):
+            return None
+        relative = resolved[0][len(self.url_prefix):]
+        return (relative, resolved[1]) if relative in self.manifest.canonical else None
+
+    def rewrite(self, tsx, target_file):
+        """Returns a page file's TSX with its asset references rewritten and the imports they need"""
+        parts = []
+        imports = {}  # canonical path -> binding, None for a side-effect import
+        position = 0
+        while match := TAG_PATTERN.search(tsx, position):
+            tag = match.group(1)
+            parts.append(tsx[position:match.start()])
+            parts.append(self._rewrite_tag(match.group(0), tag, match.group(2), imports))
+            position = match.end()
+            if tag in RAW_TEXT_END and not match.group(2).endswith("/"):
+                end = RAW_TEXT_END[tag].search(tsx, position)
+                stop = end.start() if end else len(tsx)
+                parts.append(tsx[position:stop])
+                position = stop
+        parts.append(tsx[position:])
+        tsx = "".join(parts)
+        if not imports:
+            return tsx
+
+        folder = Path(target_file).parent
+        lines = []
+        for canonical, name in imports.items():
+            module = Path(os.path.relpath(self.assets_path / canonical, folder)).as_posix()
+            module = module if module.startswith(".") else f"./{module}"
+            lines.append(f"import '{module}';" if name is None else self.emitter.asset_import(name, module))
+        return _add_imports(tsx, lines)
+
+    def _rewrite_tag(self, markup, tag, attributes, imports):
+        attribute = REFERENCE_ATTRIBUTES.get(tag)
+        values = dict(ATTRIBUTE_PATTERN.findall(attributes)) if attribute else {}
+        quoted = values.get(attribute)
+        asset = self._asset(quoted[1:-1]) if quoted else None
+        if asset is None:
+            return markup
+        relative, suffix = asset
+        canonical = self.manifest.canonical[relative]
+
+        if self.mode == "import":
+            if tag == "link" and "stylesheet" in values.get("rel", "")[1:-1].split():
+                imports.setdefault(canonical, None)
+                return ""
+            if tag == "img":
+                name = imports.get(canonical)
+                if name is None:
+                    taken = set(imports.values())
+                    name = base = _identifier(canonical)
+                    counter = 2
+                    while name in taken:
+                        name, counter = f"{base}{counter}", counter + 1
+                    imports[canonical] = name
+                value = "{" + self.emitter.asset_expression(name) + "}"
+                return markup.replace(f" {attribute}={quoted}", f" {attribute}={value}", 1)
+
+        fragment = suffix[suffix.index("#"):] if "#" in suffix else ""
+        value = f'"{public_url(self.manifest.public_path(relative))}{fragment}"'
+        return markup.replace(f" {attribute}={quoted}", f" {attribute}={value}", 1)
@@ -0,0 +1,202 @@
+"""
+Server/client split of Next pages: the parts of a page that need JavaScript in the
+browser (stateful React-Bootstrap components, event handlers) are moved into small
+'use client' components, and the rest of the page stays a server component.
+"""
+import json
+import re
+from pathlib import Path
+
+from reactify.helpers.convert_to_tsx import import_lines, render_markup
+from reactify.helpers.inline_styles import hoist_styles
+from reactify.helpers.output_files import write_if_changed
+from reactify.helpers.page_ir import Element, PageIR
+
+# React-Bootstrap components that keep state or listen to the user in the browser
+INTERACTIVE_COMPONENTS = {
+    "Accordion", "Carousel", "Collapse", "Dropdown", "DropdownItem", "DropdownMenu", "DropdownToggle", "Modal",
+    "ModalBody", "ModalDialog", "ModalFooter", "ModalHeader", "ModalTitle", "Navbar", "NavbarCollapse",
+    "NavbarToggle", "Offcanvas", "OverlayTrigger", "Tab", "Tabs", "Toast", "ToggleButton",
+}
+EVENT_ATTRIBUTE = re.compile(r"on[A-Z]")
+EVENT_MARKUP = re.compile(r"\son[A-Z]\w*=")
+NAME_PART = re.compile(r"[A-Za-z0-9]+")
+FIRST_TAG_PATTERN = re.compile(r"<([A-Za-z][\w.]*)")
+
+# Module next to a page file holding its client islands
+ISLANDS_MODULE = "islands"
+ISLANDS_FILE = f"{ISLANDS_MODULE}.tsx"
+REPORT_FILE = "client-islands.json"
+
+
+class Island:
+    """A client component cut out of a page: an element of it, or the converted markup of an included partial"""
+
+    __slots__ = ("name", "element", "markup", "used_components")
+
+    def __init__(self, name, element=None, markup=None, used_components=frozenset()):
+        self.name = name
+        self.element = element
+        self.markup = markup
+        self.used_components = used_components
+
+
+def is_interactive(element):
+    """True if the element itself needs the browser: a stateful component or an event handler"""
+    return (element.name.split(".")[0] in INTERACTIVE_COMPONENTS
+            or any(EVENT_ATTRIBUTE.match(key) for key, _ in element.attrs))
+
+
+def is_interactive_markup(markup, used_components):
+    """Same as is_interactive() for already converted markup, e.g. an included partial"""
+    return bool(INTERACTIVE_COMPONENTS & set(used_components)) or bool(EVENT_MARKUP.search(markup))
+
+
+def has_interactive(nodes):
+    """True if any element in the subtrees is interactive"""
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Element):
+            if is_interactive(node):
+                return True
+            stack.extend(node.children)
+    return False
+
+
+def _components(nodes, known):
+    """Names of the known components used in a subtree"""
+    used = set()
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Element):
+            name = node.name.split(".")[0]
+            if name in known:
+                used.add(name)
+            stack.extend(node.children)
+    return used
+
+
+def split_islands(page, fragments=None):
+    """
+    Cuts the outermost interactive elements (and interactive included partials) out of a page.
+    The page isn't modified; the returned one has <ClientX/> where each island was.
+
+    :return: (page, islands); the page is returned as is when it has none.
+    """
+    fragments = fragments or {}
+    interactive_fragments = [
+        placeholder for placeholder, (markup, components) in fragments.items()
+        if is_interactive_markup(markup, components)
+    ]
+    if not interactive_fragments and not has_interactive(page.nodes):
+        return page, []
+
+    islands = []
+    taken = set()
+
+    def island_name(root):
+        name = base = "Client" + "".join(part[:1].upper() + part[1:] for part in NAME_PART.findall(root or "Island"))
+        counter = 2
+        while name in taken:
+            name, counter = f"{base}{counter}", counter + 1
+        taken.add(name)
+        return name
+
+    nodes = []
+    stack = [(iter(page.nodes), nodes)]
+    while stack:
+        children, out = stack[-1]
+        node = next(children, None)
+        if node is None:
+            stack.pop()
+        elif isinstance(node, str):
+            for placeholder in interactive_fragments:
+                if placeholder in node:
+                    markup, components = fragments[placeholder]
+                    tag = FIRST_TAG_PATTERN.search(markup)
+                    name = island_name(tag.group(1) if tag else None)
+                    islands.append(Island(name, markup=markup, used_components=frozenset(components)))
+                    node = node.replace(placeholder, f"<{name}/>")
+            out.append(node)
+        elif is_interactive(node):
+            name = island_name(node.name)
+            islands.append(Island(name, element=node,
+                                  used_components=frozenset(_components([node], page.used_components))))
+            out.append(Element(name, (), [], True))
+        else:
+            copy = Element(node.name, node.attrs, [], node.void)
+            out.append(copy)
+            stack.append((iter(node.children), copy.children))
+
+    return PageIR(nodes, frozenset(_components(nodes, page.used_components))), islands
+
+
+def render_islands(islands, fragments=None):
+    """Returns the 'use client' module exporting a page's islands"""
+    used_components = set()
+    components = []
+    for island in islands:
+        used_components |= island.used_components
+        if island.element is None:
+            markup = f"<>\n    {island.markup}\n  </>"
+        else:
+            markup = render_markup(PageIR([island.element], frozenset()))
+            for placeholder, (fragment, fragment_components) in (fragments or {}).items():
+                if placeholder in markup:
+                    markup = markup.replace(placeholder, fragment)
+                    used_components |= fragment_components
+        components.append(f"export const {island.name} = () => (\n  {markup}\n);\n")
+    body, declarations = hoist_styles("\n".join(components))
+    constants = "".join(line + "\n" for line in declarations) + "\n" if declarations else ""
+    return f"'use client';\n\n{import_lines(used_components)}{constants}{body}"
+
+
+def island_imports(islands):
+    return [f"import {{ {', '.join(island.name for island in islands)} }} from './{ISLANDS_MODULE}';"]
+
+
+def island_count(module):
+    return module.count("export const ")
+
+
+class IslandReport:
+    """
+    Per-page record of the server/client split, written to .reactify/client-islands.json.
+
+    Client JavaScript saved is estimated as the size of the markup left in server
+    components, which the browser would download if every page were one client component.
+    """
+
+    def __init__(self, project_root):
+        self.project_root = Path(project_root)
+        self.report_file = self.project_root / ".reactify" / REPORT_FILE
+        self.pages = {}
+
+    def add(self, target_file, tsx, module=None):
+        self.pages[Path(target_file).relative_to(self.project_root).as_posix()] = {
+            "islands": island_count(module) if module else 0,
+            "server_bytes": len(tsx.encode("utf-8")),
+            "client_bytes": len(module.encode("utf-8")) if module else 0,
+        }
+
+    def save(self):
+        """Merges the pages into the report (dropping ones whose file is gone), prints a summary"""
+        try:
+            pages = json.loads(self.report_file.read_text(encoding="utf-8")).get("pages", {})
+        except (OSError, ValueError):
+            pages = {}
+        pages.update(self.pages)
+        pages = {page: entry for page, entry in sorted(pages.items()) if (self.project_root / page).exists()}
+
+        static = sum(1 for entry in pages.values() if not entry["islands"])
+        islands = sum(entry["islands"] for entry in pages.values())
+        saved = sum(entry["server_bytes"] for entry in pages.values())
+        client = sum(entry["client_bytes"] for entry in pages.values())
+        summary = {"static_pages": static, "interactive_pages": len(pages) - static, "islands": islands,
+                   "server_bytes": saved, "client_bytes": client}
+        self.report_file.parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(self.report_file, json.dumps({"summary": summary, "pages": pages}, indent=2) + "\n")
+        print(f"🏝️ {static} static pages as server components, {len(pages) - static} with {islands} client islands "
+              f"({client / 1024:.1f} KB); ~{saved / 1024:.1f} KB of page markup kept out of the client bundle")
@@ -0,0 +1,134 @@
+import hashlib
+import pickle
+import sqlite3
+import time
+from pathlib import Path
+
+from reactify.config.base import CACHE_PATH, CACHE_MAX_SIZE
+
+# Bump when convert_to_tsx changes its output (or the PageIR layout) without the rule tables changing
+CONVERTER_VERSION = 3
+
+
+def _callable_fingerprint(func):
+    code = getattr(func, "__code__", None)
+    if code is None:
+        return repr(func)
+    return repr((code.co_code, code.co_consts, code.co_names))
+
+
+def rules_fingerprint():
+    """
+    Returns a digest of everything that shapes the TSX output: the converter
+    version and the REACT_BOOTSTRAP_RULES, VARIANT_MAPPING and JSX_ATTRIBUTE_MAP tables.
+    """
+    from reactify.helpers import convert_to_tsx as rules
+
+    rule_parts = [
+        (
+            name,
+            rule["component"],
+            rule.get("class"),
+            getattr(rule.get("pattern"), "pattern", rule.get("pattern")),
+            _callable_fingerprint(rule.get("match")),
+            _callable_fingerprint(rule["props"]),
+        )
+        for name, rule in rules.REACT_BOOTSTRAP_RULES.items()
+    ]
+    payload = repr((
+        CONVERTER_VERSION,
+        rules.COL_PATTERN.pattern,
+        rules.VARIANTS,
+        sorted(rules.VARIANT_MAPPING.items()),
+        sorted(rules.JSX_ATTRIBUTE_MAP.items()),
+        rule_parts,
+    ))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ConversionCache:
+    """
+    On-disk cache of parsed pages (pickled PageIR, so one entry serves every
+    emitter), keyed by the content hash of the input HTML and the rules
+    fingerprint. Shared by every project and evicted least-recently-used once
+    it grows past max_size bytes.
+
+    :param commit_every: Commit after this many writes instead of only on flush(), so
+                         processes sharing the cache (`reactify batch`) aren't locked
+                         out of it for a whole run.
+    """
+
+    def __init__(self, cache_path=CACHE_PATH, max_size=CACHE_MAX_SIZE, commit_every=None):
+        self.cache_path = Path(cache_path)
+        self.max_size = max_size
+        self.commit_every = commit_every
+        self._writes = 0
+        self.fingerprint = rules_fingerprint()
+        self.hits = 0
+        self.misses = 0
+
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.cache_path / "conversions.sqlite3", timeout=30)
+        # Entries from before pages were cached as PageIR
+        self.db.execute("DROP TABLE IF EXISTS conversions")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "key TEXT PRIMARY KEY, page BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed)")
+        self.db.commit()
+
+    def key(self, html_content, parser):
+        digest = hashlib.sha256(f"{self.fingerprint}:{parser}".encode("utf-8"))
+        digest.update(html_content.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Returns the cached PageIR or None on a miss."""
+        row = self.db.execute("SELECT page FROM pages WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.db.execute("UPDATE pages SET accessed = ? WHERE key = ?", (time.time(), key))
+        self._wrote()
+        return pickle.loads(row[0])
+
+    def put(self, key, page):
+        data = pickle.dumps(page, protocol=pickle.HIGHEST_PROTOCOL)
+        self.db.execute(
+            "INSERT OR REPLACE INTO pages (key, page, size, accessed) VALUES (?, ?, ?, ?)",
+            (key, data, len(data), time.time()),
+        )
+        self._wrote()
+
+    def _wrote(self):
+        self._writes += 1
+        if self.commit_every and self._writes >= self.commit_every:
+            self.db.commit()
+            self._writes = 0
+
+    def evict(self):
+        """Drops least recently used entries until the cache fits in max_size."""
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_size:
+            return
+
+        rows = self.db.execute("SELECT key, size FROM pages ORDER BY accessed")
+        stale = []
+        for key, size in rows:
+            if total <= self.max_size:
+                break
+            stale.append((key,))
+            total -= size
+        self.db.executemany("DELETE FROM pages WHERE key = ?", stale)
+
+    def flush(self):
+        self.evict()
+        self.db.commit()
+
+    def close(self):
+        self.flush()
+        self.db.close()
+        print(f"🗃️ Cache: {self.hits} hits, {self.misses} misses")
@@ -0,0 +1,176 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from reactify.api import BatchConverter
+from reactify.config.base import (
+    DEFAULT_PARSER, PIPELINE_CHUNK_SIZE, PIPELINE_READ_AHEAD, PIPELINE_READ_THREADS, PIPELINE_TASKS_PER_WORKER,
+)
+from reactify.helpers.profiler import is_timing, record, timed
+
+
+def _read_file(file):
+    with open(file, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _timed_read(file):
+    start = time.perf_counter()
+    return _read_file(file), time.perf_counter() - start
+
+
+def read_files(files, threads=PIPELINE_READ_THREADS, read_ahead=PIPELINE_READ_AHEAD):
+    """
+    Reads files on a thread pool, at most read_ahead files ahead of the consumer.
+    :return: Generator of (file, html_content, error) in the order of files.
+    """
+    files = iter(files)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        while True:
+            while len(pending) < read_ahead:
+                file = next(files, None)
+                if file is None:
+                    break
+                pending.append((file, pool.submit(_timed_read, file)))
+            if not pending:
+                return
+
+            file, future = pending.popleft()
+            try:
+                html_content, seconds = future.result()
+            except Exception as e:
+                yield file, None, f"{type(e).__name__}: {e}"
+                continue
+            record("pages.read", seconds, file)
+            yield file, html_content, None
+
+
+def _render(page, fragments, emitters):
+    rendered = (emitter.render(page, fragments) for emitter in emitters)
+    return tuple((tsx, modules) for tsx, _, modules in rendered)
+
+
+class _Page:
+    """A page between being read and being handed out: its result, or the worker task computing it"""
+
+    __slots__ = ("file", "result", "key", "source", "fragments", "task")
+
+    def __init__(self, file, result=None, key=None, source=None, fragments=None):
+        self.file = file
+        self.result = result
+        self.key = key
+        self.source = source
+        self.fragments = fragments
+        self.task = None
+
+
+def convert_pages(files, emitters, jobs=None, cache=None, parser=DEFAULT_PARSER, includes=None):
+    """
+    Converts HTML files to TSX in a pipeline: pages are read on a thread pool,
+    looked up in the cache, converted on a process pool and handed out, each stage
+    overlapping the others. Each page is parsed once and written out by every emitter.
+
+    Results are yielded in the order of `files`, whatever order the workers
+    finish in, so the output is identical to a serial run. At most a bounded
+    window of pages is held between reading and yielding, so memory stays flat
+    however many pages there are: reading waits when the consumer falls behind.
+
+    :param files: List of HTML file paths.
+    :param emitters: PageEmitters to render every page with, or None to get the parsed pages
+                     back unrendered: (file, (page_ir, fragments), error) is yielded instead.
+    :param jobs: Number of worker processes (defaults to the CPU count, 1 runs serially).
+    :param cache: Optional ConversionCache.
+    :param parser: BeautifulSoup tree builder used to parse the pages.
+    :param includes: Optional IncludeResolver that expands @@include directives.
+    :return: Generator of (file, tsx_codes, error) tuples, tsx_codes holding one (tsx, modules) pair
+             per emitter (see PageEmitter.render); tsx_codes is None when error is set.
+    """
+    files = list(files)
+    jobs = jobs or os.cpu_count() or 1
+    workers = 1 if len(files) <= 1 else min(jobs, len(files))
+    chunk_size = max(1, min(PIPELINE_CHUNK_SIZE, len(files) // (workers * PIPELINE_TASKS_PER_WORKER)))
+    window = workers * PIPELINE_TASKS_PER_WORKER * chunk_size
+    profile = is_timing()
+
+    batch = BatchConverter(jobs=workers, parser=parser)
+    queued = deque()  # pages in file order, up to window of them
+    chunk = []  # cache misses not sent to the workers yet
+
+    def submit():
+        task = batch.submit([page.source for page in chunk], emitters, keep_page=bool(cache), profile=profile)
+        for position, page in enumerate(chunk):
+            page.task = (task, position)
+            page.source = None
+        chunk.clear()
+
+    def complete(page):
+        """Waits for a page's worker task and stores its result"""
+        if page.task is None:
+            submit()
+        task, position = page.task
+        tsx_codes, _, page_ir, error, timings = task.result()[position]
+        for phase, seconds in (timings or {}).items():
+            record(f"pages.{phase}", seconds, page.file)
+        if cache and not error:
+            cache.put(page.key, page_ir)
+        if error or emitters is not None:
+            page.result = (tsx_codes, error)
+        else:
+            page.result = ((page_ir, page.fragments), None)
+
+    def ready(page):
+        if page.result is None and page.task is not None and page.task[0].done():
+            complete(page)
+        return page.result is not None
+
+    try:
+        for file, html_content, error in read_files(files):
+            page = _Page(file)
+            queued.append(page)
+            if error:
+                page.result = (None, error)
+            else:
+                try:
+                    fragments = {}
+                    if includes:
+                        with timed("pages.includes", file):
+                            html_content, fragments = includes.expand(file, html_content)
+                except Exception as e:
+                    page.result = (None, f"{type(e).__name__}: {e}")
+                else:
+                    key = cached = None
+                    if cache:
+                        # Included partials are part of the input: editing one must miss the cache
+                        with timed("pages.cache", file):
+                            key = cache.key(html_content + "".join(markup for markup, _ in fragments.values()),
+                                            parser)
+                            cached = cache.get(key)
+                    if cached is not None:
+                        page.result = (
+                            _render(cached, fragments, emitters) if emitters is not None else (cached, fragments),
+                            None,
+                        )
+                    else:
+                        page.key, page.source, page.fragments = key, (html_content, fragments), fragments
+                        chunk.append(page)
+                        if len(chunk) >= chunk_size:
+                            submit()
+
+            # Hand out every page that is done, in file order, and wait when the window is full
+            while queued and (ready(queued[0]) or len(queued) >= window):
+                page = queued.popleft()
+                if page.result is None:
+                    complete(page)
+                yield page.file, *page.result
+
+        while queued:
+            page = queued.popleft()
+            if page.result is None:
+                complete(page)
+            yield page.file, *page.result
+    finally:
+        batch.close()
+        if cache:
+            cache.flush()
@@ -1,6 +1,13 @@
+import importlib.util
 import re
-from bs4 import BeautifulSoup
+import time
+from bs4 import BeautifulSoup, Doctype, NavigableString
+from reactify.config.base import DEFAULT_PARSER, PARSERS
+from reactify.helpers.inline_styles import hoist_styles, style_object
+from reactify.helpers.page_ir import Expression, PageIR, from_soup, render
 from reactify.helpers.parsers import parse_col_class
+from reactify.helpers.rule_index import RuleIndex
+from reactify.helpers.rule_packs import RULE_PACKS
 
 # Known Bootstrap variants
 VARIANTS = ["primary", "secondary", "success", "danger", "warning", "info", "light", "dark", "link"]
@@ -19,143 +26,305 @@ JSX_ATTRIBUTE_MAP = {
 }
 
 
-def get_variant_from_class(cls):
-    """Return (component, variant) tuple if the class matches a known variant pattern"""
-    for prefix, component in VARIANT_MAPPING.items():
-        if cls.startswith(prefix):
-            variant = cls[len(prefix):]
-            if variant in VARIANTS:
-                return component, variant
-    return None, None
-
-
-def should_strip_class(cls, component_type):
-    """Return True if class is handled as variant or by structural rule"""
-    comp, variant = get_variant_from_class(cls)
-    if comp and comp.lower() == component_type.lower():
-        return True
-    for rule in REACT_BOOTSTRAP_RULES.values():
-        if rule["component"].split(".")[0].lower() == component_type.lower() and rule["match"](cls):
-            return True
-    return False
-
-
 COL_PATTERN = re.compile(r"^col(-(sm|md|lg|xl|xxl))?(-[0-9]+|-(auto))?$")
 
-# Basic structural/component rules
+# Basic structural/component rules.
+# A rule matches on an exact "class", a regex "pattern" or, for anything else, a "match" callable.
 REACT_BOOTSTRAP_RULES = {
-    "container": {"component": "Container", "match": lambda c: c == "container", "props": lambda c: {}},
-    "container-fluid": {"component": "Container", "match": lambda c: c == "container-fluid",
+    "container": {"component": "Container", "class": "container", "props": lambda c: {}},
+    "container-fluid": {"component": "Container", "class": "container-fluid",
                         "props": lambda c: {"fluid": True}},
-    "row": {"component": "Row", "match": lambda c: c == "row", "props": lambda c: {}},
+    "row": {"component": "Row", "class": "row", "props": lambda c: {}},
     "col": {
         "component": "Col",
-        "match": lambda c: bool(COL_PATTERN.match(c)),
+        "pattern": COL_PATTERN,
         "props": lambda c: parse_col_class(c)
     },
 
-    "alert": {"component": "Alert", "match": lambda c: c == "alert", "props": lambda c: {}},
+    "alert": {"component": "Alert", "class": "alert", "props": lambda c: {}},
 
-    "btn": {"component": "Button", "match": lambda c: c == "btn", "props": lambda c: {}},
-    "btn-lg": {"component": "Button", "match": lambda c: c == "btn-lg", "props": lambda c: {"size": "lg"}},
-    "btn-sm": {"component": "Button", "match": lambda c: c == "btn-sm", "props": lambda c: {"size": "sm"}},
+    "btn": {"component": "Button", "class": "btn", "props": lambda c: {}},
+    "btn-lg": {"component": "Button", "class": "btn-lg", "props": lambda c: {"size": "lg"}},
+    "btn-sm": {"component": "Button", "class": "btn-sm", "props": lambda c: {"size": "sm"}},
 
-    "card": {"component": "Card", "match": lambda c: c == "card", "props": lambda c: {}},
-    "card-body": {"component": "CardBody", "match": lambda c: c == "card-body", "props": lambda c: {}},
-    "card-header": {"component": "CardHeader", "match": lambda c: c == "card-header", "props": lambda c: {}},
-    "card-footer": {"component": "CardFooter", "match": lambda c: c == "card-footer", "props": lambda c: {}},
+    "card": {"component": "Card", "class": "card", "props": lambda c: {}},
+    "card-body": {"component": "CardBody", "class": "card-body", "props": lambda c: {}},
+    "card-header": {"component": "CardHeader", "class": "card-header", "props": lambda c: {}},
+    "card-footer": {"component": "CardFooter", "class": "card-footer", "props": lambda c: {}},
 
-    "form-label": {"component": "FormLabel", "match": lambda c: c == "form-label", "props": lambda c: {}},
-    "form-control": {"component": "FormControl", "match": lambda c: c == "form-control", "props": lambda c: {}},
-    "form-group": {"component": "FormGroup", "match": lambda c: c == "form-group", "props": lambda c: {}},
+    "form-label": {"component": "FormLabel", "class": "form-label", "props": lambda c: {}},
+    "form-control": {"component": "FormControl", "class": "form-control", "props": lambda c: {}},
+    "form-group": {"component": "FormGroup", "class": "form-group", "props": lambda c: {}},
 
-    "dropdown": {"component": "Dropdown", "match": lambda c: c == "dropdown", "props": lambda c: {}},
-    "dropdown-menu": {"component": "DropdownMenu", "match": lambda c: c == "dropdown-menu", "props": lambda c: {}},
-    "dropdown-item": {"component": "DropdownItem", "match": lambda c: c == "dropdown-item", "props": lambda c: {}},
+    "dropdown": {"component": "Dropdown", "class": "dropdown", "props": lambda c: {}},
+    "dropdown-menu": {"component": "DropdownMenu", "class": "dropdown-menu", "props": lambda c: {}},
+    "dropdown-item": {"component": "DropdownItem", "class": "dropdown-item", "props": lambda c: {}},
 }
 
 
-def convert_to_tsx(html_content):
+# Rule packs registered in this process, name -> rules, in the order they were added
+REGISTERED_RULE_PACKS = {}
+
+_rule_index = None
+
+
+def get_rule_index():
+    """Returns the compiled RuleIndex, building it on first use"""
+    global _rule_index
+    if _rule_index is None:
+        _rule_index = RuleIndex(REACT_BOOTSTRAP_RULES, VARIANT_MAPPING, VARIANTS)
+    return _rule_index
+
+
+def build_rule_index(packs=()):
+    """
+    Compiles the rules in use plus the named packs from rule_packs into a RuleIndex of
+    its own, leaving the rules everything else converts with untouched.
+    """
+    rules = dict(REACT_BOOTSTRAP_RULES)
+    for name in packs:
+        if name not in RULE_PACKS:
+            raise ValueError(f"Unknown rule pack '{name}', expected one of: {', '.join(RULE_PACKS)}")
+        rules.update(RULE_PACKS[name])
+    return RuleIndex(rules, VARIANT_MAPPING, VARIANTS)
+
+
+def register_rule_pack(name, rules=None):
+    """
+    Adds a pack of extra rules after the built-in ones.
+    Packs shipped in reactify.helpers.rule_packs can be registered by name alone.
+    Registering a pack again does nothing; other rules under a name already taken are refused.
+    """
+    global _rule_index
+    if rules is None:
+        if name not in RULE_PACKS:
+            raise ValueError(f"Unknown rule pack '{name}', expected one of: {', '.join(RULE_PACKS)}")
+        rules = RULE_PACKS[name]
+    registered = REGISTERED_RULE_PACKS.get(name)
+    if registered is not None:
+        if registered is rules:
+            return
+        raise ValueError(f"Rule pack '{name}' is already registered with other rules")
+    REACT_BOOTSTRAP_RULES.update(rules)
+    REGISTERED_RULE_PACKS[name] = rules
+    _rule_index = None
+
+
+def registered_rule_packs():
+    """
+    Returns the registered packs as (name, rules) pairs, for worker processes to register
+    them again; rules is None for a pack shipped in rule_packs, which is found by name.
+    """
+    return [(name, None if RULE_PACKS.get(name) is rules else rules) for name, rules in REGISTERED_RULE_PACKS.items()]
+
+
+def get_variant_from_class(cls):
+    """Return (component, variant) tuple if the class matches a known variant pattern"""
+    info = get_rule_index().lookup(cls)
+    return info.variant_component, info.variant
+
+
+def should_strip_class(cls, component_type):
+    """Return True if class is handled as variant or by structural rule"""
+    return get_rule_index().should_strip(cls, component_type)
+
+
+COMMENT_PATTERN = re.compile(r"<!--.*?-->", flags=re.DOTALL)
+INCLUDE_PATTERN = re.compile(r"@@include\((.*?)\)", flags=re.DOTALL)
+
+# Self-closing tag cleanup on the serialised output, in one pass
+SELF_CLOSING_PATTERN = re.compile(r"<br>\s*|\s+/>\s*")
+
+
+def _self_closing(match):
+    return "<br />" if match.group(0).startswith("<br>") else " />"
+
+
+def resolve_parser(parser):
+    """Returns parser if its library is installed, otherwise falls back to html.parser"""
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown parser '{parser}', expected one of: {', '.join(PARSERS)}")
+    if parser != "html.parser" and importlib.util.find_spec(parser) is None:
+        print(f"⚠️ Parser '{parser}' is not installed, falling back to html.parser")
+        return "html.parser"
+    return parser
+
+
+def convert_to_tsx(html_content, parser=DEFAULT_PARSER):
+    tsx, _ = convert_html(html_content, parser)
+    return tsx
+
+
+def page_wrapper(used_components, imports=(), declarations=(), hoist=False):
+    """
+    Returns the (head, tail) TSX that wraps a page's JSX markup; imports are extra import
+    lines and declarations module-level constants the markup uses. With hoist, the markup
+    itself is a module-level constant, built once rather than on every render.
+    """
+    head = import_lines(used_components, imports) + "".join(line + "\n" for line in declarations)
+    if declarations:
+        head += "\n"
+    if hoist:
+        return f"{head}const content = (\n  <>\n    ", "\n  </>\n);\n\nconst Page = () => content;\n\nexport default Page;\n"
+    return f"{head}const Page = () => {{\n  return (\n    <>\n      ", "\n    </>\n  );\n};\n\nexport default Page;\n"
+
+
+def import_lines(used_components, imports=()):
+    """The import block for react-bootstrap components and any extra import lines"""
+    lines = [f"import {{ {', '.join(sorted(used_components))} }} from 'react-bootstrap';"] if used_components else []
+    lines.extend(imports)
+    return "".join(line + "\n" for line in lines) + "\n" if lines else ""
+
+
+def convert_html(html_content, parser=DEFAULT_PARSER, fragments=None, timings=None, emitter=None):
+    """
+    Converts an HTML page and returns (tsx_code, used_components).
+
+    fragments maps placeholder text left in the page (by the include resolver)
+    to already converted (markup, used_components) that is spliced in its place.
+    timings, if given, is a dict that receives the seconds spent per phase
+    (parse, rules, serialize).
+    """
+    return render_page(parse_page(html_content, parser, timings), fragments, emitter, timings)
+
+
+def render_page(page, fragments=None, emitter=None, timings=None, imports=()):
+    """
+    Writes a PageIR out as a page file with the given emitter (a plain Page
+    component if None), returns (tsx_code, used_components).
+    imports are extra import lines, e.g. for shared components. Style objects
+    are hoisted to module-level constants.
+    """
+    start = time.perf_counter() if timings is not None else None
+    tsx = render_markup(page)
+    used_components = set(page.used_components)
+
+    for placeholder, (markup, components) in (fragments or {}).items():
+        if placeholder in tsx:
+            tsx = tsx.replace(placeholder, markup)
+            used_components |= components
+
+    tsx, declarations = hoist_styles(tsx)
+    if emitter:
+        head, tail = emitter.wrapper(used_components, imports, declarations)
+    else:
+        head, tail = page_wrapper(used_components, imports, declarations)
+    tsx = head + tsx + tail
+    if timings is not None:
+        timings["serialize"] = timings.get("serialize", 0.0) + time.perf_counter() - start
+    return tsx, used_components
+
+
+def render_markup(page):
+    """Serialises a PageIR to JSX markup"""
+    return SELF_CLOSING_PATTERN.sub(_self_closing, render(page.nodes).strip())
+
+
+def apply_rules(name, attrs, used_components, rule_index=None):
+    """
+    Applies the component, variant and JSX attribute rules to one tag.
+    attrs is updated in place and components used are added to used_components.
+
+    :return: The new tag name.
+    """
+    rule_index = rule_index or get_rule_index()
+    class_infos = [rule_index.lookup(cls) for cls in attrs.get("class", [])]
+    new_props = {}
+
+    # React-Bootstrap component mapping
+    for info in class_infos:
+        if info.component:
+            name = info.component
+            new_props.update(info.props)
+            used_components.add(info.component.split(".")[0])
+
+    # Variant prop extraction
+    for info in class_infos:
+        if info.variant_component and name.lower() == info.variant_component.lower():
+            new_props["variant"] = info.variant
+
+    # JSX attribute mapping
+    for attr, val in list(attrs.items()):
+        new_attr = JSX_ATTRIBUTE_MAP.get(attr, attr)
+        if new_attr != attr:
+            del attrs[attr]
+        attrs[new_attr] = val
+
+    # Inline styles become style objects, as JSX expects
+    if "style" in attrs:
+        style = style_object(attrs["style"]) if isinstance(attrs["style"], str) else None
+        if style:
+            attrs["style"] = Expression(style)
+        else:
+            del attrs["style"]
+
+    # Merge props into tag
+    for prop, val in new_props.items():
+        if isinstance(val, bool) and val is True:
+            attrs[prop] = None
+        else:
+            attrs[prop] = val
+
+    # Clean className
+    if "className" in attrs:
+        class_val = attrs["className"]
+        existing_classes = class_val if isinstance(class_val, list) else str(class_val).split()
+        component_type = name.split(".")[0]
+
+        cleaned = [cls for cls in existing_classes if not rule_index.should_strip(cls, component_type)]
+
+        if cleaned:
+            attrs["className"] = " ".join(cleaned)
+        else:
+            del attrs["className"]
+
+    return name
+
+
+def convert_markup(html_content, parser=DEFAULT_PARSER, timings=None):
+    """Converts the data-content/body markup of a page, returns (jsx_markup, used_components)"""
+    page = parse_page(html_content, parser, timings)
+    return render_markup(page), set(page.used_components)
+
+
+def parse_page(html_content, parser=DEFAULT_PARSER, timings=None, rule_index=None):
+    """
+    Parses a page and applies the rules to its data-content/body element, returns a PageIR.
+    rule_index defaults to the registered rules (see get_rule_index()).
+    """
     used_components = set()
+    start = time.perf_counter() if timings is not None else None
 
     # Remove HTML comments
-    html_content = re.sub(r"<!--.*?-->", "", html_content, flags=re.DOTALL)
+    if "<!--" in html_content:
+        html_content = COMMENT_PATTERN.sub("", html_content)
 
     # Comment out all @@include(...) directives (including multiline)
-    html_content = re.sub(
-        r"@@include\((.*?)\)",
-        lambda m: f"{{/* {m.group(0)} */}}",
-        html_content,
-        flags=re.DOTALL
-    )
-
-    soup = BeautifulSoup(html_content, "html.parser")
+    if "@@include" in html_content:
+        html_content = INCLUDE_PATTERN.sub(lambda m: f"{{/* {m.group(0)} */}}", html_content)
+
+    # Parse once and transform the selected subtree in place
+    soup = BeautifulSoup(html_content, parser)
     content = soup.find(attrs={"data-content": True}) or soup.body or soup
-    inner_html = content.decode_contents() if hasattr(content, "decode_contents") else str(content)
-    tsx_soup = BeautifulSoup(inner_html, "html.parser")
-
-    for tag in tsx_soup.find_all(True):
-        original_classes = tag.get("class", [])
-        new_props = {}
-
-        # React-Bootstrap component mapping
-        for cls in original_classes:
-            for rule in REACT_BOOTSTRAP_RULES.values():
-                if rule["match"](cls):
-                    tag.name = rule["component"]
-                    new_props.update(rule["props"](cls))
-                    used_components.add(rule["component"].split(".")[0])
-                    break
-
-        # Variant prop extraction
-        for cls in original_classes:
-            component, variant = get_variant_from_class(cls)
-            if component and tag.name.lower() == component.lower():
-                new_props["variant"] = variant
-
-        # JSX attribute mapping
-        for attr, val in list(tag.attrs.items()):
-            new_attr = JSX_ATTRIBUTE_MAP.get(attr, attr)
-            if new_attr != attr:
-                del tag.attrs[attr]
-            tag.attrs[new_attr] = val
-
-        # Merge props into tag
-        for prop, val in new_props.items():
-            if isinstance(val, bool) and val is True:
-                tag.attrs[prop] = None
-            else:
-                tag.attrs[prop] = val
-
-        # Clean className
-        if "className" in tag.attrs:
-            class_val = tag.attrs["className"]
-            existing_classes = class_val if isinstance(class_val, list) else str(class_val).split()
-            component_type = tag.name.split(".")[0]
-
-            cleaned = []
-            for cls in existing_classes:
-                if should_strip_class(cls, component_type):
-                    continue
-                cleaned.append(cls)
-
-            if cleaned:
-                tag.attrs["className"] = " ".join(cleaned)
-            else:
-                del tag.attrs["className"]
-
-    tsx = str(tsx_soup).strip()
-    tsx = re.sub(r"<br>", "<br />", tsx)
-    tsx = re.sub(r"\s+/>\s*", " />", tsx)
-
-    imports = f"import {{ {', '.join(sorted(used_components))} }} from 'react-bootstrap';\n\n" if used_components else ""
-    return f"""{imports}const Page = () => {{
-  return (
-    <>
-      {tsx}
-    </>
-  );
-}};
-
-export default Page;
-"""
+    if timings is not None:
+        parsed = time.perf_counter()
+        timings["parse"] = timings.get("parse", 0.0) + parsed - start
+
+    # Doctypes serialise with a trailing newline, which the old parse-twice pipeline read back as text
+    for doctype in content.find_all(string=lambda node: isinstance(node, Doctype)):
+        following = doctype.next_sibling
+        if type(following) is NavigableString:
+            text = "\n" + following
+            following.replace_with("\n" if text.isspace() else text)
+        else:
+            doctype.insert_after("\n")
+
+    rule_index = rule_index or get_rule_index()
+
+    for tag in content.find_all(True):
+        tag.name = apply_rules(tag.name, tag.attrs, used_components, rule_index)
+
+    page = PageIR(from_soup(content), frozenset(used_components))
+    if timings is not None:
+        timings["rules"] = timings.get("rules", 0.0) + time.perf_counter() - parsed
+    return page
@@ -1,6 +1,14 @@
+import hashlib
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from reactify.config.base import LINK_MODES
+
+# ioctl that clones a file's extents on btrfs/xfs (see <linux/fs.h>)
+FICLONE = 0x40049409
+
 
 def copy_assets(source_path: Path, destination_path: Path, preserve=None):
     """
@@ -44,3 +52,212 @@ def copy_assets(source_path: Path, destination_path: Path, preserve=None):
         print(f"✅ Copied: {item} → {target}")
 
     print("\n🎉 Asset copy completed.\n")
+
+
+def copy_changed_assets(source_path: Path, destination_path: Path, changed, checksum=False, link="copy"):
+    """
+    Mirrors only the given changed paths from source_path into destination_path:
+    files and folders that exist are placed like sync_assets() does, ones that are gone are removed.
+
+    Args:
+        source_path (str | Path): Folder containing custom assets.
+        destination_path (str | Path): Folder the assets were copied to.
+        changed (Iterable[Path]): Changed paths inside source_path.
+        checksum (bool): Compare contents when mtimes differ.
+        link (str): "copy", "hardlink" or "reflink", as for sync_assets().
+    """
+    source = Path(source_path)
+    destination = Path(destination_path)
+
+    def place(file, target):
+        if _is_unchanged(file.stat(), file, target, checksum):
+            return
+        if target.is_dir():
+            shutil.rmtree(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        _place_file(file, target, link)
+        print(f"✅ Copied: {file} → {target}")
+
+    for item in sorted(changed):
+        target = destination / item.relative_to(source)
+        if item.is_dir():
+            for root, _, files in os.walk(item, followlinks=True):
+                for name in files:
+                    file = Path(root, name)
+                    place(file, target / file.relative_to(item))
+        elif item.is_file():
+            place(item, target)
+        elif target.is_dir():
+            shutil.rmtree(target)
+            print(f"🗑️ Removed folder: {target}")
+        elif target.exists():
+            target.unlink()
+            print(f"🗑️ Removed file: {target}")
+
+
+def _file_digest(path):
+    digest = hashlib.blake2b()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _is_unchanged(src_stat, source, target, checksum):
+    try:
+        dst_stat = target.stat()
+    except FileNotFoundError:
+        return False
+
+    if (src_stat.st_dev, src_stat.st_ino) == (dst_stat.st_dev, dst_stat.st_ino):
+        return True
+    if src_stat.st_size != dst_stat.st_size:
+        return False
+    if src_stat.st_mtime_ns == dst_stat.st_mtime_ns:
+        return True
+    if checksum and _file_digest(source) == _file_digest(target):
+        # Same bytes, just a different mtime: line the mtimes up so the next run skips the hash
+        os.utime(target, ns=(dst_stat.st_atime_ns, src_stat.st_mtime_ns))
+        return True
+    return False
+
+
+def _clone_file(source, target):
+    """Copies file data with a reflink, or copy_file_range, whichever the filesystem supports"""
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        try:
+            import fcntl
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return
+        except (ImportError, OSError):
+            pass
+
+        if hasattr(os, "copy_file_range"):
+            try:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                if remaining <= 0:
+                    return
+                src.seek(0)
+                dst.seek(0)
+                dst.truncate()
+            except OSError:
+                src.seek(0)
+                dst.seek(0)
+                dst.truncate()
+
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+
+
+def _place_file(source, target, link):
+    """
+    Puts source at target through a temporary file, so a target that is a hardlink
+    to some other file is replaced rather than written through.
+    """
+    temp = target.with_name(f".{target.name}.reactify-tmp")
+    if temp.exists():
+        temp.unlink()
+
+    if link == "hardlink":
+        try:
+            os.link(source, temp)
+            os.replace(temp, target)
+            return
+        except OSError:
+            pass  # different filesystem or no hardlink support, copy instead
+
+    if link == "reflink":
+        _clone_file(source, temp)
+        shutil.copystat(source, temp)
+    else:
+        shutil.copy2(source, temp)
+    os.replace(temp, target)
+
+
+def sync_assets(source_path: Path, destination_path: Path, preserve=None, checksum=False, link="copy", jobs=None):
+    """
+    Makes destination_path match source_path while touching as little as possible:
+    only new or changed files are copied and only files missing from the source are removed.
+
+    A file is unchanged when size and mtime match, or with checksum=True when
+    the size matches and the contents hash the same.
+
+    Args:
+        source_path (str | Path): Folder containing custom assets.
+        destination_path (str | Path): Folder to sync the assets into.
+        preserve (list[str]): Top-level file/folder names in destination to leave alone.
+        checksum (bool): Compare contents when mtimes differ.
+        link (str): "copy", "hardlink" or "reflink"; the last two fall back to copying when unsupported.
+        jobs (int): Threads used for copying.
+
+    Returns:
+        dict: copied/skipped/removed file counts and copied_bytes/skipped_bytes.
+    """
+    source = Path(source_path)
+    destination = Path(destination_path)
+    preserve = set(preserve or [])
+    if link not in LINK_MODES:
+        raise ValueError(f"Unknown link mode '{link}', expected one of: {', '.join(LINK_MODES)}")
+
+    destination.mkdir(parents=True, exist_ok=True)
+    stats = {"copied": 0, "copied_bytes": 0, "skipped": 0, "skipped_bytes": 0, "removed": 0}
+
+    wanted = {}
+    for root, dirs, files in os.walk(source, followlinks=True):
+        for name in files:
+            file = Path(root, name)
+            wanted[file.relative_to(source)] = file
+
+    # Remove orphans, deepest first so emptied folders can go too
+    for root, dirs, files in os.walk(destination, topdown=False):
+        root = Path(root)
+        relative_root = root.relative_to(destination)
+        if relative_root.parts and relative_root.parts[0] in preserve:
+            continue
+        for name in files:
+            relative = relative_root / name
+            if relative.parts[0] in preserve or relative in wanted:
+                continue
+            (root / name).unlink()
+            stats["removed"] += 1
+        for name in dirs:
+            folder = root / name
+            if (relative_root / name).parts[0] not in preserve and not any(folder.iterdir()):
+                folder.rmdir()
+
+    def sync_file(item):
+        relative, file = item
+        target = destination / relative
+        src_stat = file.stat()
+        if _is_unchanged(src_stat, file, target, checksum):
+            return False, src_stat.st_size
+        if target.is_dir():
+            shutil.rmtree(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        _place_file(file, target, link)
+        return True, src_stat.st_size
+
+    with ThreadPoolExecutor(max_workers=jobs or min(32, (os.cpu_count() or 1) + 4)) as executor:
+        for copied, size in executor.map(sync_file, wanted.items()):
+            key = "copied" if copied else "skipped"
+            stats[key] += 1
+            stats[f"{key}_bytes"] += size
+
+    print(
+        f"📦 Synced assets '{source}' → '{destination}': "
+        f"{stats['copied']} copied ({_format_size(stats['copied_bytes'])}), "
+        f"{stats['skipped']} unchanged ({_format_size(stats['skipped_bytes'])}), "
+        f"{stats['removed']} removed"
+    )
+    return stats
+
+
+def _format_size(size):
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
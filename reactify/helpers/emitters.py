@@ -0,0 +1,105 @@
+import copy
+
+from reactify.helpers.client_islands import ISLANDS_FILE, island_imports, render_islands, split_islands
+from reactify.helpers.convert_to_tsx import page_wrapper, render_page
+
+
+class PageEmitter:
+    """
+    Writes converted page markup out as one framework's page file.
+    Emitters are plain module-level objects so they can be sent to worker processes.
+    """
+
+    # Target name, as given on the command line
+    name = None
+    # File name (without extension) every page is written to inside its route folder
+    page_file = "index"
+    # Folder of the project the route folders go to
+    pages_folder = "src/pages"
+    # Companion modules render() may write next to a page file; ones it didn't write for a page are stale
+    module_files = ()
+    # Split pages into server components and 'use client' islands
+    client_islands = False
+    # Build the page markup once, as a module-level constant, instead of on every render
+    hoist_static = False
+
+    def render(self, page, fragments=None, imports=(), timings=None):
+        """
+        Writes a PageIR out as this framework's page file.
+        :return: (tsx_code, used_components, modules), modules being (file name, tsx) pairs
+                 of companion modules that go next to the page file.
+        """
+        tsx, used_components = render_page(page, fragments, self, timings, imports)
+        return tsx, used_components, ()
+
+    def wrapper(self, used_components, imports=(), declarations=()):
+        """
+        Returns the (head, tail) TSX around a page's JSX markup; imports are extra import
+        lines and declarations module-level constants the markup uses.
+        """
+        return page_wrapper(used_components, imports, declarations, hoist=self.hoist_static)
+
+    def configured(self, **options):
+        """A copy of this emitter with the given options (e.g. hoist_static=True) set"""
+        emitter = copy.copy(self)
+        for name, value in options.items():
+            if not hasattr(type(self), name):
+                raise ValueError(f"Unknown emitter option '{name}'")
+            setattr(emitter, name, value)
+        return emitter
+
+    def page_path(self, parts):
+        """Path of a page's file relative to the project root"""
+        return f"{self.pages_folder}/{'/'.join(parts)}/{self.page_file}.tsx"
+
+    def route_module(self, parts):
+        """Module the route table imports a page from, None if the framework routes by folders"""
+        return None
+
+    def asset_import(self, name, module):
+        """Import line binding an image asset to name"""
+        return f"import {name} from '{module}';"
+
+    def asset_expression(self, name):
+        """JSX expression for the URL of an image imported as name"""
+        return name
+
+
+class ViteReactEmitter(PageEmitter):
+    """Vite + React Router: src/views/<route>/index.tsx"""
+
+    name = "react"
+    page_file = "index"
+    pages_folder = "src/views"
+
+    def route_module(self, parts):
+        return "@/views/" + "/".join(parts)
+
+
+class NextAppEmitter(PageEmitter):
+    """Next.js app router: src/app/<route>/page.tsx"""
+
+    name = "next"
+    page_file = "page"
+    pages_folder = "src/app"
+
+    def asset_expression(self, name):
+        # Static image imports are StaticImageData objects, not URLs
+        return f"{name}.src"
+
+
+class NextClientIslandsEmitter(NextAppEmitter):
+    """
+    Next.js app router with pages as server components: interactive subtrees go to
+    'use client' components in an islands.tsx next to page.tsx (see client_islands).
+    """
+
+    module_files = (ISLANDS_FILE,)
+    client_islands = True
+
+    def render(self, page, fragments=None, imports=(), timings=None):
+        static_page, islands = split_islands(page, fragments)
+        if not islands:
+            return super().render(page, fragments, imports, timings)
+        tsx, used_components = render_page(static_page, fragments, self, timings, (*imports, *island_imports(islands)))
+        return tsx, used_components, ((ISLANDS_FILE, render_islands(islands, fragments)),)
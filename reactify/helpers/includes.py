@@ -0,0 +1,240 @@
+import json
+import os
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+
+from reactify.helpers.convert_to_tsx import DEFAULT_PARSER, convert_markup
+from reactify.helpers.output_files import write_if_changed
+
+# @@include('path/to/partial.html', {"param": "value"}) as used by gulp-file-include
+INCLUDE_DIRECTIVE = re.compile(r"@@include\(\s*(['\"])(.+?)\1\s*(?:,\s*(\{.*?\}))?\s*\)", flags=re.DOTALL)
+
+# @@name references to include parameters inside a partial
+PARAM_REFERENCE = re.compile(r"@@(\w+)")
+
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr",
+}
+
+MAX_INCLUDE_DEPTH = 20
+
+# Page → partial graph kept in the project between runs, relative to its root
+INCLUDE_GRAPH_FILE = ".reactify/includes.json"
+
+
+class _BalanceChecker(HTMLParser):
+    """Tells whether every element a partial opens is also closed inside it"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.stack = []
+        self.balanced = True
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in VOID_ELEMENTS:
+            self.stack.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in VOID_ELEMENTS:
+            return
+        if not self.stack or self.stack[-1] != tag:
+            self.balanced = False
+        else:
+            self.stack.pop()
+
+
+def is_balanced(html_content):
+    checker = _BalanceChecker()
+    checker.feed(html_content)
+    checker.close()
+    return checker.balanced and not checker.stack
+
+
+def _parse_params(raw):
+    if not raw:
+        return {}
+    try:
+        params = json.loads(raw)
+    except json.JSONDecodeError:
+        try:
+            params = json.loads(raw.replace("'", '"'))
+        except json.JSONDecodeError:
+            return {}
+    return params if isinstance(params, dict) else {}
+
+
+def _is_inside(path, root):
+    """Tells whether path, once symlinks and .. are resolved, is root or under it"""
+    root = os.path.realpath(root)
+    return os.path.commonpath([os.path.realpath(path), root]) == root
+
+
+class IncludeResolver:
+    """
+    Expands @@include(...) directives in pages.
+
+    Partials are read once per run. A partial that is balanced markup (it closes
+    everything it opens) is converted to JSX once per distinct set of parameters
+    and spliced into every page that includes it; a partial that opens a wrapper
+    another partial closes is inlined as text before the page is parsed.
+
+    The page → partial dependency graph is kept so callers can reconvert just the
+    pages that include a partial when it changes.
+
+    With confine set, a partial outside source_path (an absolute or ../ path, or a
+    symlink leading out) raises PermissionError instead of being read.
+    """
+
+    def __init__(self, source_path, parser=DEFAULT_PARSER, confine=False):
+        self.source_path = Path(source_path)
+        self.parser = parser
+        self.confine = confine
+        self.graph = {}
+        self._sources = {}
+        self._mtimes = {}
+        self._rendered = {}
+        self._converted = {}
+
+    def _locate(self, name, base_dir):
+        for candidate in (base_dir / name, self.source_path / name):
+            if candidate.is_file():
+                if self.confine and not _is_inside(candidate, self.source_path):
+                    raise PermissionError(f"Partial '{name}' is outside {self.source_path}")
+                return Path(os.path.normpath(candidate))
+        return None
+
+    def _read(self, path):
+        if path not in self._sources:
+            self._mtimes[path] = os.stat(path).st_mtime_ns
+            with open(path, "r", encoding="utf-8") as f:
+                self._sources[path] = f.read()
+        return self._sources[path]
+
+    def _render(self, path, params, deps, depth=0):
+        """Returns a partial's text with parameters filled in and nested includes inlined"""
+        key = (path, json.dumps(params, sort_keys=True))
+        if key in self._rendered:
+            text, nested = self._rendered[key]
+            deps.update(nested)
+            return text
+
+        text = PARAM_REFERENCE.sub(
+            lambda m: str(params[m.group(1)]) if m.group(1) in params else m.group(0),
+            self._read(path),
+        )
+        nested = set()
+        if depth < MAX_INCLUDE_DEPTH:
+            text = self._expand_text(text, path.parent, params, nested, depth + 1)
+
+        self._rendered[key] = (text, nested)
+        deps.update(nested)
+        return text
+
+    def _expand_text(self, html_content, base_dir, context, deps, depth):
+        def replace(match):
+            partial = self._locate(match.group(2), base_dir)
+            if partial is None:
+                return match.group(0)
+            deps.add(partial)
+            return self._render(partial, {**context, **_parse_params(match.group(3))}, deps, depth)
+
+        return INCLUDE_DIRECTIVE.sub(replace, html_content)
+
+    def _fragment(self, path, params, deps):
+        """Returns (markup, used_components) for a balanced partial, or None"""
+        key = (path, json.dumps(params, sort_keys=True))
+        if key not in self._converted:
+            nested = set()
+            text = self._render(path, params, nested)
+            self._converted[key] = (convert_markup(text, self.parser), nested) if is_balanced(text) else (None, nested)
+
+        fragment, nested = self._converted[key]
+        deps.update(nested)
+        return fragment
+
+    def expand(self, page, html_content):
+        """
+        Resolves the includes of one page.
+
+        :return: (html_content, fragments) where html_content has balanced partials replaced
+                 by placeholders and fragments maps each placeholder to (markup, used_components),
+                 ready for convert_html().
+        """
+        page = Path(page)
+        deps = set()
+        fragments = {}
+
+        if "@@include" not in html_content:
+            self.graph[page] = deps
+            return html_content, fragments
+
+        def replace(match):
+            partial = self._locate(match.group(2), page.parent)
+            if partial is None:
+                print(f"⚠️ {page.name}: partial '{match.group(2)}' not found")
+                return match.group(0)
+
+            deps.add(partial)
+            params = _parse_params(match.group(3))
+            fragment = self._fragment(partial, params, deps)
+            if fragment is None:
+                return self._render(partial, params, deps)
+
+            placeholder = f"__reactify_include_{len(fragments)}__"
+            fragments[placeholder] = fragment
+            return placeholder
+
+        html_content = INCLUDE_DIRECTIVE.sub(replace, html_content)
+        self.graph[page] = deps
+        return html_content, fragments
+
+    def dependents(self, partials):
+        """Returns the pages that include any of the given partials, directly or through another partial"""
+        partials = set(partials)
+        return {page for page, deps in self.graph.items() if deps & partials}
+
+    def invalidate(self, paths):
+        """Forgets everything read or converted from the given files"""
+        paths = set(paths)
+        if paths & self._sources.keys():
+            for path in paths:
+                self._sources.pop(path, None)
+                self._mtimes.pop(path, None)
+            self._rendered.clear()
+            self._converted.clear()
+
+    def refresh(self):
+        """Forgets partials changed or removed on disk since they were read, returns their paths"""
+        changed = set()
+        for path, mtime in self._mtimes.items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime:
+                    changed.add(path)
+            except OSError:
+                changed.add(path)
+        if changed:
+            self.invalidate(changed)
+        return changed
+
+    def save(self, graph_file):
+        """Writes the page → partial graph as JSON, with paths relative to source_path"""
+        def relative(path):
+            try:
+                return path.relative_to(self.source_path).as_posix()
+            except ValueError:
+                return path.as_posix()
+
+        graph = {relative(page): sorted(relative(dep) for dep in deps) for page, deps in self.graph.items()}
+        graph_file = Path(graph_file)
+        graph_file.parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(graph_file, json.dumps(graph, indent=2, sort_keys=True) + "\n")
+
+    def load(self, graph_file):
+        """Reads a graph written by save(), e.g. to know which pages a partial feeds before anything is converted"""
+        graph_file = Path(graph_file)
+        if not graph_file.exists():
+            return
+        graph = json.loads(graph_file.read_text(encoding="utf-8"))
+        for page, deps in graph.items():
+            self.graph.setdefault(self.source_path / page, {self.source_path / dep for dep in deps})
@@ -0,0 +1,101 @@
+"""
+Inline style="..." attributes as React style objects, and the hoisting of those
+objects to module-level constants so a page doesn't allocate them on every render.
+"""
+import re
+from functools import lru_cache
+
+# Distinct style attributes whose parsed object is kept; themes repeat the same few thousands of times
+STYLE_CACHE_SIZE = 4096
+
+IDENTIFIER = re.compile(r"^[A-Za-z_$][\w$]*$")
+# A style object as written by style_object(): its strings never hold braces
+STYLE_EXPRESSION = re.compile(r"style=\{(\{[^{}]*\})\}")
+
+# Characters escaped in style strings, so the object stays valid JS and never holds
+# braces or angle brackets that would confuse the passes run over the markup
+_JS_ESCAPES = str.maketrans({
+    "\\": "\\\\", "'": "\\'", "\n": "\\n", "\r": "\\r",
+    "{": "\\u007b", "}": "\\u007d", "<": "\\u003c", ">": "\\u003e",
+})
+
+
+def _declarations(css):
+    """Splits a declaration list on the semicolons outside quotes and parentheses"""
+    declarations = []
+    start = depth = 0
+    quote = None
+    for position, char in enumerate(css):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth = max(0, depth - 1)
+        elif char == ";" and depth == 0:
+            declarations.append(css[start:position])
+            start = position + 1
+    declarations.append(css[start:])
+    return declarations
+
+
+def style_property(name):
+    """margin-top -> marginTop, -webkit-transition -> WebkitTransition, -ms-flex -> msFlex; --custom stays as is"""
+    if name.startswith("--"):
+        return name
+    if name.startswith("-ms-"):
+        name = name[1:]
+    parts = name.split("-")
+    if not parts[0]:
+        parts = parts[1:]
+        parts[0] = parts[0].capitalize()
+    return parts[0] + "".join(part.capitalize() for part in parts[1:])
+
+
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def style_object(css):
+    """
+    Returns the JS object literal for an inline style, e.g. "{ marginTop: '4px' }",
+    or None if it declares nothing. Later declarations of a property win, as in CSS.
+    """
+    properties = {}
+    for declaration in _declarations(css):
+        name, colon, value = declaration.partition(":")
+        name, value = name.strip(), value.strip()
+        if not colon or not name or not value:
+            continue
+        properties[style_property(name if name.startswith("--") else name.lower())] = value
+    if not properties:
+        return None
+    entries = ", ".join(
+        f"{key if IDENTIFIER.match(key) else repr(key)}: '{value.translate(_JS_ESCAPES)}'"
+        for key, value in properties.items()
+    )
+    return f"{{ {entries} }}"
+
+
+def style_name(names, style):
+    """The constant a style object is hoisted to, named in order of first use; names maps object -> name"""
+    name = names.get(style)
+    if name is None:
+        name = names[style] = f"style{len(names) + 1}"
+    return name
+
+
+def style_declarations(names):
+    return [f"const {name} = {style};" for style, name in names.items()]
+
+
+def hoist_styles(markup):
+    """
+    Moves every distinct style object in JSX markup to a module-level constant.
+    :return: (markup, declarations): markup using style={styleN}, and the const lines.
+    """
+    if "style={{" not in markup:
+        return markup, []
+    names = {}
+    markup = STYLE_EXPRESSION.sub(lambda match: f"style={{{style_name(names, match.group(1))}}}", markup)
+    return markup, style_declarations(names)
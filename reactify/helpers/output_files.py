@@ -0,0 +1,105 @@
+"""
+Writes to the generated project that leave unchanged files alone and never leave
+a half-written one behind, so a running dev server only rebuilds what changed.
+"""
+import itertools
+import os
+import shutil
+from pathlib import Path
+
+COMPARE_CHUNK = 1024 * 1024
+
+_temp_names = itertools.count()
+
+
+def temp_file(target_file):
+    """A path next to target_file to write to before moving it in place"""
+    target_file = Path(target_file)
+    return target_file.with_name(f".{target_file.name}.{os.getpid()}-{next(_temp_names)}.tmp")
+
+
+def _has_bytes(target_file, data):
+    try:
+        if os.stat(target_file).st_size != len(data):
+            return False
+        with open(target_file, "rb") as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+
+def _same_files(file, other):
+    try:
+        if os.stat(file).st_size != os.stat(other).st_size:
+            return False
+        with open(file, "rb") as a, open(other, "rb") as b:
+            while True:
+                chunk = a.read(COMPARE_CHUNK)
+                if chunk != b.read(COMPARE_CHUNK):
+                    return False
+                if not chunk:
+                    return True
+    except OSError:
+        return False
+
+
+def _move_in_place(temp, target_file):
+    try:
+        os.replace(temp, target_file)
+    except BaseException:
+        Path(temp).unlink(missing_ok=True)
+        raise
+
+
+def write_if_changed(target_file, contents):
+    """
+    Writes text (or bytes, as they are) to target_file unless it already holds exactly
+    that: the sizes are compared first, and the bytes only when they match. A changed
+    file is written to a temporary file and renamed over the old one.
+    :return: True if the file was written.
+    """
+    if isinstance(contents, bytes):
+        data = contents
+    else:
+        if os.linesep != "\n":
+            contents = contents.replace("\n", os.linesep)
+        data = contents.encode("utf-8")
+    if _has_bytes(target_file, data):
+        return False
+
+    temp = temp_file(target_file)
+    try:
+        with open(temp, "wb") as f:
+            f.write(data)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+    _move_in_place(temp, target_file)
+    return True
+
+
+def replace_if_changed(temp, target_file):
+    """
+    Moves a finished temporary file over target_file, or deletes it when
+    target_file already has the same contents.
+    :return: True if target_file was replaced.
+    """
+    if _same_files(temp, target_file):
+        Path(temp).unlink()
+        return False
+    _move_in_place(temp, target_file)
+    return True
+
+
+def copy_if_changed(source_file, target_file):
+    """Copies source_file over target_file, like shutil.copy2, unless their contents already match"""
+    if _same_files(source_file, target_file):
+        return False
+    temp = temp_file(target_file)
+    try:
+        shutil.copy2(source_file, temp)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+    _move_in_place(temp, target_file)
+    return True
@@ -0,0 +1,245 @@
+"""
+A content-addressed store of node_modules files, shared by every project: each
+distinct file is kept once under its content hash, and projects get hardlinks to
+it instead of copies, so many projects stamped from one template share one set of
+packages on disk.
+"""
+import hashlib
+import json
+import os
+import shutil
+import stat
+from pathlib import Path
+
+from reactify.config.base import PACKAGE_STORE_PATH
+from reactify.helpers.copy_assets import _file_digest
+from reactify.helpers.output_files import temp_file, write_if_changed
+
+NODE_MODULES = "node_modules"
+# Files pinning what a project has installed; a template's listing is reused while they don't change
+PACKAGE_FILES = ("package.json", "package-lock.json", "yarn.lock", "pnpm-lock.yaml")
+# Hex digits of the content hashes files are stored under
+DIGEST_LENGTH = 32
+
+
+def _package_manifests(node_modules):
+    """Yields the package.json of every package installed at the top of node_modules, scoped ones included"""
+    try:
+        entries = sorted(os.scandir(node_modules), key=lambda entry: entry.name)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name.startswith("@") and entry.is_dir():
+            yield from _package_manifests(entry.path)
+        elif not entry.name.startswith("."):
+            yield os.path.join(entry.path, "package.json")
+
+
+def template_key(root):
+    """
+    Identifies what is installed in a folder: its path, package files, node_modules
+    mtimes and the mtime and size of every installed package's package.json, so a
+    package updated in place gets a new key even when the lockfile stays the same.
+    """
+    root = Path(root).resolve()
+    digest = hashlib.blake2b(str(root).encode("utf-8"))
+    for name in PACKAGE_FILES:
+        try:
+            digest.update(name.encode("utf-8") + b"\0" + (root / name).read_bytes())
+        except OSError:
+            pass
+    manifests = list(_package_manifests(root / NODE_MODULES))
+    for path in (str(root / NODE_MODULES), str(root / NODE_MODULES / ".package-lock.json"), *manifests):
+        try:
+            info = os.stat(path)
+        except OSError:
+            continue
+        digest.update(f"{path}:{info.st_mtime_ns}:{info.st_size}".encode("utf-8"))
+    return digest.hexdigest()[:DIGEST_LENGTH]
+
+
+def _copy(stored, destination):
+    """Copies a stored file to destination, writable like a file npm installed"""
+    temp = temp_file(destination)
+    try:
+        shutil.copyfile(stored, temp)
+        os.chmod(temp, 0o755 if os.stat(stored).st_mode & 0o111 else 0o644)
+        os.replace(temp, destination)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+
+
+def _prune(listing, target):
+    """Removes the files, symlinks and folders under target that listing doesn't have"""
+    files, links, dirs = listing["files"], listing["links"], set(listing["dirs"])
+    for root, folders, names in os.walk(target, topdown=False):
+        relative_root = Path(root).relative_to(target)
+        for name in names + [name for name in folders if os.path.islink(os.path.join(root, name))]:
+            relative = (relative_root / name).as_posix()
+            if relative not in files and relative not in links:
+                os.unlink(os.path.join(root, name))
+        if relative_root.parts and relative_root.as_posix() not in dirs and not os.listdir(root):
+            os.rmdir(root)
+
+
+def _link(stored, destination):
+    """
+    Hardlinks a stored file at destination, replacing whatever is there.
+    :return: False if it was copied instead (another filesystem, or the file's link limit reached).
+    """
+    try:
+        os.link(stored, destination)
+        return True
+    except FileExistsError:
+        if os.path.samefile(stored, destination):
+            return True
+    except OSError:
+        _copy(stored, destination)
+        return False
+
+    temp = temp_file(destination)
+    try:
+        os.link(stored, temp)
+    except OSError:
+        _copy(stored, destination)
+        return False
+    os.replace(temp, destination)
+    return True
+
+
+class PackageStore:
+    """
+    Files are stored read-only, as every project's hardlink shares them: a package
+    is updated by installing over it, never by editing it in place.
+
+    The counters add up what the store did since it was created: files linked into
+    projects and their bytes, files that had to be copied, and bytes newly stored.
+    """
+
+    def __init__(self, root=PACKAGE_STORE_PATH):
+        self.root = Path(root)
+        self.files_path = self.root / "files"
+        self.trees_path = self.root / "trees"
+        self.linked = 0
+        self.linked_bytes = 0
+        self.copied = 0
+        self.added_bytes = 0
+
+    def _path(self, digest):
+        return self.files_path / digest[:2] / digest[2:]
+
+    def add(self, file, mode):
+        """Puts a file in the store unless its contents are there already, returns its digest"""
+        executable = bool(mode & 0o111)
+        digest = _file_digest(file).hex()[:DIGEST_LENGTH] + ("-x" if executable else "")
+        stored = self._path(digest)
+        if not stored.exists():
+            stored.parent.mkdir(parents=True, exist_ok=True)
+            temp = temp_file(stored)
+            try:
+                shutil.copyfile(file, temp)
+                os.chmod(temp, 0o555 if executable else 0o444)
+                os.replace(temp, stored)
+            except BaseException:
+                temp.unlink(missing_ok=True)
+                raise
+            self.added_bytes += os.stat(stored).st_size
+        return digest
+
+    def tree(self, node_modules, key=None, refresh=False):
+        """
+        Stores every file of a node_modules folder and returns its listing:
+        {"files": {path: [digest, size]}, "links": {path: symlink target}, "dirs": [empty folders]}.
+        With a key, the listing is kept in the store and reused as long as the key is the same
+        and the store still has every file it lists, unless refresh is set.
+        """
+        tree_file = self.trees_path / f"{key}.json" if key else None
+        if tree_file and not refresh:
+            try:
+                listing = json.loads(tree_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                listing = None
+            # Files may be gone from a store cleaned in part since, and are stored again below
+            if listing and all(self._path(digest).exists() for digest, _ in listing["files"].values()):
+                return listing
+
+        node_modules = Path(node_modules)
+        files, links, dirs = {}, {}, []
+        for root, folders, names in os.walk(node_modules):
+            relative_root = Path(root).relative_to(node_modules)
+            for name in [name for name in folders if os.path.islink(os.path.join(root, name))]:
+                links[(relative_root / name).as_posix()] = os.readlink(os.path.join(root, name))
+                folders.remove(name)
+            if not folders and not names:
+                dirs.append(relative_root.as_posix())
+            for name in names:
+                path = os.path.join(root, name)
+                info = os.lstat(path)
+                relative = (relative_root / name).as_posix()
+                if stat.S_ISLNK(info.st_mode):
+                    links[relative] = os.readlink(path)
+                elif stat.S_ISREG(info.st_mode):
+                    files[relative] = [self.add(path, info.st_mode), info.st_size]
+
+        listing = {"files": files, "links": links, "dirs": dirs}
+        if tree_file:
+            self.trees_path.mkdir(parents=True, exist_ok=True)
+            write_if_changed(tree_file, json.dumps(listing) + "\n")
+        return listing
+
+    def link(self, listing, target):
+        """
+        Recreates a listed node_modules at target from hardlinks to the store, returns the bytes linked.
+        Whatever target holds that the listing doesn't (packages the template has since dropped) is removed.
+        """
+        target = Path(target)
+        if target.is_dir():
+            _prune(listing, target)
+        for relative in listing["dirs"]:
+            (target / relative).mkdir(parents=True, exist_ok=True)
+
+        made = set()
+        linked = 0
+        for relative, (digest, size) in listing["files"].items():
+            destination = target / relative
+            if destination.parent not in made:
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                made.add(destination.parent)
+            if _link(self._path(digest), destination):
+                self.linked += 1
+                linked += size
+            else:
+                self.copied += 1
+
+        for relative, link in listing["links"].items():
+            destination = target / relative
+            if os.path.islink(destination):
+                if os.readlink(destination) == link:
+                    continue
+                destination.unlink()
+            elif destination.is_dir():
+                shutil.rmtree(destination)
+            elif destination.exists():
+                destination.unlink()
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            os.symlink(link, destination)
+
+        self.linked_bytes += linked
+        return linked
+
+    def link_node_modules(self, source_root, project_root):
+        """
+        Populates project_root/node_modules with hardlinks to the store, storing the
+        files of source_root/node_modules first. source_root is usually the template;
+        it may be the project itself, whose installed files are then swapped for links.
+        """
+        node_modules = Path(source_root) / NODE_MODULES
+        if not node_modules.is_dir():
+            return 0
+        in_place = Path(source_root).resolve() == Path(project_root).resolve()
+        listing = self.tree(node_modules, key=None if in_place else template_key(source_root))
+        linked = self.link(listing, Path(project_root) / NODE_MODULES)
+        print(f"🔗 {len(listing['files'])} node_modules files linked from the package store "
+              f"({linked / (1024 * 1024):.1f} MB not copied)")
+        return linked
@@ -0,0 +1,143 @@
+from bs4 import Tag
+
+# Minimal entity substitution, as BeautifulSoup's default "minimal" formatter does it
+_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+
+def escape(text):
+    return text.translate(_ESCAPES)
+
+
+class Expression:
+    """An attribute value written as a JSX expression, key={code}, e.g. a style object"""
+
+    __slots__ = ("code",)
+
+    def __init__(self, code):
+        self.code = code
+
+    def __eq__(self, other):
+        return isinstance(other, Expression) and other.code == self.code
+
+    def __hash__(self):
+        return hash(self.code)
+
+    def __repr__(self):
+        return f"Expression({self.code!r})"
+
+    def __getstate__(self):
+        return self.code
+
+    def __setstate__(self, state):
+        self.code = state
+
+
+def render_attributes(attrs):
+    """
+    Serialises (key, value) pairs the way BeautifulSoup's minimal formatter does;
+    None values render bare and Expressions as key={code}.
+    """
+    rendered = []
+    for key, value in attrs:
+        if value is None:
+            rendered.append(key)
+            continue
+        if isinstance(value, Expression):
+            rendered.append(f"{key}={{{value.code}}}")
+            continue
+        if isinstance(value, list):
+            value = " ".join(value)
+        value = escape(str(value))
+        quote = '"'
+        if '"' in value:
+            if "'" in value:
+                value = value.replace('"', "&quot;")
+            else:
+                quote = "'"
+        rendered.append(f"{key}={quote}{value}{quote}")
+    return "".join(" " + attr for attr in rendered)
+
+
+class Element:
+    """
+    A converted element. attrs is a tuple of (key, value) pairs sorted by key;
+    children holds Elements and already serialised text (str).
+    """
+
+    __slots__ = ("name", "attrs", "children", "void")
+
+    def __init__(self, name, attrs=(), children=None, void=False):
+        self.name = name
+        self.attrs = attrs
+        self.children = [] if children is None else children
+        self.void = void
+
+    def __repr__(self):
+        return f"Element({self.name!r}, {self.attrs!r}, {len(self.children)} children)"
+
+
+class PageIR:
+    """
+    A page after parsing and rule application, ready for any emitter.
+    Plain __slots__ objects, so it pickles compactly for workers and the cache.
+    """
+
+    __slots__ = ("nodes", "used_components")
+
+    def __init__(self, nodes, used_components):
+        self.nodes = nodes
+        self.used_components = used_components
+
+    def __getstate__(self):
+        return self.nodes, self.used_components
+
+    def __setstate__(self, state):
+        self.nodes, self.used_components = state
+
+
+def _attribute_value(value):
+    if value is None or isinstance(value, Expression):
+        return value
+    if isinstance(value, list):
+        return " ".join(value)
+    return str(value)
+
+
+def _attribute_pairs(attrs):
+    return tuple((key, _attribute_value(value)) for key, value in sorted(attrs.items()))
+
+
+def from_soup(content):
+    """Builds the IR of a BeautifulSoup element's contents, after the rules were applied to it"""
+    nodes = []
+    stack = [(iter(content.contents), nodes)]
+    while stack:
+        children, out = stack[-1]
+        node = next(children, None)
+        if node is None:
+            stack.pop()
+        elif isinstance(node, Tag):
+            element = Element(node.name, _attribute_pairs(node.attrs), [], node.is_empty_element)
+            out.append(element)
+            stack.append((iter(node.contents), element.children))
+        else:
+            # Strings are stored serialised: escaped text, raw script/style, or doctype/CDATA markup
+            out.append(node.output_ready("minimal"))
+    return nodes
+
+
+def render(nodes):
+    """Serialises IR nodes to markup"""
+    parts = []
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            parts.append(node)
+        elif node.void:
+            parts.append(f"<{node.name}{render_attributes(node.attrs)}/>")
+        else:
+            parts.append(f"<{node.name}{render_attributes(node.attrs)}>")
+            stack.append(f"</{node.name}>")
+            stack.extend(reversed(node.children))
+    return "".join(parts)
@@ -0,0 +1,78 @@
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from reactify.config.base import PIPELINE_WRITE_THREADS
+from reactify.helpers.output_files import write_if_changed
+from reactify.helpers.profiler import record
+
+
+def _write_file(target_file, contents):
+    start = time.perf_counter()
+    changed = write_if_changed(target_file, contents)
+    return time.perf_counter() - start, changed
+
+
+class PageWriter:
+    """
+    Writes files on a thread pool while the caller goes on converting. Files
+    that already hold the same contents are left alone (see write_if_changed);
+    changed and unchanged count the files written and the files left alone.
+
+    Each folder is created once, here, before its files are queued, so the
+    threads only write. Writes to the same file happen in the order they were
+    queued, so the last one wins as if they were written one by one. At most
+    `pending` writes are queued; write() waits for the oldest beyond that, and
+    raises its error if it failed.
+    Use it as a context manager, or call close() to wait for every write.
+    """
+
+    def __init__(self, threads=PIPELINE_WRITE_THREADS, pending=None):
+        self._pool = ThreadPoolExecutor(max_workers=threads)
+        self._pending = deque()
+        self._limit = pending or threads * 16
+        self._folders = set()
+        self._latest = {}  # target file -> its last queued write
+        self.changed = 0
+        self.unchanged = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        self.close(wait=exc_type is None)
+
+    def write(self, target_file, contents, page=None):
+        """Queues contents to be written to target_file; page is what the write time is recorded under"""
+        folder = target_file.parent
+        if folder not in self._folders:
+            folder.mkdir(parents=True, exist_ok=True)
+            self._folders.update(folder.parents)
+            self._folders.add(folder)
+
+        previous = self._latest.get(target_file)
+        if previous is not None and not previous.done():
+            previous.result()
+        future = self._latest[target_file] = self._pool.submit(_write_file, target_file, contents)
+        self._pending.append((page, future))
+        while len(self._pending) > self._limit:
+            self._collect()
+
+    def _collect(self):
+        page, future = self._pending.popleft()
+        seconds, changed = future.result()
+        record("pages.write", seconds, page)
+        if changed:
+            self.changed += 1
+        else:
+            self.unchanged += 1
+
+    def close(self, wait=True):
+        """Waits for the queued writes, raising the first error; with wait False, drops those not started"""
+        try:
+            while wait and self._pending:
+                self._collect()
+        finally:
+            self._pool.shutdown(wait=True, cancel_futures=not wait)
+            self._pending.clear()
+            self._latest.clear()
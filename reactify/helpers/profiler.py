@@ -0,0 +1,113 @@
+import heapq
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Callables notified of every timing, see add_timing_hook()
+_hooks = []
+
+# Profiler collecting timings for this run, see set_profiler()
+_profiler = None
+
+
+def add_timing_hook(hook):
+    """
+    Registers a callable that receives every timing as hook(stage, seconds, page),
+    e.g. to forward them to a metrics system. page is None for project-wide stages.
+    """
+    _hooks.append(hook)
+
+
+def remove_timing_hook(hook):
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def set_profiler(profiler):
+    """Makes profiler collect the timings of this process; None turns profiling off"""
+    global _profiler
+    _profiler = profiler
+
+
+def is_timing():
+    """True when anyone is listening, so callers can skip the clock calls otherwise"""
+    return _profiler is not None or bool(_hooks)
+
+
+def record(stage, seconds, page=None):
+    if _profiler is not None:
+        _profiler.record(stage, seconds, page)
+    for hook in _hooks:
+        hook(stage, seconds, page)
+
+
+@contextmanager
+def timed(stage, page=None):
+    """Times the block and records it under stage"""
+    if not is_timing():
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start, page)
+
+
+class Profiler:
+    """
+    Collects per-stage totals and per-page timings for one run.
+
+    Page timings are recorded per phase (read, includes, parse, rules, serialize,
+    write); a page's total is the sum of its phases. Phases measured in worker
+    processes add up CPU time across workers, so they can exceed wall time.
+    """
+
+    def __init__(self, slowest=10):
+        self.slowest = slowest
+        self.stages = {}
+        self.pages = {}
+        self.started = time.perf_counter()
+
+    def record(self, stage, seconds, page=None):
+        calls, total = self.stages.get(stage, (0, 0.0))
+        self.stages[stage] = (calls + 1, total + seconds)
+        if page is not None:
+            phases = self.pages.setdefault(str(page), {})
+            phase = stage.rsplit(".", 1)[-1]
+            phases[phase] = phases.get(phase, 0.0) + seconds
+
+    def report(self):
+        slowest = heapq.nlargest(self.slowest, self.pages.items(), key=lambda item: sum(item[1].values()))
+        return {
+            "wall_seconds": round(time.perf_counter() - self.started, 6),
+            "stages": {
+                stage: {"calls": calls, "seconds": round(total, 6)}
+                for stage, (calls, total) in sorted(self.stages.items())
+            },
+            "pages": len(self.pages),
+            "slowest_pages": [
+                {
+                    "page": page,
+                    "seconds": round(sum(phases.values()), 6),
+                    "phases": {phase: round(seconds, 6) for phase, seconds in phases.items()},
+                }
+                for page, phases in slowest
+            ],
+        }
+
+    def save(self, report_file):
+        report = self.report()
+        report_file = Path(report_file)
+        report_file.parent.mkdir(parents=True, exist_ok=True)
+        report_file.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        return report
+
+    def print_summary(self, report=None):
+        report = report or self.report()
+        print(f"\n⏱️ Profile ({report['wall_seconds']:.2f}s wall):")
+        for stage, stats in report["stages"].items():
+            print(f"  {stage:<20} {stats['seconds'] * 1000:>10.1f} ms  ({stats['calls']} calls)")
+        for entry in report["slowest_pages"][:3]:
+            print(f"  🐢 {entry['page']}: {entry['seconds'] * 1000:.1f} ms")
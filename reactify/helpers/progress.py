@@ -0,0 +1,80 @@
+import sys
+import time
+
+# Seconds between progress updates on a terminal, and in logs (CI) where lines can't be redrawn
+TERMINAL_INTERVAL = 0.1
+LOG_INTERVAL = 5.0
+# Per-page lines kept before they are written out in one go
+VERBOSE_BUFFER = 256
+
+
+class Progress:
+    """
+    Reports pages done without a print per page, which slows big runs down on
+    CI terminals. On a terminal one line is redrawn a few times a second; in a
+    log a line is printed every few seconds. With verbose, the per-page lines
+    are printed as before, but written out in blocks.
+    Errors are printed right away. close() prints the final count.
+    """
+
+    def __init__(self, total, label="📁 TSX", verbose=False, stream=None):
+        self.total = total
+        self.label = label
+        self.verbose = verbose
+        self.stream = stream or sys.stdout
+        self.done = 0
+        self._lines = []
+        self._terminal = not verbose and self.stream.isatty()
+        self._interval = TERMINAL_INTERVAL if self._terminal else LOG_INTERVAL
+        self._last = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def page(self, line=None):
+        """Counts a page as done; line is its verbose description"""
+        self.done += 1
+        if self.verbose:
+            if line:
+                self._lines.append(line)
+            if len(self._lines) >= VERBOSE_BUFFER:
+                self._flush()
+            return
+
+        now = time.monotonic()
+        if now - self._last >= self._interval:
+            self._last = now
+            self._show()
+
+    def error(self, message):
+        self._flush()
+        if self._terminal:
+            self.stream.write("\r\033[K")
+        self.stream.write(message + "\n")
+        self.stream.flush()
+
+    def _show(self):
+        status = f"{self.label}: {self.done}/{self.total} pages"
+        if self._terminal:
+            self.stream.write(f"\r\033[K{status}")
+        else:
+            self.stream.write(status + "\n")
+        self.stream.flush()
+
+    def _flush(self):
+        if self._lines:
+            self.stream.write("\n".join(self._lines) + "\n")
+            self._lines.clear()
+            self.stream.flush()
+
+    def close(self):
+        if self.verbose:
+            self._flush()
+            return
+        self._show()
+        if self._terminal:
+            self.stream.write("\n")
+            self.stream.flush()
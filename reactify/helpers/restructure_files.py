@@ -13,6 +13,18 @@ def apply_casing(name, case_type):
     return name
 
 
+def route_parts(base_name, casing="snake"):
+    """
+    Route folders of a page from its file name (without extension):
+    "auth-sign_in" → ["auth", "sign-in"] with snake casing.
+    """
+    if '-' in base_name:
+        folder_name_parts = [part.replace("_", "-") for part in base_name.split('-')]
+    else:
+        folder_name_parts = [base_name.replace("_", "-")]
+    return [apply_casing(part, casing) for part in folder_name_parts]
+
+
 def process_file_name(file_name):
     """
     Dummy processor — customize based on your pattern.
@@ -0,0 +1,279 @@
+import json
+import re
+import shutil
+from collections import namedtuple
+from pathlib import Path
+
+from reactify.config.base import ROUTE_CHUNK_SIZE, ROUTE_CHUNK_STRATEGIES, ROUTE_PREFETCH_SIBLINGS
+from reactify.helpers.output_files import write_if_changed
+
+# chunks: "page" (one lazy chunk per page), "folder" (one per top-level folder) or
+# "balanced" (pages in path order, grouped up to chunk_size bytes of TSX).
+# nested writes a route tree instead of a flat list, prefetch adds sibling
+# prefetch hints and manifest writes manifest.json next to the routes.
+RouteOptions = namedtuple("RouteOptions", ["chunks", "nested", "prefetch", "manifest", "chunk_size"],
+                          defaults=("page", False, False, False, ROUTE_CHUNK_SIZE))
+
+
+def to_valid_identifier(parts):
+    """
+    Converts a list like ['auth', 'sign-in'] to 'AuthSignIn'.
+    Handles dashes, underscores, and numbers.
+    """
+    all_parts = []
+    for part in parts:
+        sub_parts = re.split(r"[^a-zA-Z0-9]", part)  # split on -, _, etc.
+        all_parts.extend([p.capitalize() for p in sub_parts if p])
+
+    identifier = "".join(all_parts)
+    return f"Page{identifier}" if identifier and identifier[0].isdigit() else identifier
+
+
+def unique_aliases(names):
+    """
+    Makes names unique by numbering repeats: X, X1, X2...
+    The next number to try is kept per name, so this stays linear however many repeat.
+    """
+    taken = set()
+    next_number = {}
+    aliases = []
+    for name in names:
+        alias = name
+        if alias in taken:
+            count = next_number.get(name, 1)
+            alias = f"{name}{count}"
+            while alias in taken:
+                count += 1
+                alias = f"{name}{count}"
+            next_number[name] = count + 1
+        taken.add(alias)
+        aliases.append(alias)
+    return aliases
+
+
+class Route:
+    """One page route: its folder parts, the module it imports and the chunk it loads from"""
+
+    __slots__ = ("parts", "module", "size", "alias", "chunk", "loader", "prefetch")
+
+    def __init__(self, parts, module, size=0):
+        self.parts = list(parts)
+        self.module = module
+        self.size = size
+        self.alias = None
+        self.chunk = None
+        self.loader = None
+        self.prefetch = []
+
+    @property
+    def path(self):
+        return "/" + "/".join(self.parts)
+
+
+def assign_chunks(routes, strategy="page", chunk_size=ROUTE_CHUNK_SIZE):
+    """
+    Sets each route's chunk name: None for one chunk per page, the top-level
+    folder, or a numbered group of pages adding up to about chunk_size bytes.
+
+    :return: Chunk names mapped to their routes, in order of first use.
+    """
+    if strategy not in ROUTE_CHUNK_STRATEGIES:
+        raise ValueError(f"Unknown route chunk strategy '{strategy}', expected one of: "
+                         f"{', '.join(ROUTE_CHUNK_STRATEGIES)}")
+
+    chunks = {}
+    if strategy == "folder":
+        for route in routes:
+            route.chunk = route.parts[0]
+            chunks.setdefault(route.chunk, []).append(route)
+    elif strategy == "balanced":
+        # Neighbouring paths are usually visited together, so groups follow path order
+        group, total = 1, 0
+        for route in sorted(routes, key=lambda route: route.parts):
+            if total and total + route.size > chunk_size:
+                group, total = group + 1, 0
+            total += route.size
+            route.chunk = f"group-{group}"
+            chunks.setdefault(route.chunk, []).append(route)
+    else:
+        for route in routes:
+            route.chunk = None
+    return chunks
+
+
+def assign_prefetch(routes, siblings=ROUTE_PREFETCH_SIBLINGS):
+    """
+    Sets each route's prefetch hints: the nearest routes on either side in its
+    folder, whose chunks it doesn't share. Bounded per route, so linear overall.
+    """
+    folders = {}
+    for route in routes:
+        folders.setdefault(tuple(route.parts[:-1]), []).append(route)
+
+    for members in folders.values():
+        members.sort(key=lambda route: route.parts)
+        for index, route in enumerate(members):
+            near = members[max(0, index - siblings):index] + members[index + 1:index + 1 + siblings]
+            route.prefetch = [other for other in near if other.loader != route.loader]
+
+
+def _lazy_import(route, options):
+    if route.chunk is not None:
+        return f"const {route.alias} = lazy(() => {route.loader}().then((m) => ({{ default: m.{route.alias} }})))"
+    if options.prefetch:
+        return f"const {route.alias} = lazy({route.loader})"
+    return f"const {route.alias} = lazy(() => import('{route.module}'))"
+
+
+def _route_entry(route, path, indent):
+    return f"{indent}{{ path: '{path}', element: <{route.alias} /> }}"
+
+
+def _route_tree(routes):
+    """Nests routes by folder parts: {part: [routes at this node, children]}"""
+    tree = {}
+    for route in routes:
+        node = [None, tree]
+        for part in route.parts:
+            node = node[1].setdefault(part, [[], {}])
+        node[0].append(route)
+    return tree
+
+
+def _nested_entries(tree, indent="  ", root=True):
+    entries = []
+    for part, (pages, children) in tree.items():
+        path = f"/{part}" if root else part
+        if not children:
+            entries.extend(_route_entry(route, path, indent) for route in pages)
+            continue
+
+        inner = indent + "    "
+        child_entries = [f"{inner}{{ index: true, element: <{route.alias} /> }}" for route in pages]
+        child_entries += _nested_entries(children, inner, root=False)
+        entries.append(
+            f"{indent}{{\n{indent}  path: '{path}',\n{indent}  children: [\n"
+            + ",\n".join(child_entries) + f",\n{indent}  ],\n{indent}}}"
+        )
+    return entries
+
+
+def render_routes(routes, chunks, options):
+    """Returns the routes/index.tsx source"""
+    source = "import { lazy } from 'react'\nimport { RouteObject } from 'react-router-dom'\n\n"
+    if chunks:
+        loaders = [f"const {members[0].loader} = () => import('./chunks/{name}')" for name, members in chunks.items()]
+        source += "\n".join(loaders) + "\n\n"
+    elif options.prefetch:
+        source += "\n".join(f"const {route.loader} = () => import('{route.module}')" for route in routes) + "\n\n"
+    source += "\n".join(_lazy_import(route, options) for route in routes) + "\n\n"
+
+    if options.nested:
+        entries = _nested_entries(_route_tree(routes))
+    else:
+        entries = [_route_entry(route, route.path, "  ") for route in routes]
+    source += "const allRoutes: RouteObject[] = [\n" + ",\n".join(entries) + "\n]\n\nexport default allRoutes;\n"
+
+    if options.prefetch:
+        hints = [
+            f"  '{route.path}': [{', '.join(dict.fromkeys(other.loader for other in route.prefetch))}],"
+            for route in routes if route.prefetch
+        ]
+        source += (
+            "\n// Chunks of neighbouring routes, to load ahead of navigation\n"
+            "export const prefetchHints: Record<string, (() => Promise<unknown>)[]> = {\n"
+            + "".join(hint + "\n" for hint in hints) + "}\n\n"
+            "export function prefetchSiblings(path: string) {\n"
+            "  prefetchHints[path]?.forEach((load) => load())\n"
+            "}\n"
+        )
+    return source
+
+
+def render_chunk(routes):
+    """Returns a chunk module re-exporting the pages of one chunk"""
+    return "".join(f"export {{ default as {route.alias} }} from '{route.module}'\n" for route in routes)
+
+
+def route_manifest(routes, chunks, options):
+    return {
+        "chunks": options.chunks,
+        "routes": [
+            {
+                "path": route.path,
+                "component": route.alias,
+                "module": route.module,
+                "chunk": route.chunk,
+                "prefetch": [other.path for other in route.prefetch],
+            }
+            for route in routes
+        ],
+        "groups": {name: [route.path for route in members] for name, members in chunks.items()},
+    }
+
+
+def route_files(route_map, options=None):
+    """
+    Builds the route config in memory.
+
+    :param route_map: List of (folder_parts, import_path, size) per page, size in bytes of TSX.
+    :return: Dict of file name (relative to the routes folder) -> contents: index.tsx,
+             chunks/<name>.ts per chunk and manifest.json if enabled.
+    """
+    options = options or RouteOptions()
+    routes = [Route(parts, module, size) for parts, module, size in route_map]
+    for route, alias in zip(routes, unique_aliases(to_valid_identifier(route.parts) for route in routes)):
+        route.alias = alias
+
+    chunks = assign_chunks(routes, options.chunks, options.chunk_size)
+    if chunks:
+        loaders = unique_aliases(f"load{to_valid_identifier([name]) or 'Chunk'}" for name in chunks)
+        for members, loader in zip(chunks.values(), loaders):
+            for route in members:
+                route.loader = loader
+    else:
+        for route in routes:
+            route.loader = f"load{route.alias}"
+    if options.prefetch:
+        assign_prefetch(routes)
+
+    files = {"index.tsx": render_routes(routes, chunks, options)}
+    for name, members in chunks.items():
+        files[f"chunks/{name}.ts"] = render_chunk(members)
+    if options.manifest:
+        # Compact, so the C encoder writes it: the manifest can list many thousands of routes
+        files["manifest.json"] = json.dumps(route_manifest(routes, chunks, options))
+    return files
+
+
+def write_routes(routes_path, route_map, options=None):
+    """
+    Writes the route config (index.tsx), its chunk modules and the optional manifest,
+    removing chunks and a manifest left by an earlier run. Files that didn't change
+    are left alone.
+
+    :param routes_path: Folder the routes go to, e.g. src/routes.
+    :param route_map: List of (folder_parts, import_path, size) per page, size in bytes of TSX.
+    :return: (path of index.tsx, number of files written or removed).
+    """
+    files = route_files(route_map, options)
+
+    routes_path = Path(routes_path)
+    routes_path.mkdir(parents=True, exist_ok=True)
+    changed = 0
+    stale = [path for path in (routes_path / "chunks").glob("*.ts")
+             if path.relative_to(routes_path).as_posix() not in files]
+    manifest_path = routes_path / "manifest.json"
+    if "manifest.json" not in files and manifest_path.exists():
+        stale.append(manifest_path)
+    for path in stale:
+        path.unlink()
+        changed += 1
+    if not any(name.startswith("chunks/") for name in files):
+        shutil.rmtree(routes_path / "chunks", ignore_errors=True)
+
+    for name, contents in files.items():
+        target = routes_path / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        changed += write_if_changed(target, contents)
+    return routes_path / "index.tsx", changed
@@ -0,0 +1,93 @@
+import re
+from collections import namedtuple
+
+# Everything convert_to_tsx needs to know about one class name
+ClassInfo = namedtuple("ClassInfo", ["component", "props", "variant_component", "variant", "strip_components"])
+
+
+class RuleIndex:
+    """
+    REACT_BOOTSTRAP_RULES compiled for lookups by class name.
+
+    Rules are matched in one of three ways:
+      - "class": exact class name, looked up in a dict
+      - "pattern": regex, all folded into one combined matcher so most classes are rejected in a single search
+      - "match": any callable, checked in order (kept for hand-written rules)
+
+    Results are memoized per class, so each distinct class in a theme is resolved once.
+    """
+
+    def __init__(self, rules, variant_mapping, variants):
+        self.rules = list(rules.values())
+        self.variants = set(variants)
+        self.variant_mapping = list(variant_mapping.items())
+
+        self.exact = {}
+        self.patterns = []
+        self.callables = []
+        for order, rule in enumerate(self.rules):
+            if "class" in rule:
+                self.exact.setdefault(rule["class"], []).append(order)
+            elif "pattern" in rule:
+                self.patterns.append((order, re.compile(rule["pattern"])))
+            else:
+                self.callables.append((order, rule["match"]))
+
+        self.combined_pattern = re.compile(
+            "|".join(f"(?:{pattern.pattern})" for _, pattern in self.patterns)
+        ) if self.patterns else None
+
+        prefixes = sorted({prefix for prefix, _ in self.variant_mapping}, key=len, reverse=True)
+        self.variant_pattern = re.compile(
+            "|".join(re.escape(prefix) for prefix in prefixes)
+        ) if prefixes else None
+
+        self._classes = {}
+        self._strip = {}
+
+    def _matching_rules(self, cls):
+        """Returns the positions of every rule that matches cls, in rule order"""
+        matches = list(self.exact.get(cls, ()))
+        if self.combined_pattern and self.combined_pattern.match(cls):
+            matches.extend(order for order, pattern in self.patterns if pattern.match(cls))
+        matches.extend(order for order, match in self.callables if match(cls))
+        return sorted(matches)
+
+    def _variant(self, cls):
+        if not self.variant_pattern or not self.variant_pattern.match(cls):
+            return None, None
+        for prefix, component in self.variant_mapping:
+            if cls.startswith(prefix):
+                variant = cls[len(prefix):]
+                if variant in self.variants:
+                    return component, variant
+        return None, None
+
+    def lookup(self, cls):
+        info = self._classes.get(cls)
+        if info is None:
+            matches = self._matching_rules(cls)
+            first = self.rules[matches[0]] if matches else None
+            variant_component, variant = self._variant(cls)
+            info = ClassInfo(
+                component=first["component"] if first else None,
+                props=first["props"](cls) if first else {},
+                variant_component=variant_component,
+                variant=variant,
+                strip_components=frozenset(self.rules[order]["component"].split(".")[0].lower() for order in matches),
+            )
+            self._classes[cls] = info
+        return info
+
+    def should_strip(self, cls, component_type):
+        key = (cls, component_type)
+        strip = self._strip.get(key)
+        if strip is None:
+            info = self.lookup(cls)
+            component_type = component_type.lower()
+            strip = bool(
+                (info.variant_component and info.variant_component.lower() == component_type)
+                or component_type in info.strip_components
+            )
+            self._strip[key] = strip
+        return strip
@@ -0,0 +1,35 @@
+# Optional rule packs, enabled with register_rule_pack() or `--rules forms,nav,modal`.
+# Same format as REACT_BOOTSTRAP_RULES; they are appended after the built-in rules.
+
+RULE_PACKS = {
+    "forms": {
+        "form-select": {"component": "FormSelect", "class": "form-select", "props": lambda c: {}},
+        "form-check": {"component": "FormCheck", "class": "form-check", "props": lambda c: {}},
+        "form-text": {"component": "FormText", "class": "form-text", "props": lambda c: {}},
+        "form-floating": {"component": "FloatingLabel", "class": "form-floating", "props": lambda c: {}},
+        "input-group": {"component": "InputGroup", "class": "input-group", "props": lambda c: {}},
+        "input-group-text": {"component": "InputGroupText", "class": "input-group-text", "props": lambda c: {}},
+    },
+    "nav": {
+        "nav": {"component": "Nav", "class": "nav", "props": lambda c: {}},
+        "nav-item": {"component": "NavItem", "class": "nav-item", "props": lambda c: {}},
+        "nav-link": {"component": "NavLink", "class": "nav-link", "props": lambda c: {}},
+        "navbar": {"component": "Navbar", "class": "navbar", "props": lambda c: {}},
+        "navbar-brand": {"component": "NavbarBrand", "class": "navbar-brand", "props": lambda c: {}},
+        "navbar-toggler": {"component": "NavbarToggle", "class": "navbar-toggler", "props": lambda c: {}},
+        "navbar-collapse": {"component": "NavbarCollapse", "class": "navbar-collapse", "props": lambda c: {}},
+        "navbar-expand": {
+            "component": "Navbar",
+            "pattern": r"^navbar-expand-(sm|md|lg|xl|xxl)$",
+            "props": lambda c: {"expand": c.rsplit("-", 1)[1]},
+        },
+    },
+    "modal": {
+        "modal": {"component": "Modal", "class": "modal", "props": lambda c: {}},
+        "modal-dialog": {"component": "ModalDialog", "class": "modal-dialog", "props": lambda c: {}},
+        "modal-header": {"component": "ModalHeader", "class": "modal-header", "props": lambda c: {}},
+        "modal-title": {"component": "ModalTitle", "class": "modal-title", "props": lambda c: {}},
+        "modal-body": {"component": "ModalBody", "class": "modal-body", "props": lambda c: {}},
+        "modal-footer": {"component": "ModalFooter", "class": "modal-footer", "props": lambda c: {}},
+    },
+}
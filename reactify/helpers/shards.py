@@ -0,0 +1,171 @@
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+from reactify.helpers.output_files import copy_if_changed
+
+# Where each shard records what it converted, inside its project
+SHARDS_FOLDER = ".reactify/shards"
+
+
+def parse_shard(value):
+    """Parses "i/N" (1 <= i <= N) into (i, N)"""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{value}', expected i/N, e.g. 1/4") from None
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{value}', i must be between 1 and N")
+    return index, count
+
+
+def shard_of(relative_path, count):
+    """The shard (1-based) a page belongs to, from a hash of its path relative to the source folder"""
+    digest = hashlib.sha1(relative_path.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def manifest_digest(relative_paths):
+    """Identifies the work manifest, so shards that walked different sources can't be merged"""
+    h = hashlib.sha1()
+    for path in relative_paths:
+        h.update(path.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def fragment_file(project_root, shard):
+    index, count = shard
+    return Path(project_root) / SHARDS_FOLDER / f"{index}-of-{count}.json"
+
+
+def write_fragment(converter, shard, pages, own_pages, failed):
+    """
+    Records a shard's pages, in work manifest order, for `reactify merge`.
+
+    :param pages: The whole work manifest, from _collect_pages().
+    :param own_pages: The pages this shard converted.
+    """
+    source_path = converter.source_path
+    relative = [file.relative_to(source_path).as_posix() for file, _, _ in pages]
+    own = {file for file, _, _ in own_pages}
+    entries = []
+    for index, (file, parts, target_file) in enumerate(pages):
+        if file not in own:
+            continue
+        entries.append({
+            "index": index,
+            "source": relative[index],
+            "parts": parts,
+            "target": target_file.relative_to(converter.project_root).as_posix(),
+            "failed": file in failed,
+        })
+
+    fragment = {
+        "shard": shard[0],
+        "count": shard[1],
+        "framework": converter.emitter.name,
+        "manifest": manifest_digest(relative),
+        "total": len(pages),
+        "pages": entries,
+    }
+    target = fragment_file(converter.project_root, shard)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target, "w", encoding="utf-8") as f:
+        json.dump(fragment, f, indent=2)
+    return target
+
+
+def read_fragments(shard_roots, framework):
+    """
+    Reads the fragments of every shard from the given project folders and checks
+    they make up one complete run.
+
+    :return: The page entries of all shards, in work manifest order, each with
+             the project folder it was written to under "root".
+    """
+    fragments = {}
+    for root in shard_roots:
+        for file in sorted((Path(root) / SHARDS_FOLDER).glob("*-of-*.json")):
+            with open(file, "r", encoding="utf-8") as f:
+                fragment = json.load(f)
+            if fragment.get("framework") != framework:
+                continue
+            key = (fragment["shard"], fragment["count"])
+            if key in fragments and fragments[key][0] != Path(root):
+                raise ValueError(f"Shard {key[0]}/{key[1]} found in both {fragments[key][0]} and {root}")
+            fragments[key] = (Path(root), fragment)
+
+    if not fragments:
+        raise ValueError(f"No {framework} shard fragments found under {', '.join(map(str, shard_roots))}")
+
+    counts = {count for _, count in fragments}
+    manifests = {fragment["manifest"] for _, fragment in fragments.values()}
+    if len(counts) > 1 or len(manifests) > 1:
+        raise ValueError("Shard fragments come from different runs (shard count or source pages differ)")
+    count = counts.pop()
+    missing = [str(index) for index in range(1, count + 1) if (index, count) not in fragments]
+    if missing:
+        raise ValueError(f"Missing shards {', '.join(missing)} of {count}")
+
+    entries = []
+    for root, fragment in fragments.values():
+        entries.extend(dict(entry, root=root) for entry in fragment["pages"])
+    entries.sort(key=lambda entry: entry["index"])
+
+    total = next(iter(fragments.values()))[1]["total"]
+    if [entry["index"] for entry in entries] != list(range(total)):
+        raise ValueError(f"Shards cover {len(entries)} of {total} pages")
+    return entries
+
+
+def merge_include_graphs(converter, shard_roots):
+    """Writes the union of the shards' page → partial graphs, each holding only its own pages, into the project"""
+    from reactify.helpers.includes import INCLUDE_GRAPH_FILE, IncludeResolver
+
+    includes = IncludeResolver(converter.source_path)
+    for root in shard_roots:
+        includes.load(Path(root) / INCLUDE_GRAPH_FILE)
+    includes.save(Path(converter.project_root) / INCLUDE_GRAPH_FILE)
+
+
+def merge_shards(converter, shard_roots):
+    """
+    Copies the pages of every shard into converter's project and writes its routes
+    and include graph from all of them, as a single run would.
+
+    :param converter: Converter of the merged project, created with create=False; the
+                      project is copied from the first shard if it doesn't exist yet.
+    :param shard_roots: Project folders the shards wrote to (may include the merged project).
+    :return: (pages merged, pages that failed in their shard).
+    """
+    entries = read_fragments(shard_roots, converter.emitter.name)
+    project_root = Path(converter.project_root)
+
+    # The scaffold and assets are the same in every shard: start from the first one's
+    if not project_root.exists():
+        records = (Path(shard_roots[0]) / SHARDS_FOLDER).resolve()
+        shutil.copytree(shard_roots[0], project_root, symlinks=True,
+                        ignore=lambda folder, names: [name for name in names
+                                                      if (Path(folder) / name).resolve() == records])
+
+    pages = []
+    failed = set()
+    for entry in entries:
+        source = converter.source_path / entry["source"]
+        target_file = project_root / entry["target"]
+        pages.append((source, entry["parts"], target_file))
+        if entry["failed"]:
+            failed.add(source)
+            continue
+
+        shard_file = entry["root"] / entry["target"]
+        if shard_file.resolve() != target_file.resolve():
+            target_file.parent.mkdir(parents=True, exist_ok=True)
+            copy_if_changed(shard_file, target_file)
+
+    converter.failed_pages = failed
+    converter._update_routes(pages, failed)
+    merge_include_graphs(converter, shard_roots)
+    return len(pages) - len(failed), len(failed)
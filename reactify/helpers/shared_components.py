@@ -0,0 +1,283 @@
+import hashlib
+import os
+import re
+from pathlib import Path
+
+from reactify.config.base import SHARED_COMPONENT_MIN_NODES, SHARED_COMPONENT_MIN_PAGES
+from reactify.helpers.client_islands import has_interactive, is_interactive_markup
+from reactify.helpers.convert_to_tsx import import_lines, render_markup
+from reactify.helpers.inline_styles import hoist_styles
+from reactify.helpers.output_files import write_if_changed
+from reactify.helpers.page_ir import Element, PageIR
+
+# Shared component files are recognised by this prefix when stale ones are cleaned up
+COMPONENT_PREFIX = "Shared"
+NAME_PART = re.compile(r"[A-Za-z0-9]+")
+PLACEHOLDER_PATTERN = re.compile(r"__reactify_include_\d+__")
+FIRST_TAG_PATTERN = re.compile(r"<([A-Za-z][\w.]*)([^>]*)>")
+ATTRIBUTE_PATTERN = re.compile(r'\b(id|className)="([^"]*)"')
+
+
+class SharedComponent:
+    """
+    Markup found on several pages, written once to its own component file: either
+    a subtree of the pages (element) or an included partial (already converted markup).
+    """
+
+    __slots__ = ("name", "used_components", "element", "fragments", "markup", "pages")
+
+    def __init__(self, name, used_components, element=None, fragments=None, markup=None, pages=0):
+        self.name = name
+        self.used_components = used_components
+        self.element = element
+        self.fragments = fragments or {}
+        self.markup = markup
+        self.pages = pages
+
+    def is_interactive(self):
+        if self.element is None:
+            return is_interactive_markup(self.markup, self.used_components)
+        return has_interactive([self.element]) or any(
+            is_interactive_markup(markup, components) for markup, components in self.fragments.values()
+        )
+
+    def render(self):
+        """Returns the component's TSX module"""
+        used_components = set(self.used_components)
+        if self.element is None:
+            # A partial can have several root elements
+            markup = f"<>\n      {self.markup}\n    </>"
+        else:
+            markup = render_markup(PageIR([self.element], frozenset()))
+            for placeholder, (fragment, components) in self.fragments.items():
+                if placeholder in markup:
+                    markup = markup.replace(placeholder, fragment)
+                    used_components |= components
+        markup, declarations = hoist_styles(markup)
+        constants = "".join(line + "\n" for line in declarations) + "\n" if declarations else ""
+        return (
+            f"{import_lines(used_components)}{constants}const {self.name} = () => {{\n  return (\n    {markup}\n  );\n}};\n\n"
+            f"export default {self.name};\n"
+        )
+
+
+def _resolve_text(text, fragments):
+    """Text with include placeholders replaced by their markup, so equal subtrees hash equal on every page"""
+    if fragments and "__reactify_include_" in text:
+        for placeholder, (markup, _) in fragments.items():
+            text = text.replace(placeholder, markup)
+    return text
+
+
+def _hash_page(nodes, fragments, digests):
+    """
+    Fills digests with id(element) -> (digest, size) for every element, bottom up.
+    size counts elements and text nodes in the subtree.
+    """
+    stack = [(node, False) for node in reversed(nodes) if isinstance(node, Element)]
+    while stack:
+        element, children_done = stack.pop()
+        if not children_done:
+            stack.append((element, True))
+            stack.extend((child, False) for child in element.children if isinstance(child, Element))
+            continue
+
+        h = hashlib.blake2b(digest_size=16)
+        h.update(element.name.encode())
+        h.update(repr(element.attrs).encode())
+        size = 1
+        for child in element.children:
+            if isinstance(child, Element):
+                digest, child_size = digests[id(child)]
+                h.update(b"\x00e")
+                h.update(digest)
+                size += child_size
+            else:
+                h.update(b"\x00t")
+                h.update(_resolve_text(child, fragments).encode())
+                size += 1
+        digests[id(element)] = (h.digest(), size)
+
+
+def _component_names(element):
+    """Yields the top-level component names used by the elements of a subtree"""
+    stack = [element]
+    while stack:
+        node = stack.pop()
+        yield node.name.split(".")[0]
+        stack.extend(child for child in node.children if isinstance(child, Element))
+
+
+def _name_hint(name, attrs):
+    """A readable name for a component, from the root element's id, first class or tag"""
+    hint = attrs.get("id") or (attrs.get("className") or "").split(" ")[0] or name
+    return "".join(part[:1].upper() + part[1:] for part in NAME_PART.findall(hint)) or "Block"
+
+
+def _markup_hint(markup):
+    match = FIRST_TAG_PATTERN.search(markup)
+    if match is None:
+        return "Include"
+    return _name_hint(match.group(1), dict(ATTRIBUTE_PATTERN.findall(match.group(2))))
+
+
+def _markup_size(markup):
+    """Number of elements in converted markup"""
+    return markup.count("<") - markup.count("</")
+
+
+class _Names:
+    """Hands out unique component names"""
+
+    def __init__(self):
+        self.taken = set()
+
+    def new(self, hint):
+        hint = name = f"{COMPONENT_PREFIX}{hint}"
+        count = 1
+        while name in self.taken:
+            count += 1
+            name = f"{hint}{count}"
+        self.taken.add(name)
+        return name
+
+
+def extract_shared_components(pages, min_nodes=SHARED_COMPONENT_MIN_NODES, min_pages=SHARED_COMPONENT_MIN_PAGES):
+    """
+    Finds subtrees repeated across pages and replaces them by references to shared components.
+
+    Every element is hashed from its name, attributes and children's hashes, and the
+    hashes are bucketed in a dict, so finding repeats is linear in the number of nodes
+    rather than a comparison of every pair of pages. Only the outermost repeated
+    subtree is extracted where repeats nest. Included partials that convert to the
+    same markup on enough pages are shared the same way.
+
+    :param pages: List of (PageIR, fragments); pages and fragments are rewritten in place.
+    :param min_nodes: Smallest subtree, in elements and text nodes, worth extracting.
+    :param min_pages: Number of distinct pages a subtree must appear on.
+    :return: (components, page_components) where components lists the SharedComponents in
+             order of first use and page_components holds, per page, the names it imports.
+    """
+    digests = {}
+    buckets = {}  # digest -> [first element, index of its page, set of pages]
+    for index, (page, fragments) in enumerate(pages):
+        _hash_page(page.nodes, fragments, digests)
+
+        stack = [node for node in reversed(page.nodes) if isinstance(node, Element)]
+        while stack:
+            element = stack.pop()
+            digest, size = digests[id(element)]
+            if size < min_nodes:
+                continue
+            bucket = buckets.get(digest)
+            if bucket is None:
+                buckets[digest] = [element, index, {index}]
+            else:
+                bucket[2].add(index)
+            stack.extend(child for child in reversed(element.children) if isinstance(child, Element))
+
+    shared = {digest for digest, (_, _, seen) in buckets.items() if len(seen) >= min_pages}
+    original_used = [page.used_components for page, _ in pages]
+    components = {}
+    names = _Names()
+    page_components = []
+    placeholders = []  # per page, the include placeholders left in its own markup
+
+    for page, fragments in pages:
+        used = []
+        found = set()
+        stack = [(page.nodes, iter(range(len(page.nodes))))]
+        while stack:
+            nodes, positions = stack[-1]
+            position = next(positions, None)
+            if position is None:
+                stack.pop()
+                continue
+            node = nodes[position]
+            if not isinstance(node, Element):
+                if fragments and "__reactify_include_" in node:
+                    found.update(PLACEHOLDER_PATTERN.findall(node))
+                continue
+            digest = digests[id(node)][0]
+            if digest not in shared:
+                stack.append((node.children, iter(range(len(node.children)))))
+                continue
+
+            component = components.get(digest)
+            if component is None:
+                element, owner, seen = buckets[digest]
+                component = components[digest] = SharedComponent(
+                    names.new(_name_hint(element.name, dict(element.attrs))),
+                    frozenset(name for name in _component_names(element) if name in original_used[owner]),
+                    element=element, fragments=dict(pages[owner][1]), pages=len(seen),
+                )
+            nodes[position] = Element(component.name, void=True)
+            if component.name not in used:
+                used.append(component.name)
+
+        if used:
+            # Only the react-bootstrap components still in the page's own markup are imported
+            remaining = set()
+            for node in page.nodes:
+                if isinstance(node, Element):
+                    remaining.update(_component_names(node))
+            page.used_components = frozenset(page.used_components & remaining)
+        page_components.append(used)
+        placeholders.append(found)
+
+    # Included partials: the same converted markup on enough pages becomes a component too
+    partials = {}  # markup -> set of pages
+    for index, (_, fragments) in enumerate(pages):
+        for placeholder in placeholders[index]:
+            markup = fragments[placeholder][0]
+            if _markup_size(markup) >= min_nodes:
+                partials.setdefault(markup, set()).add(index)
+
+    for index, (_, fragments) in enumerate(pages):
+        for placeholder in sorted(placeholders[index], key=lambda p: int(p[len("__reactify_include_"):-2])):
+            markup, used_components = fragments[placeholder]
+            seen = partials.get(markup)
+            if not seen or len(seen) < min_pages:
+                continue
+            component = components.get(markup)
+            if component is None:
+                component = components[markup] = SharedComponent(
+                    names.new(_markup_hint(markup)), used_components, markup=markup, pages=len(seen),
+                )
+            fragments[placeholder] = (f"<{component.name}/>", frozenset())
+            if component.name not in page_components[index]:
+                page_components[index].append(component.name)
+
+    return list(components.values()), page_components
+
+
+def component_imports(names, target_file, components_path):
+    """Import lines for shared components, relative to the page file that uses them"""
+    relative = Path(os.path.relpath(components_path, Path(target_file).parent)).as_posix()
+    if not relative.startswith("."):
+        relative = f"./{relative}"
+    return [f"import {name} from '{relative}/{name}';" for name in names]
+
+
+def write_components(components, components_path, asset_rewriter=None, client=False):
+    """
+    Writes every shared component to its own file, unless unchanged, and removes ones no longer shared.
+    asset_rewriter, if given, rewrites their asset references as it does the pages'. With client,
+    components that are interactive (see client_islands) are written as 'use client' components.
+    """
+    components_path = Path(components_path)
+    components_path.mkdir(parents=True, exist_ok=True)
+    current = set()
+    for component in components:
+        target_file = components_path / f"{component.name}.tsx"
+        current.add(target_file.name)
+        tsx = component.render()
+        if client and component.is_interactive():
+            tsx = f"'use client';\n\n{tsx}"
+        if asset_rewriter:
+            tsx = asset_rewriter.rewrite(tsx, target_file)
+        write_if_changed(target_file, tsx)
+
+    for stale in components_path.glob(f"{COMPONENT_PREFIX}*.tsx"):
+        if stale.name not in current:
+            stale.unlink()
@@ -0,0 +1,385 @@
+import html
+import os
+import re
+import shutil
+import tempfile
+from html.entities import html5
+from html.parser import HTMLParser
+from pathlib import Path
+
+from reactify.helpers.output_files import replace_if_changed, temp_file
+from reactify.helpers.inline_styles import style_declarations, style_name
+from reactify.helpers.page_ir import Expression, escape, render_attributes
+from reactify.helpers.convert_to_tsx import (
+    COMMENT_PATTERN, INCLUDE_PATTERN, SELF_CLOSING_PATTERN, _self_closing, apply_rules, get_rule_index, page_wrapper,
+)
+
+# How much of a page is read and fed to the tokenizer at a time
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Tree-building behaviour of BeautifulSoup's html.parser builder, which the
+# streaming converter reproduces so both modes write the same TSX
+VOID_ELEMENTS = {
+    "area", "base", "basefont", "bgsound", "br", "col", "command", "embed", "frame", "hr", "image", "img", "input",
+    "isindex", "keygen", "link", "menuitem", "meta", "nextid", "param", "source", "spacer", "track", "wbr",
+}
+PRESERVE_WHITESPACE_TAGS = {"pre", "textarea"}
+RAW_TEXT_TAGS = {"script", "style"}
+LIST_ATTRIBUTES = {
+    "*": {"class", "accesskey", "dropzone"},
+    "a": {"rel", "rev"}, "link": {"rel", "rev"}, "area": {"rel"}, "td": {"headers"}, "th": {"headers"},
+    "form": {"accept-charset"}, "object": {"archive"}, "icon": {"sizes"}, "iframe": {"sandbox"}, "output": {"for"},
+}
+ASCII_SPACES = set("\x20\x0a\x09\x0c\x0d")
+NON_WHITESPACE = re.compile(r"\S+")
+
+
+def _attribute_dict(tag, attrs):
+    result = {}
+    list_attributes = LIST_ATTRIBUTES["*"] | LIST_ATTRIBUTES.get(tag, set())
+    for key, value in attrs:
+        value = "" if value is None else value
+        result[key] = NON_WHITESPACE.findall(value) if key in list_attributes else value
+    return result
+
+
+class _Tokenizer(HTMLParser):
+    """HTMLParser with BeautifulSoup's character reference handling"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+
+    def handle_charref(self, name):
+        hexadecimal = name[:1] in ("x", "X")
+        digits = name[1:] if hexadecimal else name
+        try:
+            code = int(digits, 16 if hexadecimal else 10)
+        except ValueError:
+            self.handle_data(digits)
+            return
+        self.handle_data(html.unescape(f"&#{code};"))
+
+    def handle_entityref(self, name):
+        self.handle_data(html5.get(name + ";", f"&{name}"))
+
+    def feed_file(self, source_file, chunk_size=STREAM_CHUNK_SIZE):
+        with open(source_file, "r", encoding="utf-8") as f:
+            while chunk := f.read(chunk_size):
+                self.feed(chunk)
+                if self.done:
+                    return
+        if not self.done:
+            self.close()
+
+
+class _ContentLocator(_Tokenizer):
+    """First pass: finds the start tag whose contents are converted (data-content, else body)"""
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+        self.body = None
+        self.content = None
+
+    @property
+    def done(self):
+        return self.content is not None
+
+    def handle_starttag(self, tag, attrs):
+        self.count += 1
+        if self.content is None and any(key == "data-content" for key, _ in attrs):
+            self.content = self.count
+        if self.body is None and tag == "body":
+            self.body = self.count
+
+    handle_startendtag = handle_starttag
+
+
+class _StreamingConverter(_Tokenizer):
+    """
+    Second pass: applies the conversion rules per start tag and writes the
+    selected element's contents to out as it goes. Only the open-tag stack
+    and the current text node are kept in memory.
+    """
+
+    def __init__(self, out, content=None):
+        super().__init__()
+        self.out = out
+        self.content = content
+        self.count = 0
+        self.capturing = content is None
+        self.finished = False
+        self.rule_index = get_rule_index()
+        self.used_components = set()
+        self.styles = {}  # style object -> the constant it is hoisted to
+        self.includes_skipped = False
+
+        self.stack = []  # (name, output_name, captured)
+        self.open_counts = {}
+        self.already_closed = {}  # void element name -> start tags seen without an end tag
+        self.preserve = 0
+
+        self.text = []
+        self.text_size = 0
+        self.after_doctype = False
+        self.started = False
+        self.pending_whitespace = ""
+
+    @property
+    def done(self):
+        return self.finished
+
+    # Output
+
+    def _write(self, chunk):
+        """Writes output with leading and trailing whitespace of the whole document stripped"""
+        if not chunk:
+            return
+        if not self.started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                return
+            self.started = True
+        body = chunk.rstrip()
+        if body:
+            self.out.write(self.pending_whitespace)
+            self.out.write(body)
+            self.pending_whitespace = chunk[len(body):]
+        else:
+            self.pending_whitespace += chunk
+
+    def _emit(self, chunk):
+        """Writes markup other than text, closing the text node before it"""
+        self._end_text()
+        if self.after_doctype:
+            self.after_doctype = False
+            self._write("\n")
+        self._write(chunk)
+
+    def _raw_text(self):
+        return bool(self.stack) and self.stack[-1][1] in RAW_TEXT_TAGS
+
+    def _flush_text(self, text):
+        if self._raw_text():
+            if "<!--" in text:
+                text = COMMENT_PATTERN.sub("", text)
+            text = SELF_CLOSING_PATTERN.sub(_self_closing, text)
+        else:
+            if "@@include" in text:
+                self.includes_skipped = True
+                text = INCLUDE_PATTERN.sub(lambda m: f"{{/* {m.group(0)} */}}", text)
+            text = escape(text)
+        if self.after_doctype:
+            self.after_doctype = False
+            text = "\n" + text
+            if text.isspace():
+                text = "\n"
+        self._write(text)
+
+    def _end_text(self):
+        if not self.text:
+            return
+        text = "".join(self.text)
+        self.text = []
+        self.text_size = 0
+        if not self.preserve and all(char in ASCII_SPACES for char in text):
+            text = "\n" if "\n" in text else " "
+        self._flush_text(text)
+
+    # Tokenizer events
+
+    def handle_data(self, data):
+        if not self.capturing or self.finished:
+            return
+        self.text.append(data)
+        self.text_size += len(data)
+
+        # Very long text nodes are written out in pieces, keeping back a possibly unfinished @@include(...)
+        if self.text_size > STREAM_CHUNK_SIZE:
+            text = "".join(self.text)
+            if not all(char in ASCII_SPACES for char in text):
+                cut = text.rfind("@@")
+                cut = len(text) if cut == -1 or ")" in text[cut:] else cut
+                self.text = [text[cut:]] if cut < len(text) else []
+                self.text_size = len(text) - cut
+                self._flush_text(text[:cut])
+
+    def handle_starttag(self, tag, attrs, self_closing=False):
+        if self.finished:
+            return
+        self.count += 1
+        attributes = _attribute_dict(tag, attrs)
+
+        if not self.capturing and self.count == self.content:
+            if tag in VOID_ELEMENTS:
+                # An empty element was picked: the page has no markup
+                self.finished = True
+                return
+            self._push(tag, tag, False)
+            self.capturing = True
+            if self_closing:
+                self.handle_endtag(tag, check_already_closed=False)
+            return
+
+        if self.capturing:
+            self._end_text()
+            name = apply_rules(tag, attributes, self.used_components, self.rule_index)
+            style = attributes.get("style")
+            if isinstance(style, Expression):
+                attributes["style"] = Expression(style_name(self.styles, style.code))
+            if tag in VOID_ELEMENTS:
+                self._emit(f"<{name}{render_attributes(sorted(attributes.items()))}/>")
+                if not self_closing:
+                    self.already_closed[tag] = self.already_closed.get(tag, 0) + 1
+                return
+            self._emit(f"<{name}{render_attributes(sorted(attributes.items()))}>")
+            self._push(tag, name, True)
+        elif tag not in VOID_ELEMENTS:
+            self._push(tag, tag, False)
+        elif not self_closing:
+            self.already_closed[tag] = self.already_closed.get(tag, 0) + 1
+
+        if self_closing:
+            self.handle_endtag(tag, check_already_closed=False)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, self_closing=True)
+
+    def handle_endtag(self, tag, check_already_closed=True):
+        if self.finished:
+            return
+        if check_already_closed and self.already_closed.get(tag):
+            self.already_closed[tag] -= 1
+            return
+        # Any end tag ends the text node, even one that closes nothing
+        self._end_text()
+        if not self.open_counts.get(tag):
+            return
+        while self.stack:
+            name, _, _ = self.stack[-1]
+            self._pop()
+            if name == tag or self.finished:
+                break
+
+    def handle_decl(self, decl):
+        if self.capturing and not self.finished:
+            self._emit(f"<!DOCTYPE {decl[len('DOCTYPE '):]}>\n")
+            self.after_doctype = True
+
+    def unknown_decl(self, data):
+        if self.capturing and not self.finished:
+            if data.upper().startswith("CDATA["):
+                self._emit(f"<![CDATA[{data[len('CDATA['):]}]]>")
+            else:
+                self._emit(f"<?{data}?>")
+
+    def handle_pi(self, data):
+        if self.capturing and not self.finished:
+            self._emit(f"<?{data}>")
+
+    def handle_comment(self, data):
+        # Comments are dropped, and the text around them joins into one text node
+        pass
+
+    # Open elements
+
+    def _push(self, name, output_name, captured):
+        self.stack.append((name, output_name, captured))
+        self.open_counts[name] = self.open_counts.get(name, 0) + 1
+        if name in PRESERVE_WHITESPACE_TAGS:
+            self.preserve += 1
+
+    def _pop(self):
+        name, output_name, captured = self.stack.pop()
+        self.open_counts[name] -= 1
+        if name in PRESERVE_WHITESPACE_TAGS:
+            self.preserve -= 1
+        if captured:
+            self._emit(f"</{output_name}>")
+        elif self.capturing and self.content is not None:
+            # The converted element itself closed: nothing after it is part of the page
+            self._end_text()
+            self.capturing = False
+            self.finished = True
+
+    def close(self):
+        super().close()
+        self._end_text()
+        while self.stack and not self.finished:
+            self._pop()
+        if self.after_doctype:
+            self.after_doctype = False
+            self._write("\n")
+
+
+def stream_convert(source_file, targets, chunk_size=STREAM_CHUNK_SIZE, changed=None):
+    """
+    Converts a page to TSX without building a document tree, writing the markup out as it goes.
+
+    Memory use is proportional to the nesting depth of the page rather than its size,
+    which suits very large generated pages. The output is the same as convert_to_tsx()
+    with the html.parser backend. @@include directives are commented out, not expanded.
+
+    :param targets: List of (target_file, emitter); the page is converted once and
+                    written to every target with its emitter's wrapper.
+    :param changed: Optional list the target files that were written are added to;
+                    targets that already held the same TSX are left alone.
+    :return: Set of react-bootstrap components the page uses.
+    """
+    source_file = Path(source_file)
+    targets = [(Path(target_file), emitter) for target_file, emitter in targets]
+
+    locator = _ContentLocator()
+    locator.feed_file(source_file, chunk_size)
+    content = locator.content or locator.body
+
+    for target_file, _ in targets:
+        target_file.parent.mkdir(parents=True, exist_ok=True)
+    # The import line depends on every tag in the page, so the markup goes to a
+    # temporary file first and is copied in after the header
+    with tempfile.TemporaryFile("w+", encoding="utf-8", dir=targets[0][0].parent) as body:
+        converter = _StreamingConverter(body, content)
+        converter.feed_file(source_file, chunk_size)
+
+        for target_file, emitter in targets:
+            declarations = style_declarations(converter.styles)
+            if emitter:
+                head, tail = emitter.wrapper(converter.used_components, declarations=declarations)
+            else:
+                head, tail = page_wrapper(converter.used_components, declarations=declarations)
+            body.seek(0)
+            temp = temp_file(target_file)
+            try:
+                with open(temp, "w", encoding="utf-8") as f:
+                    f.write(head)
+                    shutil.copyfileobj(body, f, chunk_size)
+                    f.write(tail)
+            except BaseException:
+                temp.unlink(missing_ok=True)
+                raise
+            if replace_if_changed(temp, target_file) and changed is not None:
+                changed.append(target_file)
+
+    if converter.includes_skipped:
+        print(f"⚠️ {source_file.name}: @@include directives are not expanded in streamed pages")
+    return converter.used_components
+
+
+def stream_page(source_file, targets, changed=None):
+    """
+    Streams one page to its TSX files, given as (target_file, emitter) pairs, returns an error message or None.
+    Target files written are added to changed, if given.
+    """
+    try:
+        stream_convert(source_file, targets, changed=changed)
+        return None
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+
+def should_stream(file, threshold):
+    """True if a page is at least threshold bytes; a threshold of 0 or None never streams"""
+    try:
+        return bool(threshold) and os.path.getsize(file) >= threshold
+    except OSError:
+        return False
@@ -0,0 +1,174 @@
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+from reactify.config.base import TEMPLATE_CACHE_PATH
+from reactify.helpers.output_files import copy_if_changed, temp_file
+from reactify.helpers.package_store import NODE_MODULES
+
+# Written into templates reactify scaffolded (and already pruned) itself
+TEMPLATE_MARKER = ".reactify-template"
+
+
+def is_pruned_template(template):
+    return (Path(template) / TEMPLATE_MARKER).exists()
+
+
+def prepare_template(name, scaffold, prune, template_dir=None, offline=False, refresh=False):
+    """
+    Returns the template folder for a framework, scaffolding it once if it doesn't exist yet.
+
+    A template reactify scaffolds itself is pruned right away and marked, so stamped
+    projects need no pruning. A folder passed as template_dir that already exists is
+    used as it is and never modified.
+
+    :param name: Template name, e.g. "react-vite".
+    :param scaffold: Callable that scaffolds a fresh project into the given folder and returns True on success.
+    :param prune: Callable that prunes a scaffolded project folder.
+    :param template_dir: Folder to use instead of the shared template cache.
+    :param offline: Never scaffold; fail if the template is missing.
+    :param refresh: Scaffold again even if the template exists.
+    :return: Template Path, or None if there is no template and it couldn't be created.
+    """
+    template = Path(template_dir) if template_dir else Path(TEMPLATE_CACHE_PATH) / name
+
+    if template.exists() and any(template.iterdir()) and not refresh:
+        print(f"📋 Using template '{template}'")
+        return template
+
+    if offline:
+        print(f"❌ No '{name}' template at '{template}' and --offline is set. Run once online or pass --template-dir.")
+        return None
+
+    # Scaffold next to the final location, then swap it in, so a failed run never leaves half a template
+    template.parent.mkdir(parents=True, exist_ok=True)
+    staging = template.parent / f".{template.name}.{os.getpid()}.staging"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir()
+
+    if not scaffold(staging / template.name):
+        shutil.rmtree(staging, ignore_errors=True)
+        return None
+
+    scaffolded = staging / template.name
+    prune(scaffolded)
+    (scaffolded / TEMPLATE_MARKER).write_text(json.dumps({"name": name, "created": time.time()}))
+
+    if template.exists():
+        shutil.rmtree(template)
+    scaffolded.rename(template)
+    shutil.rmtree(staging, ignore_errors=True)
+
+    print(f"📋 Cached template '{name}' at '{template}'")
+    return template
+
+
+def _link_or_copy(source, target):
+    """Hardlinks source at target through a temporary name, so an existing target is replaced, never written through"""
+    temp = temp_file(target)
+    try:
+        os.link(source, temp)
+    except OSError:
+        copy_if_changed(source, target)
+        return
+    os.replace(temp, target)
+
+
+def _copy_unshared(source, target):
+    """copy_if_changed that also replaces a hardlink to source, left by a project stamped before only node_modules was linked"""
+    try:
+        shared = os.path.samefile(source, target)
+    except OSError:
+        shared = False
+    if not shared:
+        return copy_if_changed(source, target)
+    temp = temp_file(target)
+    try:
+        shutil.copy2(source, temp)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+    os.replace(temp, target)
+    return True
+
+
+def _stamped_link(source, target):
+    """True for a symlink of the template the project already has; a stale one is removed to be stamped again"""
+    if not os.path.islink(source) or not os.path.islink(target):
+        return False
+    if os.readlink(target) == os.readlink(source):
+        return True
+    os.unlink(target)
+    return False
+
+
+def _rename_package(project_root, project_name):
+    """Points package.json (and its lock file) at the new project name"""
+    package_file = project_root / "package.json"
+    if package_file.exists():
+        package = json.loads(package_file.read_text(encoding="utf-8"))
+        package["name"] = project_name
+        package_file.write_text(json.dumps(package, indent=2) + "\n", encoding="utf-8")
+
+    lock_file = project_root / "package-lock.json"
+    if lock_file.exists():
+        lock = json.loads(lock_file.read_text(encoding="utf-8"))
+        lock["name"] = project_name
+        if "" in lock.get("packages", {}):
+            lock["packages"][""]["name"] = project_name
+        lock_file.write_text(json.dumps(lock, indent=2) + "\n", encoding="utf-8")
+
+
+def _copy_tree(source, target, skipped, copy_function):
+    """copytree of source over target, leaving out the top-level names in skipped and symlinks already in place"""
+    def ignore(folder, names):
+        folder = Path(folder)
+        stamped = target / folder.relative_to(source)
+        return [name for name in names
+                if name in skipped and folder == source or _stamped_link(folder / name, stamped / name)]
+
+    shutil.copytree(source, target, symlinks=True, dirs_exist_ok=True, ignore=ignore, copy_function=copy_function)
+
+
+def stamp_template(template, project_root, project_name, link=False, store=None, prune=None):
+    """
+    Creates a project from a template by copying it. Only node_modules, which nothing
+    edits, may be shared with the template: the project's own files are always copies,
+    so an editor writing one in place can't change the template or other projects.
+
+    :param template: Template folder from prepare_template().
+    :param project_root: Project folder to create.
+    :param project_name: Name written into package.json.
+    :param link: Hardlink node_modules instead of copying it (falls back to copying across filesystems).
+    :param store: PackageStore node_modules is hardlinked from instead of being copied.
+    :param prune: Callable pruning a template that isn't pruned yet. It gets a staging copy of the
+                  template without node_modules, never the project, whose pages and assets it would delete.
+    """
+    template = Path(template)
+    project_root = Path(project_root)
+    # Files are replaced rather than written to, as a node_modules file may be a hardlink (to the template or the store)
+    vendor_copy = _link_or_copy if link else copy_if_changed
+
+    source = template
+    if prune:
+        source = project_root.parent / f".{project_root.name}.{os.getpid()}.template"
+        shutil.rmtree(source, ignore_errors=True)
+        source.parent.mkdir(parents=True, exist_ok=True)
+        # Linked, as pruning only ever deletes
+        _copy_tree(template, source, {TEMPLATE_MARKER, NODE_MODULES}, _link_or_copy)
+        prune(source)
+    try:
+        _copy_tree(source, project_root, {TEMPLATE_MARKER, NODE_MODULES}, _copy_unshared)
+    finally:
+        if prune:
+            shutil.rmtree(source, ignore_errors=True)
+
+    if store:
+        store.link_node_modules(template, project_root)
+    elif (template / NODE_MODULES).is_dir():
+        _copy_tree(template / NODE_MODULES, project_root / NODE_MODULES, set(), vendor_copy)
+
+    _rename_package(project_root, project_name)
+    print(f"✅ Project stamped from template '{template}'")
@@ -0,0 +1,110 @@
+from reactify.helpers.copy_assets import copy_changed_assets, sync_assets
+from reactify.helpers.includes import INCLUDE_GRAPH_FILE
+from reactify.helpers.watcher import FileWatcher
+
+
+def _is_under(path, root):
+    return path == root or root in path.parents
+
+
+def _remove_output(target_file, dist_path, module_files=()):
+    """Deletes a page's output file, its companion modules and any folders it leaves empty."""
+    if target_file.exists():
+        target_file.unlink()
+        print(f"🗑️ Removed: {target_file.relative_to(dist_path)}")
+    for name in module_files:
+        (target_file.parent / name).unlink(missing_ok=True)
+
+    folder = target_file.parent
+    while folder != dist_path and _is_under(folder, dist_path) and folder.exists() and not any(folder.iterdir()):
+        folder.rmdir()
+        folder = folder.parent
+
+
+def watch_project(converter, dist_path, skip_dirs=None):
+    """
+    Watches a converter's source and assets folders and keeps its project in sync.
+
+    Only pages whose HTML changed are reconverted, only changed assets are copied
+    (pages are rewritten when an asset they may refer to by hash changed),
+    and the route table is rewritten only when pages are added, removed or renamed.
+
+    :param converter: ReactConverter or NextConverter whose project was already built.
+    :param dist_path: Folder the converter writes pages to.
+    :param skip_dirs: Source folders that don't hold pages.
+    """
+    source_path = converter.source_path
+    assets_path = converter.assets_path
+
+    # Pages not converted in this process (e.g. watching a project built by an earlier run)
+    # are still reconverted when a partial they include changes
+    converter.includes.load(converter.project_root / INCLUDE_GRAPH_FILE)
+    pages = converter._collect_pages(skip_dirs=skip_dirs)
+    failed = set(getattr(converter, "failed_pages", ()))
+    routes = [parts for file, parts, _ in pages if file not in failed]
+
+    watcher = FileWatcher([source_path, assets_path])
+    print(f"\n👀 Watching '{source_path}' and '{assets_path}' ({watcher.backend}), press Ctrl+C to stop")
+
+    try:
+        for changed in watcher.changes():
+            # The watcher lost events (e.g. a branch switch overflowed its queue): resync everything
+            resync = source_path in changed or assets_path in changed
+            if resync:
+                print("⚠️ Too many changes at once to follow, syncing every asset and page")
+                sync_assets(assets_path, converter.project_assets_path, checksum=converter.asset_checksum,
+                            link=converter.asset_link)
+                converter.includes.refresh()
+
+            asset_changes = {path for path in changed if _is_under(path, assets_path)}
+            # Pages refer to fingerprinted assets by hash: rewrite them all when those changed
+            rewrite_all = resync
+            if asset_changes:
+                if not resync:
+                    copy_changed_assets(assets_path, converter.project_assets_path, asset_changes,
+                                        checksum=converter.asset_checksum, link=converter.asset_link)
+                rewrite_all = converter.sync_asset_refs() or rewrite_all
+
+            if not rewrite_all and not any(_is_under(path, source_path) for path in changed):
+                continue
+
+            # Pages that include a changed partial are reconverted along with edited pages
+            converter.includes.invalidate(changed)
+            dependents = converter.includes.dependents(changed)
+
+            new_pages = converter._collect_pages(skip_dirs=skip_dirs)
+            current = {file for file, _, _ in new_pages}
+            targets = {target_file for _, _, target_file in new_pages}
+
+            removed = [page for page in pages if page[0] not in current]
+            previous = {file for file, _, _ in pages}
+            reclaimed = {page[2] for page in removed}
+
+            for _, _, target_file in removed:
+                if target_file not in targets:
+                    _remove_output(target_file, dist_path, converter.emitter.module_files)
+
+            # New pages, edited pages, pages including an edited partial,
+            # and pages that shared an output file with a removed one
+            to_convert = [
+                page for page in new_pages
+                if page[0] not in previous or page[0] in changed or page[0] in dependents or page[2] in reclaimed
+            ]
+            # Any page can change which subtrees are shared, so every page is written again
+            if rewrite_all or (to_convert and converter.shared_components):
+                to_convert = new_pages
+            if to_convert:
+                converted = {file for file, _, _ in to_convert}
+                failed = (failed & current) - converted
+                failed |= converter._write_pages(to_convert, verbose=True)
+
+            new_routes = [parts for file, parts, _ in new_pages if file not in failed]
+            if new_routes != routes:
+                converter._update_routes(new_pages, failed)
+                routes = new_routes
+
+            pages = new_pages
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching.")
+    finally:
+        watcher.close()
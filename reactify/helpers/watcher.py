@@ -0,0 +1,160 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+# inotify event masks (see <sys/inotify.h>)
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_Q_OVERFLOW = 0x4000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class FileWatcher:
+    """
+    Watches directory trees and reports which files changed.
+    Uses inotify where the platform has it and falls back to polling mtimes.
+    """
+
+    def __init__(self, paths, interval=0.5, debounce=0.1):
+        self.paths = [Path(path) for path in paths if Path(path).exists()]
+        self.interval = interval
+        self.debounce = debounce
+        self.fd = None
+        self.watches = {}
+
+        libc = _load_libc()
+        if libc is not None:
+            fd = libc.inotify_init1(IN_NONBLOCK)
+            if fd >= 0:
+                self.libc = libc
+                self.fd = fd
+                for path in self.paths:
+                    self._add_tree(path)
+
+        if self.fd is None:
+            self.snapshot = self._scan()
+
+    @property
+    def backend(self):
+        return "inotify" if self.fd is not None else "polling"
+
+    def _add_tree(self, root):
+        for directory in [root, *(p for p in root.rglob("*") if p.is_dir())]:
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd >= 0:
+                self.watches[wd] = directory
+
+    def _drop_tree(self, root):
+        """Forgets the watches on a folder that was removed or moved away, and on the folders under it"""
+        for wd, directory in list(self.watches.items()):
+            if directory == root or root in directory.parents:
+                del self.watches[wd]
+                self.libc.inotify_rm_watch(self.fd, wd)
+
+    def _scan(self):
+        snapshot = {}
+        for root in self.paths:
+            for file in root.rglob("*"):
+                try:
+                    stat = file.stat()
+                except OSError:
+                    continue
+                if not file.is_dir():
+                    snapshot[file] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _read_events(self, timeout):
+        changed = set()
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return changed
+
+        data = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Too many events to know what changed: report the roots, meaning anything under them
+                changed.update(self.paths)
+                continue
+
+            directory = self.watches.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_DELETE_SELF:
+                self._drop_tree(directory)
+                continue
+            path = directory / os.fsdecode(name) if name else directory
+
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_tree(path)
+                    changed.update(p for p in path.rglob("*") if p.is_file())
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._drop_tree(path)
+                    changed.add(path)
+                continue
+            changed.add(path)
+        return changed
+
+    def _poll(self):
+        time.sleep(self.interval)
+        snapshot = self._scan()
+        changed = {path for path in snapshot.keys() | self.snapshot.keys() if snapshot.get(path) != self.snapshot.get(path)}
+        self.snapshot = snapshot
+        return changed
+
+    def changes(self):
+        """
+        Yields sets of changed paths, forever. Bursts of events (an editor
+        saving, a git checkout) are collected until things go quiet for
+        `debounce` seconds and reported together. A set holding one of the
+        watched roots means events were lost and anything under it may have changed.
+        """
+        while True:
+            if self.fd is None:
+                changed = self._poll()
+            else:
+                changed = self._read_events(self.interval)
+                while changed:
+                    more = self._read_events(self.debounce)
+                    if not more:
+                        break
+                    changed |= more
+            if changed:
+                yield changed
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
@@ -1,29 +1,149 @@
 import argparse
+import cProfile
+import os
+import sys
+from pathlib import Path
 
-from reactify.frameworks.next import NextConverter
-from reactify.frameworks.react import ReactConverter
+# Only what the argument parser needs is imported up front: the converter (bs4,
+# worker pools, sqlite) is imported once a command runs, so --help and argument
+# errors stay fast. `python -m reactify.bench --startup` checks this.
+from reactify.config.base import (
+    ASSET_PUBLIC_FOLDER, ASSET_REF_MODES, CACHE_PATH, CACHE_MAX_SIZE, DEFAULT_PARSER, LINK_MODES, PACKAGE_STORE_PATH, PARSERS,
+    ROUTE_CHUNK_SIZE, ROUTE_CHUNK_STRATEGIES, SHARED_COMPONENT_MIN_NODES, SHARED_COMPONENTS_FOLDER, STREAM_THRESHOLD,
+)
+from reactify.frameworks.registry import BUILTIN_FRAMEWORKS, framework_names, is_framework, load_framework
+from reactify.helpers.profiler import Profiler, set_profiler
+from reactify.helpers.routes import RouteOptions
+from reactify.helpers.shards import merge_shards, parse_shard
+from reactify.helpers.rule_packs import RULE_PACKS
 
-SUPPORTED_FRAMEWORKS = ['react','next']
 
+def process_framework(framework_name, project_name, watch=False, **options):
+    """Builds the project with the framework's converter; options are passed on to the converter"""
+    converter = load_framework(framework_name)(project_name, **options)
+    if watch:
+        converter.watch()
+    return converter
 
-def process_framework(framework_name, project_name):
-    def make_class_handler(cls):
-        return lambda: cls(project_name)
 
-    handlers = {
-        'react': make_class_handler(ReactConverter),
-        'next': make_class_handler(NextConverter),
-    }
+def process_frameworks(framework_names, project_name, watch=False, **options):
+    """Builds one project per framework from a single conversion of the theme, returns the converters"""
+    if len(framework_names) == 1:
+        return [process_framework(framework_names[0], project_name, watch=watch, **options)]
 
-    handler = handlers.get(framework_name)
-    if handler:
-        handler()
-    else:
-        print(f"Framework '{framework_name}' is not implemented yet.")
+    from reactify.frameworks.base import build_projects
+
+    converters = [load_framework(name)(project_name, create=False, **options) for name in framework_names]
+    build_projects(converters)
+    if watch:
+        print(f"⚠️ Watching applies to one target only: watching {framework_names[0]}")
+        converters[0].watch()
+    return converters
+
+
+def framework_list(value):
+    """argparse type for "react" or "react,next"; duplicates are dropped"""
+    names = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    unknown = [name for name in names if not is_framework(name)]
+    if not names or unknown:
+        raise argparse.ArgumentTypeError(
+            f"invalid framework {', '.join(unknown) or repr(value)} (choose from {', '.join(framework_names())})"
+        )
+    return names
+
+
+def shard_argument(value):
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def add_route_arguments(parser):
+    parser.add_argument("--route-chunks", choices=ROUTE_CHUNK_STRATEGIES, default="page",
+                        help="How React page components are split into lazily loaded chunks: one per page, "
+                             "one per top-level folder, or size-balanced groups")
+    parser.add_argument("--route-chunk-size", type=int, default=ROUTE_CHUNK_SIZE // 1024,
+                        help="Target size of a balanced route chunk in KB of TSX")
+    parser.add_argument("--nested-routes", action="store_true",
+                        help="Write the React routes as a tree following the page folders instead of a flat list")
+    parser.add_argument("--route-prefetch", action="store_true",
+                        help="Add prefetch hints for sibling routes (prefetchSiblings() in src/routes)")
+    parser.add_argument("--route-manifest", action="store_true",
+                        help="Also write src/routes/manifest.json describing routes, chunks and prefetch hints")
+
+
+def route_options(args):
+    return RouteOptions(args.route_chunks, args.nested_routes, args.route_prefetch, args.route_manifest,
+                        args.route_chunk_size * 1024)
+
+
+def run_merge(argv):
+    """`reactify merge`: combines the outputs of sharded runs into one project per framework"""
+    parser = argparse.ArgumentParser(prog="reactify merge",
+                                     description="Combine the outputs of --shard runs into complete projects")
+    parser.add_argument("project", help="Name of the project")
+    parser.add_argument("framework", type=framework_list, help="Target framework(s) the shards were built for")
+    parser.add_argument("shards", nargs="+", metavar="SHARD_DIR",
+                        help="Folders the shard runs were started in (holding their react/ or next/ output)")
+    add_route_arguments(parser)
+    args = parser.parse_args(argv)
+
+    for name in args.framework:
+        converter = load_framework(name)(args.project, routes=route_options(args), create=False)
+        shard_roots = [Path(folder) / converter.destination_path / args.project for folder in args.shards]
+        try:
+            merged, failed = merge_shards(converter, shard_roots)
+        except ValueError as e:
+            print(f"❌ {name}: {e}")
+            return 1
+        print(f"✅ {name}: merged {merged} pages from {len(args.shards)} shards into {converter.project_root}")
+        if failed:
+            print(f"❌ {failed} pages failed to convert.")
+    return 0
 
 
 def run_generate(args):
-    process_framework(args.framework, args.project)
+    from reactify.helpers.conversion_cache import ConversionCache
+    from reactify.helpers.convert_to_tsx import register_rule_pack
+
+    for name in filter(None, args.rules.split(",")):
+        register_rule_pack(name.strip())
+
+    cache = None if args.no_cache else ConversionCache(args.cache_dir, args.cache_size * 1024 * 1024)
+    package_store = None
+    if args.package_store:
+        from reactify.helpers.package_store import PackageStore
+
+        package_store = PackageStore(args.package_store)
+
+    profiler = Profiler(slowest=args.profile_top) if args.profile else None
+    set_profiler(profiler)
+    stats = cProfile.Profile() if args.profile_dump else None
+    if stats:
+        stats.enable()
+    try:
+        process_frameworks(
+            args.framework, args.project, watch=args.watch, jobs=args.jobs, cache=cache, parser=args.parser,
+            asset_link=args.asset_link, asset_checksum=args.asset_checksum, use_template=not args.no_template,
+            template_dir=args.template_dir, offline=args.offline, refresh_template=args.refresh_template,
+            template_link=args.template_link, stream_threshold=int(args.stream_threshold * 1024 * 1024),
+            shared_components=args.shared_components, shared_min_nodes=args.shared_min_nodes,
+            routes=route_options(args), shard=args.shard, verbose=args.verbose, asset_refs=args.asset_refs,
+            client_islands=args.client_islands, hoist_static=args.hoist_static, package_store=package_store,
+        )
+    finally:
+        if stats:
+            stats.disable()
+            os.makedirs(os.path.dirname(os.path.abspath(args.profile_dump)), exist_ok=True)
+            stats.dump_stats(args.profile_dump)
+            print(f"🔬 cProfile stats written to {args.profile_dump} (inspect with python -m pstats)")
+        if profiler:
+            set_profiler(None)
+            profiler.print_summary(profiler.save(args.profile))
+            print(f"⏱️ Profile report written to {args.profile}")
+        if cache:
+            cache.close()
 
 
 def main():
@@ -31,9 +151,85 @@ def main():
 
     # Default positional args for project generation
     parser.add_argument("project", help="Name of the project")
-    parser.add_argument("framework", choices=SUPPORTED_FRAMEWORKS, help="Target framework")
+    parser.add_argument("framework", type=framework_list,
+                        help=f"Target framework, or a comma-separated list to build several from one conversion "
+                             f"({', '.join(BUILTIN_FRAMEWORKS)} or one added by an installed plugin)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(),
+                        help="Number of worker processes used to convert pages (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Reconvert every page instead of using the cache")
+    parser.add_argument("--cache-dir", default=CACHE_PATH, help=f"Conversion cache location (default: {CACHE_PATH})")
+    parser.add_argument("--cache-size", type=int, default=CACHE_MAX_SIZE // (1024 * 1024),
+                        help="Conversion cache size limit in MB")
+    parser.add_argument("--parser", choices=PARSERS, default=DEFAULT_PARSER,
+                        help="HTML parser backend; lxml is fastest when installed")
+    parser.add_argument("--watch", action="store_true",
+                        help="After the build, watch the source and assets folders and convert changes as they happen")
+    parser.add_argument("--asset-link", choices=LINK_MODES, default="copy",
+                        help="How changed assets are placed: copied, hardlinked or reflinked from the source")
+    parser.add_argument("--asset-checksum", action="store_true",
+                        help="Compare asset contents when sizes match but mtimes differ")
+    parser.add_argument("--asset-refs", choices=ASSET_REF_MODES, default="keep",
+                        help=f"How pages refer to assets: as written, through ES imports the bundler fingerprints "
+                             f"(images and stylesheets), or at content-hashed copies in public/{ASSET_PUBLIC_FOLDER}/; "
+                             f"identical files are deduplicated")
+    parser.add_argument("--template-dir",
+                        help="Project template to stamp from; scaffolded there first if it doesn't exist")
+    parser.add_argument("--no-template", action="store_true",
+                        help="Scaffold with npm on every run instead of stamping from a cached template")
+    parser.add_argument("--refresh-template", action="store_true", help="Scaffold the cached template again")
+    parser.add_argument("--template-link", action="store_true",
+                        help="Hardlink the template's node_modules into the project instead of copying it")
+    parser.add_argument("--offline", action="store_true",
+                        help="Never run npm; fail if there is no cached template")
+    parser.add_argument("--package-store", nargs="?", const=PACKAGE_STORE_PATH, metavar="DIR",
+                        help=f"Hardlink node_modules from a content-addressed store shared by all projects instead "
+                             f"of copying it (default location: {PACKAGE_STORE_PATH})")
+    parser.add_argument("--stream-threshold", type=float, default=STREAM_THRESHOLD / (1024 * 1024),
+                        help="Pages of at least this many MB are converted by the low-memory streaming converter "
+                             "(0 turns it off)")
+    parser.add_argument("--shared-components", action="store_true",
+                        help=f"Move markup repeated across pages (navbars, sidebars, footers) into components "
+                             f"under {SHARED_COMPONENTS_FOLDER}/")
+    parser.add_argument("--client-islands", action="store_true",
+                        help="Write Next pages as server components, moving interactive parts (stateful components, "
+                             "event handlers) into small 'use client' modules; reports the split in "
+                             ".reactify/client-islands.json")
+    parser.add_argument("--hoist-static", action="store_true",
+                        help="Build each page's static markup once, as a module-level constant, instead of on "
+                             "every render")
+    parser.add_argument("--shared-min-nodes", type=int, default=SHARED_COMPONENT_MIN_NODES,
+                        help="Smallest repeated subtree, in elements and text nodes, made into a shared component")
+    add_route_arguments(parser)
+    parser.add_argument("--verbose", "-v", action="store_true",
+                        help="Print a line per converted page instead of a progress count")
+    parser.add_argument("--shard", type=shard_argument, metavar="I/N",
+                        help="Convert only shard I of N of the pages (by path hash); combine the shard outputs "
+                             "with `reactify merge`")
+    parser.add_argument("--rules", default="",
+                        help=f"Comma-separated extra rule packs to enable ({', '.join(RULE_PACKS)})")
+
+    parser.add_argument("--profile", nargs="?", const="reactify-profile.json", metavar="REPORT",
+                        help="Time each stage and page and write a JSON report (default: reactify-profile.json)")
+    parser.add_argument("--profile-top", type=int, default=10, help="Number of slowest pages listed in the report")
+    parser.add_argument("--profile-dump", metavar="FILE",
+                        help="Also run cProfile over the main process and dump pstats to FILE")
+
+    argv = sys.argv[1:]
+    if argv[:1] == ["merge"]:
+        return run_merge(argv[1:])
+    if argv[:1] == ["batch"]:
+        from reactify.batch import main as run_batch
+        return run_batch(argv[1:])
+    if argv[:1] == ["serve"]:
+        from reactify.server import main as run_server
+        return run_server(argv[1:])
+    if argv[:1] == ["client"]:
+        from reactify.client import main as run_client
+        return run_client(argv[1:])
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.shard and args.watch:
+        parser.error("--watch can't be combined with --shard")
 
     if args.project and args.framework:
         run_generate(args)
@@ -42,4 +238,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
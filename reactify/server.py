@@ -0,0 +1,267 @@
+"""
+`reactify serve`: a warm conversion process for tools that convert one page at a time.
+
+Requests and responses are JSON objects, one per line, over a Unix socket (or a
+localhost TCP port). Every request has an "op":
+
+    {"op": "ping"}
+    {"op": "convert", "name": "auth-login.html", "html": "...", "framework": "react",
+     "root": "/path/to/html"}            root is optional, it lets @@include resolve
+    {"op": "stats"}
+    {"op": "shutdown"}
+
+Responses carry "ok" and either the result fields or "error".
+
+Only the server's user can use it: the Unix socket is created 0600, and on a TCP
+port every request must carry the "token" the server wrote to a 0600 file when it
+started. A root must be under one of the folders the server allows, and partials
+are only read from inside their root.
+"""
+import argparse
+import hmac
+import json
+import os
+import secrets
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path, PurePosixPath
+
+from reactify.config.base import CACHE_MAX_SIZE, CACHE_PATH, SERVE_SOCKET, SERVE_TIMEOUT, SERVE_TOKEN_FILE
+from reactify.frameworks.registry import BUILTIN_FRAMEWORKS, load_emitter
+from reactify.helpers.conversion_cache import CONVERTER_VERSION, ConversionCache
+from reactify.helpers.convert_to_tsx import (
+    DEFAULT_PARSER, PARSERS, get_rule_index, parse_page, register_rule_pack, render_page, resolve_parser,
+)
+from reactify.helpers.includes import IncludeResolver, _is_inside
+from reactify.helpers.restructure_files import route_parts
+from reactify.helpers.rule_packs import RULE_PACKS
+
+
+class ConversionService:
+    """
+    Answers requests with the rules compiled, include resolvers and the cache kept between them.
+    Requests may only name a root inside one of allowed_roots.
+    """
+
+    def __init__(self, parser=DEFAULT_PARSER, cache=None, allowed_roots=()):
+        self.parser = resolve_parser(parser)
+        self.cache = cache
+        self.allowed_roots = [os.path.realpath(root) for root in allowed_roots]
+        self.resolvers = {}
+        self.started = time.time()
+        self.requests = 0
+        self.conversions = 0
+        self.seconds = 0.0
+
+    def warm_up(self):
+        """Compiles the rules, loads the built-in targets and parses once, so the first request isn't slower"""
+        get_rule_index()
+        page = parse_page('<div class="row"><p>warm</p></div>', self.parser)
+        for name in BUILTIN_FRAMEWORKS:
+            render_page(page, emitter=load_emitter(name))
+
+    def handle(self, request):
+        self.requests += 1
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid(), "version": CONVERTER_VERSION}
+        if op == "convert":
+            return self.convert(request)
+        if op == "stats":
+            return {
+                "ok": True,
+                "uptime": round(time.time() - self.started, 3),
+                "requests": self.requests,
+                "conversions": self.conversions,
+                "mean_ms": round(self.seconds * 1000 / self.conversions, 3) if self.conversions else None,
+                "cache_hits": self.cache.hits if self.cache else None,
+                "cache_misses": self.cache.misses if self.cache else None,
+            }
+        if op == "shutdown":
+            return {"ok": True}
+        raise ValueError(f"Unknown op '{op}'")
+
+    def _resolver(self, root):
+        root = os.path.realpath(root)
+        if not any(_is_inside(root, allowed) for allowed in self.allowed_roots):
+            raise PermissionError(f"Root '{root}' is not under a folder the server allows (see --allow-root)")
+        resolver = self.resolvers.get(root)
+        if resolver is None:
+            resolver = self.resolvers[root] = IncludeResolver(root, self.parser, confine=True)
+        else:
+            # Partials may have been edited since the last request
+            resolver.refresh()
+        return resolver
+
+    def convert(self, request):
+        start = time.perf_counter()
+        emitter = load_emitter(request.get("framework", "react"))
+        name = request["name"]
+        html_content = request["html"]
+
+        fragments = {}
+        if request.get("root"):
+            resolver = self._resolver(request["root"])
+            html_content, fragments = resolver.expand(resolver.source_path / name, html_content)
+
+        page = key = None
+        if self.cache:
+            key = self.cache.key(html_content + "".join(markup for markup, _ in fragments.values()), self.parser)
+            page = self.cache.get(key)
+        if page is None:
+            page = parse_page(html_content, self.parser)
+            if self.cache:
+                self.cache.put(key, page)
+                self.cache.flush()
+        tsx_code, used_components = render_page(page, fragments, emitter)
+
+        parts = route_parts(PurePosixPath(name).stem, request.get("casing", "snake"))
+        elapsed = time.perf_counter() - start
+        self.conversions += 1
+        self.seconds += elapsed
+        return {
+            "ok": True,
+            "tsx": tsx_code,
+            "used_components": sorted(used_components),
+            "route": parts,
+            "path": "/" + "/".join(parts),
+            "file": emitter.page_path(parts),
+            "module": emitter.route_module(parts),
+            "ms": round(elapsed * 1000, 3),
+        }
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    timeout = SERVE_TIMEOUT
+
+    def handle(self):
+        service = self.server.service
+        token = self.server.token
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            op = None
+            try:
+                request = json.loads(line)
+                if token and not hmac.compare_digest(str(request.get("token", "")).encode(), token.encode()):
+                    raise PermissionError("Missing or wrong token")
+                op = request.get("op")
+                response = service.handle(request)
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+            if op == "shutdown":
+                # shutdown() waits for serve_forever(), which is running this handler
+                threading.Thread(target=self.server.shutdown).start()
+                return
+
+
+class _UnixServer(socketserver.UnixStreamServer):
+    pass
+
+
+class _TCPServer(socketserver.TCPServer):
+    allow_reuse_address = True
+
+
+def _socket_in_use(path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+            return True
+        except OSError:
+            return False
+
+
+def _write_token(token_file):
+    """Writes a new random token to token_file, readable and writable by this user only"""
+    token = secrets.token_urlsafe(32)
+    Path(token_file).parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    fd = os.open(token_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        os.fchmod(fd, 0o600)
+        f.write(token + "\n")
+    return token
+
+
+def create_server(service, socket_path=SERVE_SOCKET, port=None, token_file=SERVE_TOKEN_FILE):
+    """
+    Binds the server to a Unix socket only this user can connect to, or to a localhost
+    port when port is given; any local user can reach a port, so requests then need the
+    token written to token_file. A socket file left by a server that is gone is replaced.
+    """
+    if port is not None:
+        server = _TCPServer(("127.0.0.1", port), _Handler)
+        server.token = _write_token(token_file)
+    else:
+        if os.path.exists(socket_path):
+            if _socket_in_use(socket_path):
+                raise OSError(f"A server is already listening on {socket_path}")
+            os.unlink(socket_path)
+        Path(socket_path).parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # Created without group or other permissions, so no other user can connect in between
+        umask = os.umask(0o177)
+        try:
+            server = _UnixServer(socket_path, _Handler)
+        finally:
+            os.umask(umask)
+        os.chmod(socket_path, 0o600)
+        server.token = None
+    server.service = service
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="reactify serve",
+                                     description="Keep a warm converter running for `reactify client`")
+    parser.add_argument("--socket", default=SERVE_SOCKET, help=f"Unix socket to listen on (default: {SERVE_SOCKET})")
+    parser.add_argument("--port", type=int, help="Listen on this localhost TCP port instead of a Unix socket")
+    parser.add_argument("--token-file", default=SERVE_TOKEN_FILE,
+                        help=f"Where a TCP server writes the token clients must send (default: {SERVE_TOKEN_FILE})")
+    parser.add_argument("--allow-root", action="append", default=[], metavar="FOLDER",
+                        help="Folder requests may take @@include roots from, repeatable (default: the current folder)")
+    parser.add_argument("--parser", choices=PARSERS, default=DEFAULT_PARSER, help="HTML parser backend")
+    parser.add_argument("--no-cache", action="store_true", help="Don't use the conversion cache")
+    parser.add_argument("--cache-dir", default=CACHE_PATH, help=f"Conversion cache location (default: {CACHE_PATH})")
+    parser.add_argument("--cache-size", type=int, default=CACHE_MAX_SIZE // (1024 * 1024),
+                        help="Conversion cache size limit in MB")
+    parser.add_argument("--rules", default="",
+                        help=f"Comma-separated extra rule packs to enable ({', '.join(RULE_PACKS)})")
+    args = parser.parse_args(argv)
+
+    for name in filter(None, args.rules.split(",")):
+        register_rule_pack(name.strip())
+    cache = None if args.no_cache else ConversionCache(args.cache_dir, args.cache_size * 1024 * 1024)
+    service = ConversionService(args.parser, cache, args.allow_root or [os.getcwd()])
+    service.warm_up()
+
+    try:
+        server = create_server(service, args.socket, args.port, args.token_file)
+    except OSError as e:
+        print(f"❌ {e}")
+        return 1
+
+    address = f"127.0.0.1:{args.port}" if args.port is not None else args.socket
+    print(f"🛰️ Serving on {address} (pid {os.getpid()}), stop with Ctrl+C or `reactify client shutdown`")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.port is None and os.path.exists(args.socket):
+            os.unlink(args.socket)
+        if args.port is not None and os.path.exists(args.token_file):
+            os.unlink(args.token_file)
+        if cache:
+            cache.close()
+        print("👋 Server stopped.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -11,7 +11,7 @@ setup(
     install_requires=[],
     entry_points={
         'console_scripts': [
-            'reactify=reactify.main:main',
+            'reactify=reactify.cli:main',
         ],
     },
     license='MIT',
@@ -0,0 +1,11 @@
+import pytest
+
+from reactify.helpers import convert_to_tsx
+
+
+@pytest.fixture
+def isolated_rules(monkeypatch):
+    """Lets a test register rule packs without them leaking into the rules of later tests"""
+    monkeypatch.setattr(convert_to_tsx, "REACT_BOOTSTRAP_RULES", dict(convert_to_tsx.REACT_BOOTSTRAP_RULES))
+    monkeypatch.setattr(convert_to_tsx, "REGISTERED_RULE_PACKS", dict(convert_to_tsx.REGISTERED_RULE_PACKS))
+    monkeypatch.setattr(convert_to_tsx, "_rule_index", None)
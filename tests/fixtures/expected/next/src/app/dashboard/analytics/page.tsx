@@ -0,0 +1,30 @@
+import { Alert, Button, Card, CardBody, CardFooter, CardHeader, Col, Container, Row } from 'react-bootstrap';
+
+const Page = () => {
+  return (
+    <>
+      <Container fluid>
+<Row>
+<Col md="6" xl="3">
+<Card className="shadow-sm">
+<CardHeader className="d-flex">Revenue <span className="badge badge-success">+4%</span></CardHeader>
+<CardBody>
+<h4 className="mb-3">$ 12,340</h4>
+<img alt="chart" src="assets/images/chart.png"/>
+<br/>
+<Button href="#" size="sm" variant="primary">View</Button>
+</CardBody>
+<CardFooter className="text-muted">Updated &lt; 1 min ago</CardFooter>
+</Card>
+</Col>
+<Col lg="auto" xs="12">
+<Alert role="alert" variant="danger">Quota &amp; limits reached</Alert>
+<div className="p-2" variant="warning">Heads up</div>
+</Col>
+</Row>
+</Container>
+    </>
+  );
+};
+
+export default Page;
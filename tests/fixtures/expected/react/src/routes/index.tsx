@@ -0,0 +1,18 @@
+import { lazy } from 'react'
+import { RouteObject } from 'react-router-dom'
+
+const AppsChat = lazy(() => import('@/views/apps/chat'))
+const AuthSignIn = lazy(() => import('@/views/auth/sign-in'))
+const DashboardAnalytics = lazy(() => import('@/views/dashboard/analytics'))
+const PagesCode = lazy(() => import('@/views/pages/code'))
+const UiButtons = lazy(() => import('@/views/ui/buttons'))
+
+const allRoutes: RouteObject[] = [
+  { path: '/apps/chat', element: <AppsChat /> },
+  { path: '/auth/sign-in', element: <AuthSignIn /> },
+  { path: '/dashboard/analytics', element: <DashboardAnalytics /> },
+  { path: '/pages/code', element: <PagesCode /> },
+  { path: '/ui/buttons', element: <UiButtons /> }
+]
+
+export default allRoutes;
@@ -0,0 +1,16 @@
+import { Button, Card, CardBody, Col, Container, Row } from 'react-bootstrap';
+
+const Page = () => {
+  return (
+    <>
+      <Container><Row>
+<Col xs="8">
+<Card><CardBody>Hello @@name</CardBody></Card>
+            <div className="navbar-custom"><Button href="#" variant="primary">Chat</Button></div>
+        </Col>
+</Row></Container>
+    </>
+  );
+};
+
+export default Page;
@@ -0,0 +1,29 @@
+import { Button, Container, FormControl, FormGroup, FormLabel } from 'react-bootstrap';
+
+const style1 = { marginTop: '8px', color: '#333' };
+
+const Page = () => {
+  return (
+    <>
+      <Container>
+<form action="#" onChange="validate()">
+<FormGroup className="mb-3">
+<FormLabel htmlFor="email">Email address</FormLabel>
+<FormControl id="email" placeholder="Enter your email" required="" type="email"/>
+</FormGroup>
+<div className="form-check">
+<input checked="" className="form-check-input" id="remember" type="checkbox"/>
+<label className="form-check-label" htmlFor="remember">Remember me</label>
+</div>
+<div className="input-group" style={style1}>
+<span className="input-group-text">@</span>
+<FormControl disabled="" value='say "hi"'/>
+</div>
+<Button onClick="login('x')" size="lg" type="submit" variant="secondary">Log In</Button>
+</form>
+</Container>
+    </>
+  );
+};
+
+export default Page;
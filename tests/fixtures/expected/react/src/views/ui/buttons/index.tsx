@@ -0,0 +1,28 @@
+import { Button, Col, Dropdown, DropdownItem, DropdownMenu, Row } from 'react-bootstrap';
+
+const Page = () => {
+  return (
+    <>
+      <Row>
+<Col xs>
+<Button className="btn-outline-info" type="button">Outline</Button>
+<Button type="button" variant="link">Link</Button>
+<Button data-bs-toggle="tooltip" size="lg" type="button" variant="success">Large</Button>
+</Col>
+<Dropdown className="col-sm-12" sm="12">
+<a className="dropdown-toggle" data-bs-toggle="dropdown" href="#">Menu</a>
+<DropdownMenu>
+<li><DropdownItem href="#">Action</DropdownItem></li>
+<li><DropdownItem href="#">Another &amp; more</DropdownItem></li>
+</DropdownMenu>
+</Dropdown>
+<nav className="navbar navbar-expand-lg">
+<a className="navbar-brand" href="#">Brand</a>
+<ul className="nav"><li className="nav-item"><a className="nav-link" href="#">Home</a></li></ul>
+</nav>
+</Row>
+    </>
+  );
+};
+
+export default Page;
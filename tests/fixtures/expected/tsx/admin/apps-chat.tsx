@@ -0,0 +1,16 @@
+import { Card, CardBody, Col } from 'react-bootstrap';
+
+const Page = () => {
+  return (
+    <>
+      {/* @@include('../partials/open.html') */}
+        <Col xs="8">
+<Card><CardBody>Hello @@name</CardBody></Card>
+            {/* @@include('../partials/header.html', {"title": "Chat"}) */}
+        </Col>
+        {/* @@include('../partials/close.html') */}
+    </>
+  );
+};
+
+export default Page;
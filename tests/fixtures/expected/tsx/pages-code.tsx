@@ -0,0 +1,19 @@
+import { FormControl } from 'react-bootstrap';
+
+const Page = () => {
+  return (
+    <>
+      <pre className="p-3">  keep   this
+    spacing  </pre>
+<FormControl rows="3">line one
+  line two</FormControl>
+<p>1 /&gt; 2 and a &lt;br&gt; in text<br/>next line</p>
+    {/* @@include('./partials/footer.html',
+        {"year": "2024"}) */}
+    <script>if (a < b) { x = '<br />'; y = 1 />2 }</script>
+<div className="modal" tabindex="-1"><div className="modal-dialog"><div className="modal-body">Body</div></div></div>
+    </>
+  );
+};
+
+export default Page;
@@ -0,0 +1,72 @@
+"""
+Helpers shared by the tests: the fixture pages, converters that never run npm and
+whole-tree comparisons.
+
+Golden files under fixtures/expected are rewritten instead of compared when
+REACTIFY_UPDATE_GOLDEN=1 is set; review the diff before committing them.
+"""
+import os
+import shutil
+from pathlib import Path
+
+from reactify.frameworks.registry import load_framework
+
+FIXTURES = Path(__file__).parent / "fixtures"
+SOURCE_PATH = FIXTURES / "html"
+EXPECTED_PATH = FIXTURES / "expected"
+PROJECT = "site"
+
+UPDATE_GOLDEN = os.environ.get("REACTIFY_UPDATE_GOLDEN") == "1"
+
+
+def fixture_pages():
+    """The fixture pages, relative to SOURCE_PATH, partials left out"""
+    return sorted(
+        file.relative_to(SOURCE_PATH).as_posix()
+        for file in SOURCE_PATH.rglob("*.html") if "partials" not in file.parts
+    )
+
+
+def copy_fixtures(target):
+    """Copies the fixture pages and partials to target, for tests that change or add pages"""
+    shutil.copytree(SOURCE_PATH, target)
+    return Path(target)
+
+
+def build_project(framework, source_path, destination, **options):
+    """
+    Converts every page of source_path into destination/PROJECT the way a run would,
+    minus scaffolding, so npm is never called. Returns the converter.
+    """
+    base = load_framework(framework)
+
+    class Converter(base):
+        def create_project(self):
+            self.project_root.mkdir(parents=True, exist_ok=True)
+            self._restructure_with_tsx_conversion(skip_dirs=["partials"])
+
+    options.setdefault("jobs", 1)
+    return Converter(PROJECT, source_path=source_path, destination_folder=destination,
+                     assets_path=Path(destination) / "no-assets", **options)
+
+
+def read_tree(root, skip=()):
+    """Maps every file under root, by posix path relative to it, to its bytes; paths starting with skip are left out"""
+    root = Path(root)
+    tree = {}
+    for file in sorted(root.rglob("*")):
+        relative = file.relative_to(root).as_posix()
+        if file.is_file() and not relative.startswith(tuple(skip)):
+            tree[relative] = file.read_bytes()
+    return tree
+
+
+def check_golden(expected_file, actual):
+    """Compares text with a golden file, or writes it there with REACTIFY_UPDATE_GOLDEN=1"""
+    expected_file = Path(expected_file)
+    if UPDATE_GOLDEN:
+        expected_file.parent.mkdir(parents=True, exist_ok=True)
+        expected_file.write_text(actual, encoding="utf-8", newline="\n")
+        return
+    assert expected_file.exists(), f"No golden file {expected_file}, run with REACTIFY_UPDATE_GOLDEN=1"
+    assert actual == expected_file.read_text(encoding="utf-8"), f"Output differs from {expected_file}"
@@ -0,0 +1,68 @@
+"""Cache keys change with everything that shapes the output, and cached builds match uncached ones"""
+from reactify.api import BatchConverter
+from reactify.helpers import conversion_cache, convert_to_tsx
+from reactify.helpers.conversion_cache import ConversionCache, rules_fingerprint
+from reactify.helpers.convert_to_tsx import convert_markup, parse_page, register_rule_pack
+from tests.support import SOURCE_PATH, build_project, read_tree
+
+PAGE = '<div class="row"><div class="col-md-6 form-check">x</div></div>'
+
+
+def test_key_follows_html_and_parser(tmp_path):
+    cache = ConversionCache(tmp_path)
+    key = cache.key(PAGE, "html.parser")
+    assert cache.key(PAGE, "html.parser") == key
+    assert cache.key(PAGE + " ", "html.parser") != key
+    assert cache.key(PAGE, "lxml") != key
+    cache.close()
+
+
+def test_fingerprint_follows_the_rules(isolated_rules, monkeypatch):
+    fingerprint = rules_fingerprint()
+    register_rule_pack("forms")
+    with_pack = rules_fingerprint()
+    assert with_pack != fingerprint
+
+    monkeypatch.setitem(convert_to_tsx.REACT_BOOTSTRAP_RULES, "row",
+                        dict(convert_to_tsx.REACT_BOOTSTRAP_RULES["row"], props=lambda c: {"gutter": 0}))
+    assert rules_fingerprint() != with_pack
+
+    changed = rules_fingerprint()
+    monkeypatch.setitem(convert_to_tsx.JSX_ATTRIBUTE_MAP, "tabindex", "tabIndex")
+    assert rules_fingerprint() != changed
+
+    changed = rules_fingerprint()
+    monkeypatch.setattr(conversion_cache, "CONVERTER_VERSION", conversion_cache.CONVERTER_VERSION + 1)
+    assert rules_fingerprint() != changed
+
+
+def test_entries_of_other_rules_are_not_used(tmp_path, isolated_rules):
+    cache = ConversionCache(tmp_path)
+    cache.put(cache.key(PAGE, "html.parser"), parse_page(PAGE))
+    cache.close()
+
+    register_rule_pack("forms")
+    cache = ConversionCache(tmp_path)
+    assert cache.get(cache.key(PAGE, "html.parser")) is None
+    cache.close()
+
+
+def test_batch_converter_rules_leave_the_fingerprint_alone(isolated_rules):
+    fingerprint = rules_fingerprint()
+    markup = convert_markup(PAGE)
+    with BatchConverter(rules=("forms",)) as converter:
+        (result,) = converter.convert_many([("page.html", PAGE)])
+    assert "FormCheck" in result.tsx
+    assert rules_fingerprint() == fingerprint
+    assert convert_markup(PAGE) == markup
+
+
+def test_cached_build_matches_uncached(tmp_path):
+    expected = read_tree(build_project("react", SOURCE_PATH, tmp_path / "plain").project_root)
+
+    for run in range(2):
+        cache = ConversionCache(tmp_path / "cache")
+        converter = build_project("react", SOURCE_PATH, tmp_path / f"cached-{run}", cache=cache)
+        cache.close()
+        assert read_tree(converter.project_root) == expected
+    assert cache.hits and not cache.misses
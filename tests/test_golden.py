@@ -0,0 +1,30 @@
+"""
+Golden outputs of the fixture pages: every optimisation of the pipeline has to
+leave the generated TSX byte for byte the same.
+"""
+import pytest
+
+from reactify.helpers.convert_to_tsx import convert_to_tsx
+from tests.support import (
+    EXPECTED_PATH, SOURCE_PATH, UPDATE_GOLDEN, build_project, check_golden, fixture_pages, read_tree,
+)
+
+
+@pytest.mark.parametrize("page", fixture_pages())
+def test_convert_to_tsx(page):
+    html_content = (SOURCE_PATH / page).read_text(encoding="utf-8")
+    check_golden(EXPECTED_PATH / "tsx" / page.replace(".html", ".tsx"), convert_to_tsx(html_content))
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+@pytest.mark.parametrize("framework", ["react", "next"])
+def test_project(framework, jobs, tmp_path):
+    """Whole projects, includes expanded and routes written, the same whether pages convert in workers or not"""
+    converter = build_project(framework, SOURCE_PATH, tmp_path, jobs=jobs)
+    tree = read_tree(converter.project_root)
+    expected_root = EXPECTED_PATH / framework
+
+    for relative, data in tree.items():
+        check_golden(expected_root / relative, data.decode("utf-8"))
+    if not UPDATE_GOLDEN:
+        assert sorted(tree) == sorted(read_tree(expected_root))
@@ -0,0 +1,111 @@
+"""Writes to the generated project: unchanged files are left alone, changed ones replaced atomically"""
+import os
+
+import pytest
+
+from reactify.helpers import output_files
+from reactify.helpers.output_files import copy_if_changed, replace_if_changed, temp_file, write_if_changed
+
+
+def leftovers(folder):
+    return sorted(name for name in os.listdir(folder) if name.endswith(".tmp"))
+
+
+def test_unchanged_file_is_left_alone(tmp_path):
+    target = tmp_path / "page.tsx"
+    assert write_if_changed(target, "const Page = 1;\n")
+    os.utime(target, ns=(1_000_000_000, 1_000_000_000))
+    before = os.stat(target)
+
+    assert not write_if_changed(target, "const Page = 1;\n")
+    after = os.stat(target)
+    assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+
+
+@pytest.mark.parametrize("contents", ["const Page = 2;\n", b"\x00binary\xff", "same size 1", ""])
+def test_changed_file_is_replaced(tmp_path, contents):
+    target = tmp_path / "page.tsx"
+    target.write_text("same size 0", encoding="utf-8")
+    assert write_if_changed(target, contents)
+    expected = contents if isinstance(contents, bytes) else contents.encode("utf-8")
+    assert target.read_bytes() == expected
+    assert leftovers(tmp_path) == []
+
+
+def test_hardlinked_target_is_not_written_through(tmp_path):
+    target = tmp_path / "page.tsx"
+    other = tmp_path / "other.tsx"
+    target.write_text("old", encoding="utf-8")
+    os.link(target, other)
+
+    assert write_if_changed(target, "new")
+    assert target.read_text(encoding="utf-8") == "new"
+    assert other.read_text(encoding="utf-8") == "old"
+
+
+def test_failed_write_keeps_the_old_file(tmp_path, monkeypatch):
+    target = tmp_path / "page.tsx"
+    target.write_text("old", encoding="utf-8")
+    real_open = open
+
+    class Interrupted:
+        def __init__(self, path, mode):
+            self.file = real_open(path, mode)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            self.file.close()
+
+        def write(self, data):
+            self.file.write(data[:len(data) // 2])
+            raise OSError("disk full")
+
+    monkeypatch.setattr(output_files, "open", Interrupted, raising=False)
+    with pytest.raises(OSError):
+        write_if_changed(target, "a much longer new page")
+    assert target.read_text(encoding="utf-8") == "old"
+    assert leftovers(tmp_path) == []
+
+
+def test_failed_rename_keeps_the_old_file(tmp_path, monkeypatch):
+    target = tmp_path / "page.tsx"
+    target.write_text("old", encoding="utf-8")
+
+    def fail(*args):
+        raise OSError("interrupted")
+
+    monkeypatch.setattr(output_files.os, "replace", fail)
+    with pytest.raises(OSError):
+        write_if_changed(target, "new")
+    assert target.read_text(encoding="utf-8") == "old"
+    assert leftovers(tmp_path) == []
+
+
+def test_replace_if_changed(tmp_path):
+    target = tmp_path / "page.tsx"
+    target.write_text("same", encoding="utf-8")
+    temp = temp_file(target)
+    temp.write_text("same", encoding="utf-8")
+    assert not replace_if_changed(temp, target)
+    assert not temp.exists()
+
+    temp.write_text("different", encoding="utf-8")
+    assert replace_if_changed(temp, target)
+    assert target.read_text(encoding="utf-8") == "different"
+    assert leftovers(tmp_path) == []
+
+
+def test_copy_if_changed(tmp_path):
+    source = tmp_path / "logo.svg"
+    target = tmp_path / "copy.svg"
+    source.write_text("<svg/>", encoding="utf-8")
+    assert copy_if_changed(source, target)
+    mtime = os.stat(target).st_mtime_ns
+
+    assert not copy_if_changed(source, target)
+    assert os.stat(target).st_mtime_ns == mtime
+    source.write_text("<svg></svg>", encoding="utf-8")
+    assert copy_if_changed(source, target)
+    assert target.read_text(encoding="utf-8") == "<svg></svg>"
@@ -0,0 +1,90 @@
+"""
+RuleIndex against the linear scan it replaced: every rule tried in order for each
+class, as convert_to_tsx did before rules were indexed.
+"""
+import re
+
+import pytest
+
+from reactify.helpers.convert_to_tsx import REACT_BOOTSTRAP_RULES, VARIANT_MAPPING, VARIANTS
+from reactify.helpers.rule_index import RuleIndex
+from reactify.helpers.rule_packs import RULE_PACKS
+
+# Hand-written rules: a callable match, and a pattern that shadows exact rules listed after it
+MIXED_RULES = {
+    "lead": {"component": "Lead", "match": lambda c: c.startswith("lead"), "props": lambda c: {"size": c[4:]}},
+    "any-card": {"component": "Panel", "pattern": r"^card(-\w+)?$", "props": lambda c: {}},
+    **REACT_BOOTSTRAP_RULES,
+}
+
+RULE_SETS = {
+    "built-in": REACT_BOOTSTRAP_RULES,
+    "all packs": {**REACT_BOOTSTRAP_RULES, **{name: rule for pack in RULE_PACKS.values() for name, rule in pack.items()}},
+    "mixed": MIXED_RULES,
+}
+
+OTHER_CLASSES = [
+    "", "Row", "rowx", "btn-", "btn-primaryx", "btn-outline-info", "text-bg-", "alert-link", "col-", "col-13",
+    "col-md", "col-foo", "navbar-expand-md", "navbar-expand-foo", "lead", "lead-lg", "mb-3", "d-flex", "card-x",
+]
+
+
+def _matches(rule, cls):
+    if "class" in rule:
+        return cls == rule["class"]
+    if "pattern" in rule:
+        return bool(re.match(rule["pattern"], cls))
+    return bool(rule["match"](cls))
+
+
+def linear_variant(cls):
+    for prefix, component in VARIANT_MAPPING.items():
+        if cls.startswith(prefix):
+            variant = cls[len(prefix):]
+            if variant in VARIANTS:
+                return component, variant
+    return None, None
+
+
+def linear_lookup(rules, cls):
+    for rule in rules:
+        if _matches(rule, cls):
+            return rule["component"], rule["props"](cls)
+    return None, {}
+
+
+def linear_strip(rules, cls, component_type):
+    component, _ = linear_variant(cls)
+    if component and component.lower() == component_type.lower():
+        return True
+    return any(rule["component"].split(".")[0].lower() == component_type.lower() and _matches(rule, cls)
+               for rule in rules)
+
+
+def sample_classes(rules):
+    classes = set(OTHER_CLASSES)
+    classes.update(rule["class"] for rule in rules.values() if "class" in rule)
+    classes.update(prefix + variant for prefix in VARIANT_MAPPING for variant in VARIANTS)
+    classes.update(f"col{breakpoint}{size}" for breakpoint in ("", "-sm", "-md", "-lg", "-xl", "-xxl")
+                   for size in ("", "-1", "-6", "-12", "-auto"))
+    return sorted(classes)
+
+
+@pytest.mark.parametrize("name", RULE_SETS)
+def test_lookup_matches_linear_scan(name):
+    rules = RULE_SETS[name]
+    index = RuleIndex(rules, VARIANT_MAPPING, VARIANTS)
+    ordered = list(rules.values())
+    components = sorted({rule["component"].split(".")[0] for rule in ordered} | {"div", "span", "a"})
+
+    for cls in sample_classes(rules):
+        info = index.lookup(cls)
+        assert (info.component, info.props) == linear_lookup(ordered, cls), cls
+        assert (info.variant_component, info.variant) == linear_variant(cls), cls
+        for component in components:
+            assert index.should_strip(cls, component) == linear_strip(ordered, cls, component), (cls, component)
+
+
+def test_lookups_are_memoized():
+    index = RuleIndex(REACT_BOOTSTRAP_RULES, VARIANT_MAPPING, VARIANTS)
+    assert index.lookup("col-md-6") is index.lookup("col-md-6")
@@ -0,0 +1,32 @@
+"""Sharded runs merged with `reactify merge` give the same project as a single run"""
+import pytest
+
+from reactify.bench import generate_corpus
+from reactify.helpers.shards import SHARDS_FOLDER, merge_shards
+from tests.support import build_project, copy_fixtures, read_tree
+
+SHARDS = 3
+
+
+@pytest.fixture(scope="module")
+def source_path(tmp_path_factory):
+    """The fixture pages and partials plus a generated corpus, so every shard gets pages"""
+    source = copy_fixtures(tmp_path_factory.mktemp("shards") / "html")
+    generate_corpus(source / "generated", pages=30, depth=3, width=3, density=0.6, assets=0, seed=5)
+    return source
+
+
+@pytest.mark.parametrize("framework", ["react", "next"])
+def test_merged_shards_match_a_single_run(framework, source_path, tmp_path):
+    full = build_project(framework, source_path, tmp_path / "full")
+
+    shard_roots = [
+        build_project(framework, source_path, tmp_path / f"shard-{index}", shard=(index, SHARDS)).project_root
+        for index in range(1, SHARDS + 1)
+    ]
+    assert all(read_tree(root, skip=(SHARDS_FOLDER,)) != read_tree(full.project_root) for root in shard_roots)
+
+    merged = build_project(framework, source_path, tmp_path / "merged", create=False)
+    _, failed = merge_shards(merged, shard_roots)
+    assert failed == 0
+    assert read_tree(merged.project_root, skip=(SHARDS_FOLDER,)) == read_tree(full.project_root)
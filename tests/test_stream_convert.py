@@ -0,0 +1,38 @@
+"""The streaming converter, used for very large pages, against the BeautifulSoup one"""
+import pytest
+
+from reactify.bench import generate_corpus
+from reactify.frameworks.registry import load_emitter
+from reactify.helpers.convert_to_tsx import convert_to_tsx, parse_page, render_page
+from reactify.helpers.stream_convert import STREAM_CHUNK_SIZE, stream_convert
+from tests.support import SOURCE_PATH, fixture_pages
+
+
+def soup_convert(html_content, emitter):
+    if emitter is None:
+        return convert_to_tsx(html_content)
+    return render_page(parse_page(html_content), {}, emitter)[0]
+
+
+def streamed(source_file, tmp_path, emitter, chunk_size=STREAM_CHUNK_SIZE):
+    target = tmp_path / "page.tsx"
+    stream_convert(source_file, [(target, emitter)], chunk_size)
+    return target.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("framework", [None, "react", "next"])
+@pytest.mark.parametrize("page", fixture_pages())
+def test_fixture_pages(page, framework, tmp_path):
+    emitter = load_emitter(framework) if framework else None
+    source_file = SOURCE_PATH / page
+    expected = soup_convert(source_file.read_text(encoding="utf-8"), emitter)
+    assert streamed(source_file, tmp_path, emitter) == expected
+    # Tokens split across read chunks
+    assert streamed(source_file, tmp_path, emitter, chunk_size=7) == expected
+
+
+def test_generated_pages(tmp_path):
+    source_path, _ = generate_corpus(tmp_path / "corpus", pages=30, depth=3, width=3, density=0.6, assets=0, seed=3)
+    for source_file in sorted(source_path.rglob("*.html")):
+        assert streamed(source_file, tmp_path, None) == convert_to_tsx(source_file.read_text(encoding="utf-8")), \
+            source_file.name